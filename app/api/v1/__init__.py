@@ -1,11 +1,11 @@
 """
 eidosSpeech v2 — API v1 Router Registration
-Registers: auth, admin, tts, voices, health, batch (410), preview
+Registers: auth, admin, tts, jobs, voices, health, batch, preview
 """
 
 from fastapi import APIRouter
 
-from app.api.v1 import auth, admin, tts, voices, health, batch, preview
+from app.api.v1 import auth, admin, tts, jobs, voices, health, batch, preview
 
 router = APIRouter()
 
@@ -18,13 +18,16 @@ router.include_router(admin.router, prefix="/admin", tags=["admin"])
 # TTS: /api/v1/tts
 router.include_router(tts.router, tags=["tts"])
 
+# Background jobs: /api/v1/jobs/*
+router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
+
 # Voices: /api/v1/voices
 router.include_router(voices.router, tags=["voices"])
 
 # Health: /api/v1/health
 router.include_router(health.router, tags=["health"])
 
-# Batch: /api/v1/batch/tts → 410 Gone
+# Batch: /api/v1/batch/tts, /api/v1/batch/audio/{cache_key}
 router.include_router(batch.router, prefix="/batch", tags=["batch"])
 
 # Preview: /api/v1/preview/{voice_id} (no quota consumption)
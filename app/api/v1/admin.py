@@ -16,6 +16,10 @@ from sqlalchemy import select, func, desc, and_, delete as sql_delete
 from app.config import settings
 from app.core.exceptions import ForbiddenError, RateLimitError
 from app.core.cache import get_cache
+from app.core.blacklist_index import get_blacklist_index
+from app.core.identity_cache import get_identity_cache
+from app.core.rate_limiter import get_rate_limiter
+from app.core.jwt_handler import revoke_all_user_tokens
 from app.db.database import get_db
 from app.db.models import User, ApiKey, DailyUsage, TokenRevocation, Blacklist, PageView
 from app.models.schemas import AdminBlacklistRequest, MessageResponse
@@ -263,6 +267,7 @@ async def admin_disable_key(
 
     key.is_active = False
     await db.commit()
+    get_identity_cache().invalidate_user(key.user_id)
 
     logger.info(f"ADMIN_ACTION action=disable_key key_id={key_id}")
     return {"message": f"API key {key_id} disabled successfully"}
@@ -275,7 +280,7 @@ async def admin_ban_user(
     request: Request,
     db: AsyncSession = Depends(get_db),
 ):
-    """Ban a user: set is_active=False, disable their API key"""
+    """Ban a user: set is_active=False, disable their API key, revoke their tokens"""
     # Find user by UUID
     result = await db.execute(select(User).where(User.uuid == user_uuid))
     user = result.scalar_one_or_none()
@@ -304,6 +309,8 @@ async def admin_ban_user(
     )
 
     await db.commit()
+    await revoke_all_user_tokens(user.id, db)
+    get_identity_cache().invalidate_user(user.id)
 
     logger.info(f"ADMIN_ACTION action=ban_user uuid={user_uuid} email={user.email}")
     return {"message": f"User {user.email} has been banned"}
@@ -345,8 +352,9 @@ async def admin_delete_user(
     api_keys = api_keys_result.scalars().all()
     api_key_ids = [key.id for key in api_keys]
     
-    # Delete daily usage records
+    # Delete daily usage records (incl. buffered, not yet flushed counts)
     if api_key_ids:
+        get_rate_limiter().discard_usage(api_key_ids)
         await db.execute(
             sql_delete(DailyUsage).where(DailyUsage.api_key_id.in_(api_key_ids))
         )
@@ -370,6 +378,7 @@ async def admin_delete_user(
     await db.delete(user)
     
     await db.commit()
+    get_identity_cache().invalidate_user(user_id)
     
     logger.info(f"ADMIN_ACTION action=delete_user uuid={user_uuid} email={email}")
     return {"message": f"User {email} and all related data have been permanently deleted"}
@@ -404,7 +413,7 @@ async def admin_blacklist(
     body: AdminBlacklistRequest,
     db: AsyncSession = Depends(get_db),
 ):
-    """Add IP or email to permanent blacklist"""
+    """Add IP, CIDR range or email to permanent blacklist"""
     entry = Blacklist(
         type=body.type,
         value=body.value,
@@ -416,6 +425,7 @@ async def admin_blacklist(
     except Exception:
         await db.rollback()
         return {"message": f"{body.type} '{body.value}' is already blacklisted"}
+    await get_blacklist_index().load(db)
 
     logger.info(f"ADMIN_ACTION action=blacklist type={body.type} value={body.value}")
     return {"message": f"{body.type} '{body.value}' added to blacklist"}
@@ -19,8 +19,9 @@ from app.core.exceptions import (
     ValidationError, AuthenticationError, ForbiddenError,
     ConflictError, RateLimitError,
 )
-from app.core.jwt_handler import create_token_pair, decode_token, revoke_token
+from app.core.jwt_handler import create_token_pair, decode_token, revoke_token, revoke_all_user_tokens
 from app.core.auth import get_client_ip, is_blacklisted
+from app.core.identity_cache import get_identity_cache
 from app.db.database import get_db
 from app.db.models import User, ApiKey, RegistrationAttempt, TokenRevocation
 from app.models.schemas import (
@@ -115,7 +116,7 @@ async def register(
     email = body.email.lower().strip()
 
     # Check IP blacklist
-    if await is_blacklisted(db, ip=ip, email=email):
+    if is_blacklisted(ip=ip, email=email):
         raise ForbiddenError("Registration not allowed from this IP or email")
 
     # Verify Turnstile
@@ -224,6 +225,7 @@ async def verify_email(
     api_key = ApiKey(key=api_key_str, user_id=user.id, is_active=True)
     db.add(api_key)
     await db.commit()
+    get_identity_cache().invalidate_user(user.id)
 
     logger.info(f"USER_VERIFY email={user.email}")
 
@@ -535,6 +537,7 @@ async def reset_password(
     )
     
     await db.commit()
+    await revoke_all_user_tokens(user.id, db)
 
     logger.info(f"PASSWORD_RESET email={user.email}")
 
@@ -649,6 +652,7 @@ async def regen_key(
     )
     
     await db.commit()
+    get_identity_cache().invalidate_user(user_id)
 
     logger.info(f"API_KEY_REGEN user_id={user_id}")
 
@@ -1,27 +1,238 @@
 """
 eidosSpeech v2 — Batch TTS Endpoint
-POST /api/v1/batch/tts → 410 Gone
-Batch TTS was a v1 feature. v2 is single-request only.
+POST /api/v1/batch/tts             — synthesize N items in one request
+GET  /api/v1/batch/audio/{key}     — fetch one result by signed link (NDJSON manifest)
+
+Auth, blacklist and quota are resolved once per batch: N items cost N daily
+requests in a single usage increment, but only one per-minute slot.
+Items are deduplicated by cache key; hits are served without edge-tts and
+misses fan out with bounded concurrency (see app/services/batch_service.py).
+
+Output formats:
+  ndjson — streamed manifest, one line per item as it becomes ready, then a
+           summary line; audio is fetched via the entry's audio_url, a
+           GET /batch/audio/{cache_key} link signed for the requesting user
+           that expires after settings.batch_audio_url_ttl seconds
+  zip    — every MP3 plus manifest.json in one archive (buffered)
+
+Registered users only.
 """
 
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+import hashlib
+import hmac
+import io
+import json
+import logging
+import time
+import zipfile
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, Path, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
+
+from app.config import settings
+from app.core.auth import resolve_request_context, RequestContext
+from app.core.cache import get_cache
+from app.core.cache_keys import compute_cache_key
+from app.core.exceptions import ForbiddenError, NotFoundError, RateLimitError, ServiceUnavailableError
+from app.core.rate_limiter import get_rate_limiter, HeldSlots, RateLimiter
+from app.db.database import get_db
+from app.db.models import ApiKey
+from app.models.schemas import BatchTTSRequest
+from app.services.batch_service import BatchResult, iter_batch_audio
+from app.api.v1.tts import audio_response
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
-@router.post("/tts")
-@router.get("/tts")
-async def batch_gone():
-    """Batch TTS is not available in v2. Single-request only."""
-    return JSONResponse(
-        status_code=410,
-        content={
-            "error": "Gone",
-            "message": "Batch TTS is not available in eidosSpeech v2.",
-            "detail": {
-                "reason": "v2 is single-request only.",
-                "docs": "https://eidosspeech.xyz/api-docs",
-            }
+def _require_registered(ctx: RequestContext):
+    if ctx.tier == "anonymous":
+        raise ForbiddenError(
+            "Batch TTS is only available for registered users. "
+            "Please sign up to access this feature."
+        )
+
+
+def _audio_signature(cache_key: str, user_id: int, expires: int) -> str:
+    """HMAC binding a batch audio link to one user and an expiry time"""
+    message = f"{user_id}:{cache_key}:{expires}".encode()
+    return hmac.new(settings.secret_key.encode(), message, hashlib.sha256).hexdigest()
+
+
+def _audio_url(cache_key: str, user_id: int) -> str:
+    expires = int(time.time()) + settings.batch_audio_url_ttl
+    sig = _audio_signature(cache_key, user_id, expires)
+    return f"/api/v1/batch/audio/{cache_key}?expires={expires}&sig={sig}"
+
+
+def _manifest_lines(result: BatchResult, indexes: list[int], user_id: int) -> list[dict]:
+    """Manifest entries for every request item that maps to this result"""
+    if result.error:
+        entry = {"cache_key": result.cache_key, "status": "error", "error": result.error}
+    else:
+        entry = {
+            "cache_key": result.cache_key,
+            "status": "ok",
+            "cache_hit": result.cache_hit,
+            "size": len(result.audio),
+            "audio_url": _audio_url(result.cache_key, user_id),
         }
+    return [{"index": index, **entry} for index in indexes]
+
+
+@router.post("/tts")
+async def batch_tts(
+    batch_request: BatchTTSRequest,
+    request: Request,
+    ctx: RequestContext = Depends(resolve_request_context),
+    db: AsyncSession = Depends(get_db),
+    rate_limiter: RateLimiter = Depends(get_rate_limiter),
+):
+    """
+    Synthesize up to EIDOS_BATCH_MAX_ITEMS items with one auth + quota check.
+    Returns an NDJSON manifest (default) or a ZIP of MP3s.
+    """
+    # ── 0. Registered users only + batch size ─────────────────
+    _require_registered(ctx)
+    items = batch_request.items
+    if len(items) > settings.batch_max_items:
+        raise RateLimitError(
+            f"Too many items. Max {settings.batch_max_items} per batch.",
+            retry_after=0,
+            detail={"type": "batch_limit", "limit": settings.batch_max_items, "items": len(items)},
+        )
+
+    # ── 1. Rate limit check — once, for every item ────────────
+    text_lengths = [len(item.text.strip()) for item in items]
+    request_type = "api_tts" if not ctx.is_web_ui else "webui_tts"
+    usage = await rate_limiter.check_and_consume(
+        ctx, db, max(text_lengths),
+        request_type=request_type,
+        cost=len(items),
+        chars=sum(text_lengths),
     )
+    rl_headers = rate_limiter.get_headers(ctx, usage)
+
+    # ── 2. Dedupe by cache key (first occurrence wins) ────────
+    unique = {}
+    indexes: dict[str, list[int]] = {}
+    for index, item in enumerate(items):
+        cache_key = compute_cache_key(item)
+        unique.setdefault(cache_key, item)
+        indexes.setdefault(cache_key, []).append(index)
+    rl_headers["X-Batch-Items"] = str(len(items))
+    rl_headers["X-Batch-Unique"] = str(len(unique))
+
+    # ── 3. Update API key last_used_at ────────────────────────
+    if ctx.api_key_id:
+        key = await db.get(ApiKey, ctx.api_key_id)
+        if key:
+            key.last_used_at = datetime.now(timezone.utc)
+            await db.commit()
+
+    # ── 4. Acquire concurrent semaphore ───────────────────────
+    # Held until the batch finishes. For NDJSON it is released by the body
+    # generator, or by the background task if the body never starts.
+    slots = HeldSlots()
+    await slots.enter(rate_limiter.acquire_concurrent(ctx))
+
+    if batch_request.format == "zip":
+        try:
+            results = [result async for result in iter_batch_audio(unique)]
+        finally:
+            await slots.release()
+        return _zip_response(results, indexes, len(items), ctx, rl_headers)
+
+    async def stream_body():
+        """One manifest line per item as it becomes ready, then a summary"""
+        cached = failed = 0
+        try:
+            async for result in iter_batch_audio(unique):
+                cached += result.cache_hit
+                failed += result.error is not None
+                for entry in _manifest_lines(result, indexes[result.cache_key], ctx.user_id):
+                    yield json.dumps(entry) + "\n"
+        finally:
+            await slots.release()
+
+        summary = {"done": True, "items": len(items), "unique": len(unique),
+                   "cached": cached, "failed": failed}
+        yield json.dumps(summary) + "\n"
+        logger.info(
+            f"BATCH_DONE format=ndjson items={len(items)} unique={len(unique)} "
+            f"cached={cached} failed={failed} tier={ctx.tier}"
+        )
+
+    return StreamingResponse(
+        stream_body(),
+        media_type="application/x-ndjson",
+        headers=rl_headers,
+        background=BackgroundTask(slots.release),
+    )
+
+
+def _zip_response(
+    results: list[BatchResult],
+    indexes: dict[str, list[int]],
+    item_count: int,
+    ctx: RequestContext,
+    rl_headers: dict,
+) -> Response:
+    """Archive of <index>.mp3 files (1-based, in request order) + manifest.json"""
+    if all(result.error for result in results):
+        raise ServiceUnavailableError(
+            "Batch TTS generation failed. The service may be temporarily unavailable."
+        )
+
+    width = len(str(item_count))
+    manifest = []
+    buffer = io.BytesIO()
+    # MP3 is already compressed — store, don't deflate
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+        for result in results:
+            for entry in _manifest_lines(result, indexes[result.cache_key], ctx.user_id):
+                if result.audio is not None:
+                    entry["file"] = f"{entry['index'] + 1:0{width}d}.mp3"
+                    entry.pop("audio_url")
+                    archive.writestr(entry["file"], result.audio)
+                manifest.append(entry)
+        manifest.sort(key=lambda entry: entry["index"])
+        archive.writestr("manifest.json", json.dumps(manifest, indent=2))
+
+    failed = sum(1 for result in results if result.error)
+    logger.info(
+        f"BATCH_DONE format=zip items={item_count} unique={len(results)} "
+        f"cached={sum(result.cache_hit for result in results)} failed={failed} tier={ctx.tier}"
+    )
+    return Response(
+        content=buffer.getvalue(),
+        media_type="application/zip",
+        headers={
+            **rl_headers,
+            "Content-Disposition": 'attachment; filename="tts_batch.zip"',
+        },
+    )
+
+
+@router.get("/audio/{cache_key}")
+async def batch_audio(
+    cache_key: str = Path(..., pattern=r"^[0-9a-f]{64}$"),
+    expires: int = Query(...),
+    sig: str = Query(..., pattern=r"^[0-9a-f]{64}$"),
+    ctx: RequestContext = Depends(resolve_request_context),
+):
+    """
+    MP3 for an audio_url from the caller's own batch manifest (no quota —
+    already charged). The link must be signed for this user and unexpired.
+    """
+    _require_registered(ctx)
+    expected = _audio_signature(cache_key, ctx.user_id, expires)
+    if expires < time.time() or not hmac.compare_digest(sig, expected):
+        raise ForbiddenError("Audio link is invalid or has expired. Submit the item again.")
+    audio_bytes = await get_cache().aget_bytes(cache_key)
+    if audio_bytes is None:
+        raise NotFoundError("Audio has expired from the cache. Submit the item again.")
+    return audio_response(audio_bytes, cache_key, {})
@@ -11,10 +11,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
 from app import __version__
+from app.core.blacklist_index import get_blacklist_index
 from app.core.cache import get_cache
+from app.core.identity_cache import get_identity_cache
 from app.core.rate_limiter import get_rate_limiter
+from app.core.singleflight import get_tts_flight
+from app.core.token_revocation import get_revocation_index
 from app.db.database import get_db
+from app.services.job_service import get_job_queue
 from app.services.proxy_manager import get_proxy_manager
+from app.services.tts_pool import get_tts_pool
 
 router = APIRouter()
 
@@ -65,6 +71,13 @@ async def health_check(db: AsyncSession = Depends(get_db)):
         "db": db_status,
         "cache": cache_stats,
         "proxy": proxy_status,
+        "tts_pool": get_tts_pool().stats(),
+        "coalescing": get_tts_flight().stats(),
+        "jobs": get_job_queue().stats(),
+        "usage": rate_limiter.usage_stats(),
+        "auth_cache": get_identity_cache().stats(),
+        "blacklist": get_blacklist_index().stats(),
+        "token_revocation": get_revocation_index().stats(),
         "uptime_seconds": round(uptime, 1),
         "load": {
             "heavy_operations_active": heavy_in_use,
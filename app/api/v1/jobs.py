@@ -0,0 +1,167 @@
+"""
+eidosSpeech v2 — Background Job Endpoints
+POST /api/v1/jobs             — enqueue a script or long-text synthesis (202)
+GET  /api/v1/jobs/{id}        — status + progress (lines / chunks done of total)
+GET  /api/v1/jobs/{id}/audio  — result MP3, served from the cache
+
+Registered users only. Quota is charged at submission, exactly as the
+synchronous /tts and /tts/script endpoints would charge it.
+"""
+
+import json
+import logging
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.auth import resolve_request_context, RequestContext
+from app.core.cache import get_cache
+from app.core.cache_keys import compute_cache_key
+from app.core.exceptions import ConflictError, ForbiddenError, NotFoundError, RateLimitError
+from app.core.rate_limiter import get_rate_limiter, RateLimiter
+from app.db.database import get_db
+from app.db.models import Job
+from app.models.schemas import JobRequest
+from app.services.chunked_tts import split_text
+from app.services.job_service import JOB_DONE, JOB_QUEUED, JOB_RUNNING, get_job_queue
+from app.api.v1.tts import audio_response, prepare_script
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+def _iso(dt) -> str | None:
+    return dt.isoformat() if dt else None
+
+
+def job_payload(job: Job) -> dict:
+    """Public JSON view of a job (live progress for running jobs)"""
+    done, total = job.progress_done, job.progress_total
+    if job.status == JOB_RUNNING:
+        done, total = get_job_queue().progress(job.id) or (done, total)
+    return {
+        "id": job.id,
+        "type": job.type,
+        "status": job.status,
+        "progress": {"done": done, "total": total},
+        "error": job.error,
+        "created_at": _iso(job.created_at),
+        "started_at": _iso(job.started_at),
+        "finished_at": _iso(job.finished_at),
+        "audio_url": f"/api/v1/jobs/{job.id}/audio" if job.status == JOB_DONE else None,
+    }
+
+
+async def _get_own_job(job_id: str, ctx: RequestContext, db: AsyncSession) -> Job:
+    job = await db.get(Job, job_id)
+    # Other users' jobs are indistinguishable from missing ones
+    if job is None or job.user_id != ctx.user_id:
+        raise NotFoundError("Job not found")
+    return job
+
+
+@router.post("")
+async def create_job(
+    job_request: JobRequest,
+    request: Request,
+    ctx: RequestContext = Depends(resolve_request_context),
+    db: AsyncSession = Depends(get_db),
+    rate_limiter: RateLimiter = Depends(get_rate_limiter),
+):
+    """
+    Enqueue a multi-voice script or a long text. Returns 202 with the job.
+    If the result is already cached the job is created as done.
+    """
+    # ── 0. Registered users only ──────────────────────────────
+    if ctx.tier == "anonymous":
+        raise ForbiddenError(
+            "Background jobs are only available for registered users. "
+            "Please sign up to access this feature."
+        )
+
+    # ── 1. Per-user queue depth (checked before charging quota) ─
+    pending = await db.scalar(
+        select(func.count(Job.id)).where(
+            Job.user_id == ctx.user_id,
+            Job.status.in_((JOB_QUEUED, JOB_RUNNING)),
+        )
+    )
+    if pending >= settings.job_max_pending:
+        raise RateLimitError(
+            f"You already have {pending} unfinished jobs. Wait for one to finish.",
+            retry_after=30,
+            detail={"type": "job_limit", "limit": settings.job_max_pending},
+        )
+
+    # ── 2. Access checks + rate limit + cache lookup ──────────
+    if job_request.type == "script":
+        payload = job_request.script
+        lines, rl_headers, cache_key, cached = await prepare_script(payload, ctx, db, rate_limiter)
+        namespace, total = "script", len(lines)
+    else:
+        payload = job_request.tts
+        text = payload.text.strip()
+        request_type = "api_tts" if not ctx.is_web_ui else "webui_tts"
+        usage = await rate_limiter.check_and_consume(ctx, db, len(text), request_type=request_type)
+        rl_headers = rate_limiter.get_headers(ctx, usage)
+        cache_key = compute_cache_key(payload)
+        cached = await get_cache().aget(cache_key)
+        namespace, total = "tts", len(split_text(text, settings.tts_chunk_max_chars))
+
+    # ── 3. Persist + enqueue ──────────────────────────────────
+    job = Job(
+        type=job_request.type,
+        status=JOB_DONE if cached else JOB_QUEUED,
+        user_id=ctx.user_id,
+        params=json.dumps(payload.model_dump(), ensure_ascii=False),
+        cache_key=cache_key,
+        namespace=namespace,
+        progress_done=total if cached else 0,
+        progress_total=total,
+    )
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+
+    if not cached:
+        get_job_queue().submit(job.id)
+
+    logger.info(
+        f"JOB_CREATED id={job.id} type={job.type} status={job.status} "
+        f"total={total} tier={ctx.tier}"
+    )
+    return JSONResponse(status_code=202, content=job_payload(job), headers=rl_headers)
+
+
+@router.get("/{job_id}")
+async def get_job(
+    job_id: str,
+    ctx: RequestContext = Depends(resolve_request_context),
+    db: AsyncSession = Depends(get_db),
+):
+    """Job status and progress"""
+    job = await _get_own_job(job_id, ctx, db)
+    return job_payload(job)
+
+
+@router.get("/{job_id}/audio")
+async def get_job_audio(
+    job_id: str,
+    ctx: RequestContext = Depends(resolve_request_context),
+    db: AsyncSession = Depends(get_db),
+):
+    """Result MP3 of a finished job"""
+    job = await _get_own_job(job_id, ctx, db)
+    if job.status != JOB_DONE:
+        raise ConflictError(
+            f"Job is {job.status}, audio is not available",
+            detail={"status": job.status},
+        )
+
+    audio_bytes = await get_cache().aget_bytes(job.cache_key, namespace=job.namespace)
+    if audio_bytes is None:
+        raise NotFoundError("Job audio has expired from the cache. Submit the job again.")
+    return audio_response(audio_bytes, job.cache_key, {})
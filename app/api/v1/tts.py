@@ -1,11 +1,12 @@
 """
 eidosSpeech v2 — TTS Endpoint
 POST /api/v1/tts — Generate text-to-speech audio.
+POST /api/v1/tts/stream — Same, but streams MP3 chunks as they are generated.
+POST /api/v1/tts/script — Multi-voice script; /tts/script/stream streams it line by line.
 Integrates: RequestContext, RateLimiter, Cache, ProxyManager.
 """
 
-import hashlib
-import json
+import asyncio
 import logging
 import tempfile
 import os
@@ -13,46 +14,41 @@ from pathlib import Path
 
 from fastapi import APIRouter, Depends, Request
 from fastapi.responses import FileResponse
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
+from starlette.background import BackgroundTask
 
 from app.config import settings
 from app.core.auth import resolve_request_context, RequestContext
-from app.core.rate_limiter import get_rate_limiter, RateLimiter
+from app.core.rate_limiter import get_rate_limiter, HeldSlots, RateLimiter
 from app.core.cache import get_cache
-from app.core.exceptions import InternalError, ServiceUnavailableError, ForbiddenError
+from app.core.cache_keys import compute_cache_key, script_cache_key
+from app.core.singleflight import get_tts_flight
+from app.core.exceptions import InternalError, ServiceUnavailableError, ForbiddenError, RateLimitError
 from app.db.database import get_db
 from app.db.models import ApiKey
 from app.models.schemas import TTSRequest, TTSSubtitleRequest, ScriptRequest
+from app.services.chunked_tts import synthesize_chunked
+from app.services.mp3 import with_info_frame
+from app.services.subtitle_service import build_srt, build_vtt, decode_timings, encode_timings
 from app.services.tts_engine import get_tts_engine
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-def compute_cache_key(req: TTSRequest) -> str:
-    """
-    Generate deterministic SHA256 hash for TTS request.
-    Note: volume is excluded because edge-tts doesn't actually use it.
-    Including it would cause unnecessary cache misses.
-    """
-    data = {
-        "text": req.text,
-        "voice": req.voice,
-        "rate": req.rate,
-        "pitch": req.pitch,
-        # volume excluded - edge-tts ignores this parameter
-    }
-    
-    # Include style parameters if present
-    if req.style:
-        data["style"] = req.style
-    if req.style_degree:
-        data["style_degree"] = req.style_degree
-    
-    content = json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")
-    return hashlib.sha256(content).hexdigest()
+def audio_response(audio_bytes: bytes, cache_key: str, headers: dict) -> Response:
+    """In-memory MP3 response — ETag is the cache key, Content-Length set by Response"""
+    return Response(
+        content=audio_bytes,
+        media_type="audio/mpeg",
+        headers={
+            **headers,
+            "ETag": f'"{cache_key}"',
+            "Content-Disposition": 'attachment; filename="tts_audio.mp3"',
+        },
+    )
 
 
 @router.post("/tts")
@@ -77,27 +73,28 @@ async def generate_tts(
     # ── 2. Cache check ────────────────────────────────────────
     cache = get_cache()
     cache_key = compute_cache_key(tts_request)
-    cached_path = cache.get(cache_key)
+    cached_audio = await cache.aget_bytes(cache_key)
 
     rl_headers = rate_limiter.get_headers(ctx, usage)
 
-    if cached_path:
+    if cached_audio:
         logger.info(f"TTS_CACHE_HIT key={cache_key[:8]}... tier={ctx.tier}")
         rl_headers["X-Cache-Hit"] = "true"
         rl_headers["X-Cache-Key"] = cache_key[:16]
-        return FileResponse(
-            path=cached_path,
-            media_type="audio/mpeg",
-            headers=rl_headers,
-            filename="tts_audio.mp3",
-        )
+        return audio_response(cached_audio, cache_key, rl_headers)
 
     # ── 3. Acquire concurrent semaphore ───────────────────────
     async with rate_limiter.acquire_concurrent(ctx):
-        # ── 4. Generate via TTS engine ────────────────────────
+        # ── 4. Generate via TTS engine + save to cache ────────
+        # Coalesced per cache key: identical in-flight requests share one synthesis
         tts_engine = get_tts_engine()
-        try:
-            audio_bytes = await tts_engine.synthesize(
+
+        # Long texts: sentence chunks synthesized in parallel, each cached on its own
+        chunked = 0 < settings.tts_chunk_threshold < len(text)
+        synthesize = synthesize_chunked if chunked else tts_engine.synthesize
+
+        async def synthesize_and_cache() -> bytes:
+            audio_bytes = await synthesize(
                 text=text,
                 voice=tts_request.voice,
                 rate=tts_request.rate,
@@ -106,16 +103,21 @@ async def generate_tts(
                 style=tts_request.style,
                 style_degree=tts_request.style_degree,
             )
+            await cache.aput(cache_key, audio_bytes)
+            return audio_bytes
+
+        try:
+            audio_bytes, coalesced = await get_tts_flight().do(cache_key, synthesize_and_cache)
         except RuntimeError as e:
             logger.error(f"TTS_ENGINE_ERROR voice={tts_request.voice} error={e}")
             raise ServiceUnavailableError(
                 "TTS generation failed. The service may be temporarily unavailable."
             )
 
-        # ── 5. Save to cache ──────────────────────────────────
-        cached_path = cache.put(cache_key, audio_bytes)
+        if coalesced:
+            logger.info(f"TTS_COALESCED key={cache_key[:8]}... tier={ctx.tier}")
 
-        # ── 6. Update API key last_used_at ────────────────────
+        # ── 5. Update API key last_used_at ────────────────────
         if ctx.api_key_id:
             key = await db.get(ApiKey, ctx.api_key_id)
             if key:
@@ -123,7 +125,7 @@ async def generate_tts(
                 key.last_used_at = datetime.now(timezone.utc)
                 await db.commit()
 
-        # ── 7. Return with rate limit headers ─────────────────
+        # ── 6. Return with rate limit headers ─────────────────
         rl_headers["X-Cache-Hit"] = "false"
         rl_headers["X-Cache-Key"] = cache_key[:16]
 
@@ -133,107 +135,244 @@ async def generate_tts(
             f"remaining_day={rl_headers.get('X-RateLimit-Remaining-Day')}"
         )
 
-        return FileResponse(
-            path=cached_path,
-            media_type="audio/mpeg",
-            headers=rl_headers,
-            filename="tts_audio.mp3",
-        )
+        return audio_response(audio_bytes, cache_key, rl_headers)
 
 
 
-@router.post("/tts/subtitle")
-async def generate_tts_with_subtitle(
-    tts_request: TTSSubtitleRequest,
+@router.post("/tts/stream")
+async def generate_tts_stream(
+    tts_request: TTSRequest,
     request: Request,
     ctx: RequestContext = Depends(resolve_request_context),
     db: AsyncSession = Depends(get_db),
     rate_limiter: RateLimiter = Depends(get_rate_limiter),
 ):
     """
-    Generate TTS audio + SRT subtitle file.
-    Returns JSON with SRT content and cache key.
-    Audio can be retrieved via normal /tts endpoint with same parameters.
+    Streaming variant of POST /tts.
+    Sends MP3 frames to the client as edge-tts produces them (low time-to-first-byte)
+    while teeing them into the cache, so the next identical request is a cache hit.
+    Same rate limits and headers as /tts.
     """
     text = tts_request.text.strip()
 
-    # ── 1. Rate limit check ───────────────────────────────────
+    # ── 1. Rate limit check (char, per-min, per-day) ──────────
     request_type = "api_tts" if not ctx.is_web_ui else "webui_tts"
     usage = await rate_limiter.check_and_consume(ctx, db, len(text), request_type=request_type)
 
-    # ── 2. Cache check (audio only, SRT always regenerated) ──
+    # ── 2. Cache check ────────────────────────────────────────
     cache = get_cache()
     cache_key = compute_cache_key(tts_request)
+    cached_audio = await cache.aget_bytes(cache_key)
 
-    # ── 3. Acquire concurrent semaphore ───────────────────────
-    async with rate_limiter.acquire_concurrent(ctx):
-        # ── 4. Generate via TTS engine with subtitles ─────────
-        tts_engine = get_tts_engine()
-        try:
-            audio_bytes, srt_content = await tts_engine.synthesize_with_subtitles(
-                text=text,
-                voice=tts_request.voice,
-                rate=tts_request.rate,
-                pitch=tts_request.pitch,
-                volume=tts_request.volume,
-                words_per_cue=tts_request.words_per_cue,
-                style=tts_request.style if hasattr(tts_request, 'style') else None,
-                style_degree=tts_request.style_degree if hasattr(tts_request, 'style_degree') else None,
-            )
-        except RuntimeError as e:
-            logger.error(f"TTS_SRT_ENGINE_ERROR voice={tts_request.voice} error={e}")
-            raise ServiceUnavailableError(
-                "TTS+SRT generation failed. The service may be temporarily unavailable."
-            )
+    rl_headers = rate_limiter.get_headers(ctx, usage)
+    rl_headers["X-Cache-Key"] = cache_key[:16]
+
+    if cached_audio:
+        logger.info(f"TTS_STREAM_CACHE_HIT key={cache_key[:8]}... tier={ctx.tier}")
+        rl_headers["X-Cache-Hit"] = "true"
+        return audio_response(cached_audio, cache_key, rl_headers)
+
+    # ── 2b. Identical request already being synthesized → wait for it ─
+    pending = get_tts_flight().join(cache_key)
+    if pending is not None:
+        async with rate_limiter.acquire_concurrent(ctx):
+            try:
+                audio_bytes = await asyncio.shield(pending)
+            except RuntimeError as e:
+                logger.error(f"TTS_STREAM_ENGINE_ERROR voice={tts_request.voice} error={e}")
+                raise ServiceUnavailableError(
+                    "TTS generation failed. The service may be temporarily unavailable."
+                )
+        logger.info(f"TTS_STREAM_COALESCED key={cache_key[:8]}... tier={ctx.tier}")
+        rl_headers["X-Cache-Hit"] = "false"
+        return audio_response(audio_bytes, cache_key, rl_headers)
+
+    # ── 3. Acquire concurrent semaphore + lead the flight ─────
+    # Held until the stream finishes: released by the body generator, or by the
+    # response background task if the body never runs (client gone early)
+    # Identical requests arriving from now on wait for this stream's audio
+    flight = get_tts_flight().lead(cache_key)
+    slots = HeldSlots()
+
+    async def finish():
+        if flight is not None and not flight.done():
+            flight.set_exception(RuntimeError("TTS stream ended before the audio was complete"))
+        await slots.release()
 
-        # ── 5. Save audio to cache ────────────────────────────
-        cached_path = cache.put(cache_key, audio_bytes)
+    try:
+        await slots.enter(rate_limiter.acquire_concurrent(ctx))
+    except BaseException:
+        await finish()
+        raise
+
+    # ── 4. Open stream — wait for the first chunk so engine failures still map to 503
+    tts_engine = get_tts_engine()
+    chunks = tts_engine.synthesize_stream(
+        text=text,
+        voice=tts_request.voice,
+        rate=tts_request.rate,
+        pitch=tts_request.pitch,
+        volume=tts_request.volume,
+        style=tts_request.style,
+        style_degree=tts_request.style_degree,
+    )
+    try:
+        first_chunk = await chunks.__anext__()
 
-        # ── 6. Update API key last_used_at ────────────────────
+        # ── 5. Update API key last_used_at ────────────────────
         if ctx.api_key_id:
             key = await db.get(ApiKey, ctx.api_key_id)
             if key:
                 from datetime import datetime, timezone
                 key.last_used_at = datetime.now(timezone.utc)
                 await db.commit()
+    except BaseException as e:
+        await chunks.aclose()
+        await finish()
+        if isinstance(e, RuntimeError):
+            logger.error(f"TTS_STREAM_ENGINE_ERROR voice={tts_request.voice} error={e}")
+            raise ServiceUnavailableError(
+                "TTS generation failed. The service may be temporarily unavailable."
+            )
+        raise
 
-        # ── 7. Return JSON with SRT + headers ─────────────────
-        rl_headers = rate_limiter.get_headers(ctx, usage)
-        rl_headers["X-Cache-Hit"] = "false"
-        rl_headers["X-Cache-Key"] = cache_key[:16]
-
-        logger.info(
-            f"TTS_SRT_GENERATED voice={tts_request.voice} "
-            f"len={len(text)} tier={ctx.tier} words_per_cue={tts_request.words_per_cue}"
-        )
-
-        return JSONResponse(
-            content={
-                "srt": srt_content,
-                "cache_key": cache_key[:16],
-                "cache_hit": False,
-            },
-            headers=rl_headers,
-        )
+    async def stream_body():
+        """Forward chunks to the client and tee them into the cache"""
+        audio_chunks = [first_chunk]
+        complete = False
+        try:
+            yield first_chunk
+            async for chunk in chunks:
+                audio_chunks.append(chunk)
+                yield chunk
+            complete = True
+        except Exception as e:
+            # Headers are already sent — all we can do is cut the stream short
+            logger.error(f"TTS_STREAM_ABORTED voice={tts_request.voice} error={e}")
+        finally:
+            await chunks.aclose()
+            if complete and flight is not None:
+                flight.set_result(b"".join(audio_chunks))
+            await finish()
+
+        # ── 6. Save to cache (only complete audio) ────────────
+        if complete:
+            await cache.aput(cache_key, b"".join(audio_chunks))
+            logger.info(
+                f"TTS_STREAM_GENERATED voice={tts_request.voice} "
+                f"len={len(text)} tier={ctx.tier} "
+                f"remaining_day={rl_headers.get('X-RateLimit-Remaining-Day')}"
+            )
 
+    # ── 7. Return stream with rate limit headers ──────────────
+    rl_headers["X-Cache-Hit"] = "false"
+    return StreamingResponse(
+        stream_body(),
+        media_type="audio/mpeg",
+        headers=rl_headers,
+        background=BackgroundTask(finish),
+    )
 
 
-@router.post("/tts/script")
-async def generate_script(
-    script_request: ScriptRequest,
+@router.post("/tts/subtitle")
+async def generate_tts_with_subtitle(
+    tts_request: TTSSubtitleRequest,
     request: Request,
     ctx: RequestContext = Depends(resolve_request_context),
     db: AsyncSession = Depends(get_db),
     rate_limiter: RateLimiter = Depends(get_rate_limiter),
 ):
     """
-    Generate multi-voice script audio (dialog/podcast).
-    Script format: [Speaker] text
-    Each line costs characters toward rate limit.
-    
-    IMPORTANT: Multi-voice is ONLY available for registered users.
+    Generate TTS audio + SRT/VTT subtitles.
+    Returns JSON with SRT, VTT and cache key.
+    Audio can be retrieved via normal /tts endpoint with same parameters.
+
+    Word timings are cached under the same key as the audio, so a repeat
+    request — with any words_per_cue — is rendered locally without edge-tts.
+    """
+    text = tts_request.text.strip()
+
+    # ── 1. Rate limit check ───────────────────────────────────
+    request_type = "api_tts" if not ctx.is_web_ui else "webui_tts"
+    usage = await rate_limiter.check_and_consume(ctx, db, len(text), request_type=request_type)
+
+    # ── 2. Cache check (word timings) ─────────────────────────
+    cache = get_cache()
+    cache_key = compute_cache_key(tts_request)
+    cached_timings = await cache.aget_bytes(cache_key, namespace="subtitle")
+    words = decode_timings(cached_timings) if cached_timings else None
+    cache_hit = words is not None
+
+    if not cache_hit:
+        # ── 3. Acquire concurrent semaphore ───────────────────
+        async with rate_limiter.acquire_concurrent(ctx):
+            # ── 4. Generate audio + timings (coalesced per key) ──
+            async def synthesize_and_cache() -> list:
+                tts_engine = get_tts_engine()
+                try:
+                    audio_bytes, result = await tts_engine.synthesize_with_subtitles(
+                        text=text,
+                        voice=tts_request.voice,
+                        rate=tts_request.rate,
+                        pitch=tts_request.pitch,
+                        volume=tts_request.volume,
+                        style=tts_request.style,
+                        style_degree=tts_request.style_degree,
+                    )
+                except RuntimeError as e:
+                    logger.error(f"TTS_SRT_ENGINE_ERROR voice={tts_request.voice} error={e}")
+                    raise ServiceUnavailableError(
+                        "TTS+SRT generation failed. The service may be temporarily unavailable."
+                    )
+
+                # ── 5. Save audio + timings to cache ──────────
+                await cache.aput(cache_key, audio_bytes)
+                await cache.aput(cache_key, encode_timings(result), namespace="subtitle")
+                return result
+
+            words, _ = await get_tts_flight().do(f"subtitle:{cache_key}", synthesize_and_cache)
+
+    # ── 6. Update API key last_used_at ────────────────────────
+    if ctx.api_key_id:
+        key = await db.get(ApiKey, ctx.api_key_id)
+        if key:
+            from datetime import datetime, timezone
+            key.last_used_at = datetime.now(timezone.utc)
+            await db.commit()
+
+    # ── 7. Render subtitles locally, return JSON + headers ────
+    rl_headers = rate_limiter.get_headers(ctx, usage)
+    rl_headers["X-Cache-Hit"] = "true" if cache_hit else "false"
+    rl_headers["X-Cache-Key"] = cache_key[:16]
+
+    logger.info(
+        f"TTS_SRT_{'CACHE_HIT' if cache_hit else 'GENERATED'} voice={tts_request.voice} "
+        f"len={len(text)} tier={ctx.tier} words_per_cue={tts_request.words_per_cue}"
+    )
+
+    return JSONResponse(
+        content={
+            "srt": build_srt(words, tts_request.words_per_cue),
+            "vtt": build_vtt(words, tts_request.words_per_cue),
+            "cache_key": cache_key[:16],
+            "cache_hit": cache_hit,
+        },
+        headers=rl_headers,
+    )
+
+
+async def prepare_script(
+    script_request: ScriptRequest,
+    ctx: RequestContext,
+    db: AsyncSession,
+    rate_limiter: RateLimiter,
+) -> tuple[list, dict, str, bytes | None]:
     """
-    from app.services.script_service import parse_script, generate_script_audio
+    Shared front half of the script endpoints: access checks, parsing, rate
+    limiting and the script-level cache lookup.
+    Returns (lines, rl_headers, script_key, cached_audio_or_None).
+    """
+    from app.services.script_service import parse_script, line_cache_keys
     
     # ── 0. Block anonymous users ──────────────────────────────
     if ctx.tier == "anonymous":
@@ -263,6 +402,44 @@ async def generate_script(
     # ── 3. Rate limit check ───────────────────────────────────
     request_type = "api_multivoice" if not ctx.is_web_ui else "webui_multivoice"
     usage = await rate_limiter.check_and_consume(ctx, db, total_chars, request_type=request_type)
+    rl_headers = rate_limiter.get_headers(ctx, usage)
+    
+    # ── 3.1. Script-level cache check (unchanged resubmission) ─
+    script_key = script_cache_key(
+        line_cache_keys(lines, script_request.voice_map, script_request.rate, script_request.pitch),
+        script_request.pause_ms,
+    )
+    rl_headers["X-Cache-Key"] = script_key[:16]
+    cached_audio = await get_cache().aget_bytes(script_key, namespace="script")
+    if cached_audio:
+        logger.info(f"SCRIPT_CACHE_HIT key={script_key[:8]}... lines={len(lines)} tier={ctx.tier}")
+        rl_headers["X-Cache-Hit"] = "true"
+    return lines, rl_headers, script_key, cached_audio
+
+
+@router.post("/tts/script")
+async def generate_script(
+    script_request: ScriptRequest,
+    request: Request,
+    ctx: RequestContext = Depends(resolve_request_context),
+    db: AsyncSession = Depends(get_db),
+    rate_limiter: RateLimiter = Depends(get_rate_limiter),
+):
+    """
+    Generate multi-voice script audio (dialog/podcast).
+    Script format: [Speaker] text
+    Each line costs characters toward rate limit.
+    
+    IMPORTANT: Multi-voice is ONLY available for registered users.
+    """
+    from app.services.script_service import generate_script_audio
+    
+    lines, rl_headers, script_key, cached_audio = await prepare_script(
+        script_request, ctx, db, rate_limiter
+    )
+    total_chars = sum(len(line.text) for line in lines)
+    if cached_audio:
+        return Response(content=cached_audio, media_type="audio/mpeg", headers=rl_headers)
     
     # ── 4. Acquire concurrent semaphore (per-user) ───────────
     async with rate_limiter.acquire_concurrent(ctx):
@@ -284,6 +461,8 @@ async def generate_script(
                     f"Script generation failed: {e}"
                 )
         
+        await get_cache().aput(script_key, audio_bytes, namespace="script")
+        
         # ── 7. Update API key last_used_at ────────────────────
         if ctx.api_key_id:
             key = await db.get(ApiKey, ctx.api_key_id)
@@ -293,7 +472,7 @@ async def generate_script(
                 await db.commit()
         
         # ── 8. Return audio with rate limit headers ───────────
-        rl_headers = rate_limiter.get_headers(ctx, usage)
+        rl_headers["X-Cache-Hit"] = "false"
         
         logger.info(
             f"SCRIPT_GENERATED lines={len(lines)} "
@@ -306,3 +485,99 @@ async def generate_script(
             media_type="audio/mpeg",
             headers=rl_headers,
         )
+
+
+@router.post("/tts/script/stream")
+async def generate_script_stream(
+    script_request: ScriptRequest,
+    request: Request,
+    ctx: RequestContext = Depends(resolve_request_context),
+    db: AsyncSession = Depends(get_db),
+    rate_limiter: RateLimiter = Depends(get_rate_limiter),
+):
+    """
+    Streaming variant of POST /tts/script.
+    Emits the assembled MP3 in line order as soon as each leading line is ready
+    (pause frames in between), so playback can start after the first line.
+    Same access rules, rate limits and headers as /tts/script.
+    """
+    from app.services.script_service import stream_script_audio
+    
+    lines, rl_headers, script_key, cached_audio = await prepare_script(
+        script_request, ctx, db, rate_limiter
+    )
+    if cached_audio:
+        return Response(content=cached_audio, media_type="audio/mpeg", headers=rl_headers)
+    
+    # ── 4–5. Concurrent + heavy slots ─────────────────────────
+    # Held until the stream finishes: released by the body generator, or by the
+    # response background task if the body never runs (client gone early)
+    slots = HeldSlots()
+    await slots.enter(rate_limiter.acquire_concurrent(ctx))
+    try:
+        await slots.enter(rate_limiter.acquire_heavy_operation())
+    except BaseException:
+        await slots.release()
+        raise
+    
+    # ── 6. Open stream — wait for the first line so failures still map to 503
+    chunks = stream_script_audio(
+        lines=lines,
+        voice_map=script_request.voice_map,
+        pause_ms=script_request.pause_ms,
+        rate=script_request.rate,
+        pitch=script_request.pitch,
+        volume=script_request.volume,
+    )
+    try:
+        first_chunk = await chunks.__anext__()
+        
+        # ── 7. Update API key last_used_at ────────────────────
+        if ctx.api_key_id:
+            key = await db.get(ApiKey, ctx.api_key_id)
+            if key:
+                from datetime import datetime, timezone
+                key.last_used_at = datetime.now(timezone.utc)
+                await db.commit()
+    except BaseException as e:
+        await chunks.aclose()
+        await slots.release()
+        if isinstance(e, RuntimeError):
+            logger.error(f"SCRIPT_STREAM_ENGINE_ERROR lines={len(lines)} error={e}")
+            raise ServiceUnavailableError(f"Script generation failed: {e}")
+        raise
+    
+    async def stream_body():
+        """Forward lines to the client and tee them into the script cache"""
+        parts = [first_chunk]
+        complete = False
+        try:
+            yield first_chunk
+            async for chunk in chunks:
+                parts.append(chunk)
+                yield chunk
+            complete = True
+        except Exception as e:
+            # Headers are already sent — all we can do is cut the stream short
+            logger.error(f"SCRIPT_STREAM_ABORTED lines={len(lines)} error={e}")
+        finally:
+            await chunks.aclose()
+            await slots.release()
+        
+        # ── 8. Save to cache (only complete audio, with Info header) ──
+        if complete:
+            audio_bytes = with_info_frame(b"".join(parts))
+            await get_cache().aput(script_key, audio_bytes, namespace="script")
+            logger.info(
+                f"SCRIPT_STREAM_GENERATED lines={len(lines)} tier={ctx.tier} "
+                f"size={len(audio_bytes)} bytes"
+            )
+    
+    # ── 9. Return stream with rate limit headers ──────────────
+    rl_headers["X-Cache-Hit"] = "false"
+    return StreamingResponse(
+        stream_body(),
+        media_type="audio/mpeg",
+        headers=rl_headers,
+        background=BackgroundTask(slots.release),
+    )
@@ -31,6 +31,9 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 15
     refresh_token_expire_days: int = 7
+    auth_cache_ttl: int = 60                # seconds a resolved API key / JWT identity is cached (0 = off)
+    blacklist_refresh_interval: int = 300   # seconds between in-memory blacklist reloads from the DB
+    token_revocation_sync_interval: int = 60  # seconds between in-memory JWT revocation syncs from the DB
 
     # ── Email — Primary SMTP ──────────────────────────────────
     smtp_host: str = ""
@@ -70,19 +73,56 @@ class Settings(BaseSettings):
     free_webui_req_per_day: int = 30
     free_webui_req_per_min: int = 3
 
+    # Daily counters: flush in-memory increments every N seconds (0 = write per request)
+    usage_flush_interval: float = 5.0
+
     # ── Proxy (comma-separated, optional) ────────────────────
-    proxies: str = ""  # empty = no proxy, "http://p1,http://p2" = round-robin
+    proxies: str = ""  # empty = no proxy, "http://p1,http://p2" = latency-aware selection
+    proxy_probe_interval: int = 30          # seconds between active route probes (0 = off, no proxies = off)
+    proxy_probe_timeout: float = 10.0       # a probe slower than this counts as a failure
 
     # ── TTS (from v1) ─────────────────────────────────────────
     default_voice: str = "id-ID-GadisNeural"
     max_concurrent: int = 3
     tts_max_retries: int = 3
     tts_retry_delay: float = 1.0
+    # Long texts are split at sentence boundaries and synthesized in parallel
+    tts_chunk_threshold: int = 600          # chars above which chunking kicks in (0 = off)
+    tts_chunk_max_chars: int = 300          # max chars per chunk
+    tts_chunk_concurrency: int = 4          # parallel edge-tts sessions per request
+    script_line_concurrency: int = 6        # parallel lines per multi-voice script
+    # Hedging: race a second route when the first has no audio after its p95 latency
+    tts_hedge_enabled: bool = False
+    tts_hedge_delay: float = 2.0            # hedge deadline until a route has p95 samples
+    tts_hedge_min_delay: float = 0.3        # lower bound on the p95-derived deadline
+    # Shared aiohttp connector per route (direct / proxy) with pre-opened TLS connections
+    tts_pool_enabled: bool = True
+    tts_pool_warm: int = 2                  # idle connections kept open per route (0 = no warm-up)
+    tts_pool_max_age: int = 600             # seconds before a route's connector is recycled
+    tts_pool_keepalive: float = 30.0        # idle connection lifetime (seconds)
+
+    # ── Background jobs (POST /api/v1/jobs) ───────────────────
+    job_workers: int = 2                    # in-process workers draining the job queue
+    job_max_pending: int = 5                # queued + running jobs allowed per user
+    job_retention_days: int = 7             # finished jobs are deleted after this
+
+    # ── Batch TTS (POST /api/v1/batch/tts) ────────────────────
+    batch_max_items: int = 50               # items per batch request
+    batch_concurrency: int = 4              # parallel syntheses per batch (cache misses)
+    batch_audio_url_ttl: int = 3600         # seconds a signed /batch/audio URL stays valid
 
     # ── Cache (from v1) ───────────────────────────────────────
     cache_dir: str = "./data/cache"
     cache_max_size_gb: float = 5.0
     cache_ttl_days: int = 30
+    # Background eviction worker (lru | lfu | gdsf)
+    cache_eviction_policy: str = "lru"
+    cache_eviction_interval: int = 60       # seconds between worker runs
+    cache_eviction_budget: int = 1000       # max files deleted per run
+    cache_high_watermark: float = 0.95      # start evicting above this fraction of max size
+    cache_low_watermark: float = 0.80       # evict down to this fraction
+    cache_io_workers: int = 4               # threads for non-blocking cache I/O
+    cache_memory_mb: int = 128              # in-process hot tier in front of disk (0 = off)
 
     # ── Google AdSense ────────────────────────────────────────
     adsense_client_id: str = ""
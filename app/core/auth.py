@@ -17,6 +17,8 @@ from sqlalchemy import select
 
 from app.config import settings
 from app.core.exceptions import ForbiddenError, AuthenticationError
+from app.core.blacklist_index import get_blacklist_index
+from app.core.identity_cache import CachedIdentity, get_identity_cache
 from app.core.jwt_handler import decode_token
 
 logger = logging.getLogger(__name__)
@@ -73,25 +75,12 @@ def is_own_origin(request: Request) -> bool:
     )
 
 
-async def is_blacklisted(db: AsyncSession, ip: str, email: str = None) -> bool:
-    """Check if IP or email is in blacklist table"""
-    from app.db.models import Blacklist
-
-    conditions = [Blacklist.value == ip, Blacklist.type == "ip"]
-    result = await db.execute(
-        select(Blacklist).where(Blacklist.type == "ip", Blacklist.value == ip)
-    )
-    if result.scalar_one_or_none():
+def is_blacklisted(ip: str, email: str = None) -> bool:
+    """Check if IP (exact or inside a blacklisted CIDR range) or email is blacklisted"""
+    index = get_blacklist_index()
+    if index.is_ip_blacklisted(ip):
         return True
-
-    if email:
-        result = await db.execute(
-            select(Blacklist).where(Blacklist.type == "email", Blacklist.value == email)
-        )
-        if result.scalar_one_or_none():
-            return True
-
-    return False
+    return bool(email) and index.is_email_blacklisted(email)
 
 
 from app.db.database import get_db
@@ -107,48 +96,62 @@ async def resolve_request_context(
     Resolution order:
     1. X-API-Key header → DB lookup → "registered" (API limits: 1000 char)
     2. Authorization: Bearer <jwt> → decode → load user's API key → "registered" (Web UI limits: 2000 char)
+    The user / API key lookups of 1. and 2. are cached (see app/core/identity_cache.py).
     3. No credentials + Origin = own domain → "anonymous" (Web UI: 500 char)
     4. No credentials + external Origin → 403 Forbidden
     """
     from app.db.models import ApiKey, User
 
     ip = get_client_ip(request)
+    cache = get_identity_cache()
 
-    # Check IP blacklist first
-    if await is_blacklisted(db, ip=ip):
+    # Check IP blacklist first (in-memory, no DB round-trip)
+    if is_blacklisted(ip=ip):
         logger.warning(f"BLACKLIST_BLOCK ip={ip}")
         raise ForbiddenError("Access denied")
 
     # ── 1. X-API-Key header (External API call) ───────────────
     api_key_header = request.headers.get("x-api-key")
     if api_key_header:
-        result = await db.execute(
-            select(ApiKey).where(
-                ApiKey.key == api_key_header,
-                ApiKey.is_active == True
+        identity = cache.get_by_key(api_key_header)
+        if identity is None:
+            generation = cache.generation
+            result = await db.execute(
+                select(ApiKey).where(
+                    ApiKey.key == api_key_header,
+                    ApiKey.is_active == True
+                )
             )
-        )
-        key = result.scalar_one_or_none()
+            key = result.scalar_one_or_none()
 
-        if not key:
-            raise ForbiddenError("Invalid or inactive API key")
+            if not key:
+                raise ForbiddenError("Invalid or inactive API key")
 
-        user = await db.get(User, key.user_id)
-        if not user or not user.is_active:
-            raise ForbiddenError("Account disabled or banned")
+            user = await db.get(User, key.user_id)
+            if not user or not user.is_active:
+                raise ForbiddenError("Account disabled or banned")
+
+            identity = CachedIdentity(
+                user_id=user.id,
+                email=user.email,
+                is_verified=user.is_verified,
+                api_key=key.key,
+                api_key_id=key.id,
+            )
+            cache.put_key(api_key_header, identity, generation)
 
         # Check email blacklist
-        if await is_blacklisted(db, ip=ip, email=user.email):
+        if is_blacklisted(ip=ip, email=identity.email):
             raise ForbiddenError("Access denied")
 
-        logger.debug(f"AUTH_API_KEY user_id={user.id} verified={user.is_verified} ip={ip}")
+        logger.debug(f"AUTH_API_KEY user_id={identity.user_id} verified={identity.is_verified} ip={ip}")
         return RequestContext(
             tier="registered",
-            api_key=key.key,
-            api_key_id=key.id,
-            user_id=user.id,
-            user_email=user.email,
-            is_verified=user.is_verified,
+            api_key=identity.api_key,
+            api_key_id=identity.api_key_id,
+            user_id=identity.user_id,
+            user_email=identity.email,
+            is_verified=identity.is_verified,
             ip_address=ip,
             char_limit=settings.free_api_char_limit,  # 1000 char for API
             req_per_day=settings.free_api_req_per_day,
@@ -165,28 +168,42 @@ async def resolve_request_context(
         except AuthenticationError:
             raise
 
-        user = await db.get(User, user_id)
+        user_id = payload["user_id"]
+
+        identity = cache.get_by_user(user_id)
+        if identity is None:
+            generation = cache.generation
+            user = await db.get(User, user_id)
 
-        if not user or not user.is_active:
-            raise ForbiddenError("Account disabled or banned")
+            if not user or not user.is_active:
+                raise ForbiddenError("Account disabled or banned")
 
-        # Load user's active API key
-        result = await db.execute(
-            select(ApiKey).where(
-                ApiKey.user_id == user_id,
-                ApiKey.is_active == True
+            # Load user's active API key
+            result = await db.execute(
+                select(ApiKey).where(
+                    ApiKey.user_id == user_id,
+                    ApiKey.is_active == True
+                )
             )
-        )
-        key = result.scalar_one_or_none()
+            key = result.scalar_one_or_none()
+
+            identity = CachedIdentity(
+                user_id=user_id,
+                email=user.email,
+                is_verified=user.is_verified,
+                api_key=key.key if key else None,
+                api_key_id=key.id if key else None,
+            )
+            cache.put_user(identity, generation)
 
-        logger.debug(f"AUTH_JWT user_id={user_id} verified={user.is_verified} ip={ip}")
+        logger.debug(f"AUTH_JWT user_id={user_id} verified={identity.is_verified} ip={ip}")
         return RequestContext(
             tier="registered",
-            api_key=key.key if key else None,
-            api_key_id=key.id if key else None,
+            api_key=identity.api_key,
+            api_key_id=identity.api_key_id,
             user_id=user_id,
-            user_email=user.email,
-            is_verified=user.is_verified,
+            user_email=identity.email,
+            is_verified=identity.is_verified,
             ip_address=ip,
             char_limit=settings.free_webui_char_limit,  # 2000 char for Web UI
             req_per_day=settings.free_webui_req_per_day,
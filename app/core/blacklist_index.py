@@ -0,0 +1,135 @@
+"""
+eidosSpeech v2 — In-memory Blacklist Index
+The `blacklist` table, loaded into memory so every request is checked
+without a DB round-trip:
+
+  emails → set (lowercased), O(1)
+  IPs    → one binary prefix trie per address family; an entry is either a
+           single address ("203.0.113.7") or a CIDR range ("203.0.113.0/24"),
+           and a lookup walks at most 32 / 128 bits
+
+Loaded at startup, reloaded after POST /admin/blacklist and every
+settings.blacklist_refresh_interval seconds (picks up rows written by other
+workers or directly in the DB). A reload builds a fresh index and swaps it in,
+so lookups never see a half-built one.
+"""
+
+import ipaddress
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+_END = "end"    # trie node key marking a blacklisted prefix
+
+
+def parse_ip(value: str) -> ipaddress.IPv4Address | ipaddress.IPv6Address | None:
+    """Client IP → address (IPv4-mapped IPv6 unwrapped), None if unparsable"""
+    try:
+        address = ipaddress.ip_address(value.strip())
+    except ValueError:
+        return None
+    if address.version == 6 and address.ipv4_mapped:
+        return address.ipv4_mapped
+    return address
+
+
+def normalize_ip_entry(value: str) -> str:
+    """
+    Canonical form of an `ip` blacklist value: a plain address for single
+    hosts, network/prefix for ranges (host bits cleared).
+    Raises ValueError for anything that is not an IP address or CIDR range.
+    """
+    network = ipaddress.ip_network(value.strip(), strict=False)
+    if network.num_addresses == 1:
+        return str(network.network_address)
+    return str(network)
+
+
+class _PrefixTrie:
+    """Binary trie of network prefixes for one address family"""
+
+    def __init__(self, bits: int):
+        self.bits = bits
+        self.root: dict = {}
+
+    def add(self, network: ipaddress.IPv4Network | ipaddress.IPv6Network):
+        node = self.root
+        value = int(network.network_address)
+        for i in range(network.prefixlen):
+            node = node.setdefault((value >> (self.bits - 1 - i)) & 1, {})
+            if _END in node:
+                return      # already covered by a shorter prefix
+        node[_END] = True
+
+    def contains(self, address: ipaddress.IPv4Address | ipaddress.IPv6Address) -> bool:
+        node = self.root
+        value = int(address)
+        for i in range(self.bits):
+            if _END in node:
+                return True
+            node = node.get((value >> (self.bits - 1 - i)) & 1)
+            if node is None:
+                return False
+        return _END in node
+
+
+class BlacklistIndex:
+    """Email set + IPv4/IPv6 prefix tries, rebuilt from the blacklist table"""
+
+    def __init__(self):
+        self._emails: frozenset[str] = frozenset()
+        self._tries = {4: _PrefixTrie(32), 6: _PrefixTrie(128)}
+        self._ip_entries = 0
+        self.loaded = False
+
+    async def load(self, db: AsyncSession):
+        """Rebuild the index from the DB and swap it in"""
+        from app.db.models import Blacklist
+
+        result = await db.execute(select(Blacklist.type, Blacklist.value))
+        emails = set()
+        tries = {4: _PrefixTrie(32), 6: _PrefixTrie(128)}
+        ip_entries = 0
+        for entry_type, value in result.all():
+            if entry_type == "email":
+                emails.add(value.strip().lower())
+            elif entry_type == "ip":
+                try:
+                    network = ipaddress.ip_network(value.strip(), strict=False)
+                except ValueError:
+                    logger.warning(f"BLACKLIST_INVALID_ENTRY value={value!r} — skipped")
+                    continue
+                tries[network.version].add(network)
+                ip_entries += 1
+
+        self._emails = frozenset(emails)
+        self._tries = tries
+        self._ip_entries = ip_entries
+        self.loaded = True
+        logger.debug(f"BLACKLIST_LOADED ips={ip_entries} emails={len(emails)}")
+
+    def is_ip_blacklisted(self, ip: str) -> bool:
+        address = parse_ip(ip)
+        if address is None:
+            return False
+        return self._tries[address.version].contains(address)
+
+    def is_email_blacklisted(self, email: str) -> bool:
+        return email.strip().lower() in self._emails
+
+    def stats(self) -> dict:
+        return {"loaded": self.loaded, "ips": self._ip_entries, "emails": len(self._emails)}
+
+
+# Singleton — loaded from the DB in main.py
+_blacklist_index: BlacklistIndex = None
+
+
+def get_blacklist_index() -> BlacklistIndex:
+    global _blacklist_index
+    if _blacklist_index is None:
+        _blacklist_index = BlacklistIndex()
+    return _blacklist_index
@@ -1,89 +1,596 @@
 """
 eidosSpeech v2 — File-based Audio Cache
 Cache TTS audio by content hash to avoid re-generating identical requests.
+
+Blobs live under a versioned, per-namespace, sharded tree:
+
+    cache_dir/v<CACHE_KEY_VERSION>/<namespace>/ab/cd/<key><suffix>
+
+(two levels of 256-way fan-out keep directories small as the cache grows into
+millions of files). Keys and namespaces come from app.core.cache_keys.
+Files left over from an older layout are purged incrementally by maintenance.
+
+Metadata (size, last access, hit
+count) lives in an SQLite sidecar index (cache_dir/index.db), with running
+totals maintained by triggers — so stats() is O(1) and eviction is O(evicted)
+instead of globbing + stat()ing every file. The index is rebuilt from the
+directory on startup if it is missing, corrupt or from an older schema.
+
+Eviction and TTL expiry do not run in the request path: run_maintenance() is
+called by a background worker (see periodic_cache_eviction in main.py) and
+deletes at most `budget` files per run, ordered by the configured policy.
+
+Async handlers use aget()/aput(), which run the blocking filesystem/index work
+in a small dedicated thread pool. Writes go to a temp file + os.replace, so a
+reader never sees a partially written MP3.
+
+Hot blobs are additionally kept in a byte-budgeted in-process LRU (MemoryLRU)
+in front of the disk tier — aget_bytes() serves them without touching disk.
 """
 
-import hashlib
-import json
+import asyncio
 import logging
 import os
-import shutil
+import re
+import sqlite3
+import threading
+import tempfile
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from app.config import settings
+from app.core.cache_keys import CACHE_KEY_VERSION, NAMESPACES
 
 logger = logging.getLogger(__name__)
 
+INDEX_FILENAME = "index.db"
+INDEX_SCHEMA_VERSION = 3  # bump to force a rebuild from disk on next startup
+
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace   TEXT NOT NULL,
+    key         TEXT NOT NULL,
+    size        INTEGER NOT NULL,
+    created_at  REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits        INTEGER NOT NULL DEFAULT 0,
+    priority    REAL NOT NULL DEFAULT 0,     -- GDSF priority: clock + (hits + 1) / size
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access);
+CREATE INDEX IF NOT EXISTS idx_entries_hits ON entries(hits, last_access);
+CREATE INDEX IF NOT EXISTS idx_entries_priority ON entries(priority);
+CREATE INDEX IF NOT EXISTS idx_entries_created_at ON entries(created_at);
+
+CREATE TABLE IF NOT EXISTS totals (
+    id         INTEGER PRIMARY KEY CHECK (id = 0),
+    files      INTEGER NOT NULL,
+    bytes      INTEGER NOT NULL,
+    gdsf_clock REAL NOT NULL DEFAULT 0       -- GDSF inflation value L
+);
+INSERT OR IGNORE INTO totals (id, files, bytes, gdsf_clock) VALUES (0, 0, 0, 0);
+
+CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+    UPDATE totals SET files = files + 1, bytes = bytes + NEW.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+    UPDATE totals SET files = files - 1, bytes = bytes - OLD.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_au AFTER UPDATE OF size ON entries BEGIN
+    UPDATE totals SET bytes = bytes + NEW.size - OLD.size WHERE id = 0;
+END;
+"""
+
+# Hit bookkeeping — one query shape for disk hits and batched memory hits.
+# Params: (now, hit_count, hit_count, namespace, key)
+_RECORD_ACCESS_SQL = (
+    "UPDATE entries SET last_access = MAX(last_access, ?), hits = hits + ?, "
+    "priority = (SELECT gdsf_clock FROM totals WHERE id = 0) "
+    "+ (hits + ? + 1.0) / MAX(size, 1) "
+    "WHERE namespace = ? AND key = ?"
+)
+
+_LAYOUT_DIR = f"v{CACHE_KEY_VERSION}"
+_LAYOUT_RE = re.compile(r"^v\d+$")
+
+# Eviction order per policy — victims are taken from the front
+EVICTION_POLICIES = {
+    "lru": "last_access ASC",               # least recently used
+    "lfu": "hits ASC, last_access ASC",     # least frequently used, LRU tie-break
+    "gdsf": "priority ASC",                 # greedy-dual-size-frequency (small + hot wins)
+}
+
+
+class MemoryLRU:
+    """
+    Byte-budgeted in-process LRU of hot audio blobs.
+    Items larger than max_item_bytes are never admitted, so a single long
+    text can't flush the whole hot set. Keys are (namespace, key) tuples.
+    """
+
+    def __init__(self, max_bytes: int, max_item_bytes: int):
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes
+        self._items: OrderedDict[tuple, tuple[bytes, float]] = OrderedDict()  # key → (data, created_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> tuple[bytes, float] | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+            return item
+
+    def put(self, key: tuple, data: bytes, created_at: float):
+        if len(data) > self.max_item_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[0])
+            self._items[key] = (data, created_at)
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes and self._items:
+                _, (evicted, _) = self._items.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def discard(self, key: tuple):
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[0])
+
+    def stats(self) -> dict:
+        return {
+            "items": len(self._items),
+            "size_mb": round(self._bytes / 1024 ** 2, 2),
+            "max_mb": round(self.max_bytes / 1024 ** 2, 2),
+        }
+
 
 class TTSCache:
-    """File-based cache for TTS audio output. Keyed by content hash."""
+    """File-based cache for TTS output. Keyed by (namespace, content hash), indexed in SQLite."""
 
-    def __init__(self, cache_dir: str, max_size_gb: float, ttl_days: int):
+    def __init__(
+        self,
+        cache_dir: str,
+        max_size_gb: float,
+        ttl_days: int,
+        policy: str = "lru",
+        high_watermark: float = 0.95,
+        low_watermark: float = 0.80,
+        io_workers: int = 4,
+        memory_mb: int = 0,
+    ):
         self.cache_dir = Path(cache_dir)
         self.max_size_bytes = int(max_size_gb * 1024 ** 3)
         self.ttl_seconds = ttl_days * 86400
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
-    def _key(self, text: str, voice: str, rate: str, pitch: str) -> str:
-        """Generate SHA256 cache key from TTS parameters"""
-        content = json.dumps({
-            "text": text, "voice": voice, "rate": rate, "pitch": pitch
-        }, ensure_ascii=False, sort_keys=True).encode()
-        return hashlib.sha256(content).hexdigest()
-
-    def get(self, cache_key: str) -> str | None:
-        """Return cached file path if hit and not expired, else None"""
-        path = self.cache_dir / f"{cache_key}.mp3"
-        if not path.exists():
-            return None
+        if policy not in EVICTION_POLICIES:
+            logger.warning(f"CACHE_POLICY_UNKNOWN policy={policy} — falling back to lru")
+            policy = "lru"
+        self.policy = policy
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self._evicting = False
+        self._legacy_clean = False  # set once no old-layout files remain
+
+        # In-memory hot tier (0 = disabled); hits are batched into the index
+        memory_bytes = memory_mb * 1024 ** 2
+        self._memory = MemoryLRU(memory_bytes, memory_bytes // 16) if memory_bytes > 0 else None
+        self._memory_hits_pending: dict[tuple, list] = {}  # (namespace, key) → [count, last_access]; event loop only
+        self._hits = {"memory": 0, "disk": 0, "miss": 0}
+
+        # Bounded pool for aget/aput — disk stalls can't starve the default executor
+        self._executor = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="tts-cache")
+
+        # sqlite3 connection is shared across threads — serialize access
+        self._lock = threading.Lock()
+        self._index_path = self.cache_dir / INDEX_FILENAME
+        self._db = self._open_index()
+
+    # ── Index management ──────────────────────────────────────
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self._index_path), check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _open_index(self) -> sqlite3.Connection:
+        """Open the sidecar index; rebuild from the directory if missing or corrupt"""
+        existed = self._index_path.exists()
+        try:
+            conn = self._connect()
+            if existed:
+                ok = conn.execute("PRAGMA quick_check").fetchone()[0]
+                if ok != "ok":
+                    raise sqlite3.DatabaseError(f"quick_check: {ok}")
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                if version != INDEX_SCHEMA_VERSION:
+                    raise sqlite3.DatabaseError(
+                        f"schema version {version}, expected {INDEX_SCHEMA_VERSION}"
+                    )
+            conn.executescript(_INDEX_SCHEMA)
+            conn.execute(f"PRAGMA user_version = {INDEX_SCHEMA_VERSION}")
+        except sqlite3.DatabaseError as e:
+            logger.warning(f"CACHE_INDEX_CORRUPT path={self._index_path} error={e} — rebuilding")
+            try:
+                conn.close()
+            except Exception:
+                pass
+            for suffix in ("", "-wal", "-shm"):
+                Path(f"{self._index_path}{suffix}").unlink(missing_ok=True)
+            conn = self._connect()
+            conn.executescript(_INDEX_SCHEMA)
+            conn.execute(f"PRAGMA user_version = {INDEX_SCHEMA_VERSION}")
+            existed = False
+
+        if not existed:
+            self._rebuild_index(conn)
+        return conn
+
+    def _rebuild_index(self, conn: sqlite3.Connection):
+        """Repopulate the index from the blobs under the current layout"""
+        rows = []
+        for namespace, suffix in NAMESPACES.items():
+            for f in (self.cache_dir / _LAYOUT_DIR / namespace).glob("*/*/*"):
+                if f.name.startswith(".tmp-"):
+                    # Leftover from an interrupted atomic write
+                    f.unlink(missing_ok=True)
+                    continue
+                if f.suffix != suffix:
+                    continue
+                try:
+                    st = f.stat()
+                except FileNotFoundError:
+                    continue
+                rows.append((
+                    namespace, f.stem, st.st_size, st.st_mtime, st.st_mtime,
+                    1.0 / max(st.st_size, 1),
+                ))
+
+        with conn:
+            conn.execute("DELETE FROM entries")
+            conn.execute("UPDATE totals SET files = 0, bytes = 0, gdsf_clock = 0 WHERE id = 0")
+            conn.executemany(
+                "INSERT OR REPLACE INTO entries "
+                "(namespace, key, size, created_at, last_access, hits, priority) "
+                "VALUES (?, ?, ?, ?, ?, 0, ?)",
+                rows,
+            )
+        logger.info(f"CACHE_INDEX_REBUILT files={len(rows)}")
+
+    # ── Public API ────────────────────────────────────────────
 
-        # Check TTL
-        age = time.time() - path.stat().st_mtime
-        if age > self.ttl_seconds:
-            path.unlink(missing_ok=True)
+    def _path(self, cache_key: str, namespace: str = "tts") -> Path:
+        """cache_dir/v<N>/<namespace>/ab/cd/<key><suffix>"""
+        return (
+            self.cache_dir / _LAYOUT_DIR / namespace
+            / cache_key[:2] / cache_key[2:4] / f"{cache_key}{NAMESPACES[namespace]}"
+        )
+
+    def get(self, cache_key: str, namespace: str = "tts") -> str | None:
+        """
+        Return cached file path if hit and not expired, else None.
+        Expired entries are reported as misses here and deleted in bulk
+        by run_maintenance().
+        """
+        entry = self._get_entry(cache_key, namespace)
+        return entry[0] if entry else None
+
+    def _get_entry(self, cache_key: str, namespace: str = "tts") -> tuple[str, float] | None:
+        """get() plus the entry's created_at timestamp"""
+        path = self._path(cache_key, namespace)
+        now = time.time()
+
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT created_at FROM entries WHERE namespace = ? AND key = ?",
+                    (namespace, cache_key),
+                ).fetchone()
+            if row is None or now - row[0] > self.ttl_seconds:
+                return None
+
+            # stat() outside the lock — other threads' index reads/writes don't wait on the disk
+            if not path.exists():
+                # File removed behind our back — drop the stale index row,
+                # unless a concurrent put() has re-created the entry meanwhile
+                with self._lock, self._db:
+                    self._db.execute(
+                        "DELETE FROM entries WHERE namespace = ? AND key = ? AND created_at = ?",
+                        (namespace, cache_key, row[0]),
+                    )
+                return None
+
+            # Record access for LRU/LFU/GDSF bookkeeping
+            with self._lock, self._db:
+                self._db.execute(_RECORD_ACCESS_SQL, (now, 1, 1, namespace, cache_key))
+        except sqlite3.Error as e:
+            logger.warning(f"CACHE_INDEX_ERROR op=get ns={namespace} key={cache_key[:8]}... error={e}")
             return None
 
-        # Touch to update access time (LRU-style)
-        path.touch()
-        return str(path)
+        return str(path), row[0]
 
-    def put(self, cache_key: str, audio_bytes: bytes) -> str:
-        """Save audio bytes to cache, return file path"""
-        path = self.cache_dir / f"{cache_key}.mp3"
-        path.write_bytes(audio_bytes)
+    def put(self, cache_key: str, audio_bytes: bytes, namespace: str = "tts") -> str:
+        """
+        Save bytes to cache, return file path.
+        Size limits are enforced asynchronously by run_maintenance().
+        """
+        path = self._path(cache_key, namespace)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_atomic(path, audio_bytes)
+        now = time.time()
+
+        try:
+            with self._lock, self._db:
+                self._db.execute(
+                    "INSERT INTO entries (namespace, key, size, created_at, last_access, hits, priority) "
+                    "VALUES (?4, ?1, ?2, ?3, ?3, 0, "
+                    "(SELECT gdsf_clock FROM totals WHERE id = 0) + 1.0 / MAX(?2, 1)) "
+                    "ON CONFLICT(namespace, key) DO UPDATE SET size = excluded.size, "
+                    "created_at = excluded.created_at, last_access = excluded.last_access, "
+                    "priority = excluded.priority",
+                    (cache_key, len(audio_bytes), now, namespace),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"CACHE_INDEX_ERROR op=put ns={namespace} key={cache_key[:8]}... error={e}")
 
-        # Enforce max size (simple: remove oldest files)
-        self._evict_if_needed()
         return str(path)
 
-    def _evict_if_needed(self):
-        """Remove oldest files if cache exceeds max size"""
-        total = sum(f.stat().st_size for f in self.cache_dir.glob("*.mp3"))
-        if total <= self.max_size_bytes:
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        """Write to a temp file in the same directory, then rename over the target"""
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=path.suffix)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    # ── Async API (thread offload) ────────────────────────────
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def aget(self, cache_key: str, namespace: str = "tts") -> str | None:
+        """Non-blocking get() for async handlers"""
+        path = await self._run(self.get, cache_key, namespace)
+        self._hits["disk" if path else "miss"] += 1
+        return path
+
+    async def aput(self, cache_key: str, audio_bytes: bytes, namespace: str = "tts") -> str:
+        """Non-blocking put() for async handlers — also admits the blob to the memory tier"""
+        path = await self._run(self.put, cache_key, audio_bytes, namespace)
+        if self._memory:
+            self._memory.put((namespace, cache_key), audio_bytes, time.time())
+        return path
+
+    def _read(self, cache_key: str, namespace: str) -> tuple[bytes, float] | None:
+        """Disk-tier read for aget_bytes(): (data, created_at) or None"""
+        entry = self._get_entry(cache_key, namespace)
+        if entry is None:
+            return None
+        path, created_at = entry
+        try:
+            data = Path(path).read_bytes()
+        except FileNotFoundError:
+            return None
+        return data, created_at
+
+    async def aget_bytes(self, cache_key: str, namespace: str = "tts") -> bytes | None:
+        """
+        Return cached bytes — memory tier first, then disk (promoting to memory).
+        Memory hits are served without any I/O; their bookkeeping is batched into
+        the index on the next maintenance run.
+        """
+        mem_key = (namespace, cache_key)
+        if self._memory:
+            item = self._memory.get(mem_key)
+            if item is not None:
+                data, created_at = item
+                now = time.time()
+                if now - created_at <= self.ttl_seconds:
+                    self._hits["memory"] += 1
+                    pending = self._memory_hits_pending.setdefault(mem_key, [0, now])
+                    pending[0] += 1
+                    pending[1] = now
+                    return data
+                self._memory.discard(mem_key)
+
+        item = await self._run(self._read, cache_key, namespace)
+        if item is None:
+            self._hits["miss"] += 1
+            return None
+
+        self._hits["disk"] += 1
+        data, created_at = item
+        if self._memory:
+            self._memory.put(mem_key, data, created_at)
+        return data
+
+    def _flush_memory_hits(self, pending: dict[tuple, list]):
+        """Write a snapshot of batched memory-tier hits into the index (keeps LFU/GDSF honest)"""
+        if not pending:
             return
+        with self._lock, self._db:
+            self._db.executemany(
+                _RECORD_ACCESS_SQL,
+                [
+                    (last, count, count, namespace, key)
+                    for (namespace, key), (count, last) in pending.items()
+                ],
+            )
 
-        files = sorted(
-            self.cache_dir.glob("*.mp3"),
-            key=lambda f: f.stat().st_mtime
-        )
+    async def arun_maintenance(self, budget: int) -> dict:
+        """Non-blocking run_maintenance() for the background worker"""
+        # aget_bytes() mutates the pending hits on the event loop — take them
+        # here, on the loop, and hand the executor a private snapshot
+        pending, self._memory_hits_pending = self._memory_hits_pending, {}
+        return await self._run(self.run_maintenance, budget, pending)
+
+    def _totals(self) -> tuple[int, int]:
+        """(files, bytes) from the running totals row — O(1)"""
+        with self._lock:
+            files, total = self._db.execute(
+                "SELECT files, bytes FROM totals WHERE id = 0"
+            ).fetchone()
+        return files, total
+
+    def _delete_entries(self, keys: list[tuple[str, str]]):
+        """Drop index rows first, then memory copies and files (outside the lock)"""
+        with self._lock, self._db:
+            self._db.executemany("DELETE FROM entries WHERE namespace = ? AND key = ?", keys)
+        for namespace, key in keys:
+            if self._memory:
+                self._memory.discard((namespace, key))
+            self._path(key, namespace).unlink(missing_ok=True)
+
+    def expire(self, budget: int) -> int:
+        """Delete up to `budget` entries older than the TTL, oldest first"""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            keys = [tuple(r) for r in self._db.execute(
+                "SELECT namespace, key FROM entries WHERE created_at < ? "
+                "ORDER BY created_at LIMIT ?",
+                (cutoff, budget),
+            ).fetchall()]
+        if keys:
+            self._delete_entries(keys)
+            logger.debug(f"CACHE_EXPIRE count={len(keys)}")
+        return len(keys)
+
+    def evict(self, budget: int) -> int:
+        """
+        If total size is above the high watermark, delete entries in policy order
+        until it is below the low watermark or `budget` files have been deleted.
+        """
+        _, total = self._totals()
+        # Hysteresis: a pass cut short by its budget keeps going on the next run
+        if total > self.max_size_bytes * self.high_watermark:
+            self._evicting = True
+        if not self._evicting:
+            return 0
+
+        target = self.max_size_bytes * self.low_watermark
+        order_by = EVICTION_POLICIES[self.policy]
+        evicted = 0
+
+        while total > target and evicted < budget:
+            batch = min(256, budget - evicted)
+            with self._lock:
+                victims = self._db.execute(
+                    f"SELECT namespace, key, size, priority FROM entries "
+                    f"ORDER BY {order_by} LIMIT ?",
+                    (batch,),
+                ).fetchall()
+            if not victims:
+                break
+
+            keys = []
+            clock = None
+            for namespace, key, size, priority in victims:
+                if total <= target:
+                    break
+                keys.append((namespace, key))
+                total -= size
+                clock = priority
 
-        for f in files:
-            if total <= self.max_size_bytes * 0.8:  # evict to 80% of max
+            self._delete_entries(keys)
+            evicted += len(keys)
+            if not keys:
                 break
-            size = f.stat().st_size
-            f.unlink(missing_ok=True)
-            total -= size
-            logger.debug(f"CACHE_EVICT file={f.name}")
+
+            # GDSF: inflate the clock to the priority of the last victim
+            if self.policy == "gdsf" and clock is not None:
+                with self._lock, self._db:
+                    self._db.execute(
+                        "UPDATE totals SET gdsf_clock = MAX(gdsf_clock, ?) WHERE id = 0", (clock,)
+                    )
+
+        if total <= target:
+            self._evicting = False
+
+        if evicted:
+            logger.info(
+                f"CACHE_EVICT policy={self.policy} count={evicted} "
+                f"size_mb={round(total / 1024 ** 2, 2)}"
+            )
+        return evicted
+
+    def purge_legacy(self, budget: int) -> int:
+        """
+        Delete up to `budget` files from older layouts: flat <key>.mp3 files in
+        cache_dir and v<M>/ trees for M != CACHE_KEY_VERSION. They are not in
+        the index, so nothing else would ever reclaim them.
+        """
+        if self._legacy_clean or budget <= 0:
+            return 0
+
+        removed = 0
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if removed >= budget:
+                    return removed
+                if entry.is_file() and entry.name.endswith(".mp3"):
+                    Path(entry.path).unlink(missing_ok=True)
+                    removed += 1
+                elif entry.is_dir() and _LAYOUT_RE.match(entry.name) and entry.name != _LAYOUT_DIR:
+                    for root, _, files in os.walk(entry.path, topdown=False):
+                        for name in files:
+                            if removed >= budget:
+                                return removed
+                            Path(root, name).unlink(missing_ok=True)
+                            removed += 1
+                        try:
+                            os.rmdir(root)
+                        except OSError:
+                            pass
+
+        self._legacy_clean = True
+        if removed:
+            logger.info(f"CACHE_LEGACY_PURGED count={removed}")
+        return removed
+
+    def run_maintenance(self, budget: int, memory_hits: dict[tuple, list] | None = None) -> dict:
+        """
+        One incremental maintenance pass (blocking — run off the event loop).
+        Writes `memory_hits` (a snapshot taken by arun_maintenance) first, then
+        TTL expiry, size-based eviction and old-layout cleanup, each with
+        whatever budget is left.
+        """
+        try:
+            self._flush_memory_hits(memory_hits)
+            expired = self.expire(budget)
+            evicted = self.evict(budget - expired)
+            purged = self.purge_legacy(budget - expired - evicted)
+        except sqlite3.Error as e:
+            logger.warning(f"CACHE_INDEX_ERROR op=maintenance error={e}")
+            return {"expired": 0, "evicted": 0, "purged": 0}
+        return {"expired": expired, "evicted": evicted, "purged": purged}
 
     def stats(self) -> dict:
         """Return cache stats"""
-        files = list(self.cache_dir.glob("*.mp3"))
-        total_bytes = sum(f.stat().st_size for f in files)
+        files, total_bytes = self._totals()
+        lookups = sum(self._hits.values())
         return {
-            "files": len(files),
+            "files": files,
             "size_mb": round(total_bytes / 1024 ** 2, 2),
             "max_size_gb": settings.cache_max_size_gb,
+            "eviction_policy": self.policy,
+            "memory": self._memory.stats() if self._memory else None,
+            "lookups": dict(self._hits),
+            "hit_ratio": {
+                tier: round(count / lookups, 3) if lookups else 0.0
+                for tier, count in self._hits.items()
+            },
         }
 
 
@@ -98,5 +605,10 @@ def get_cache() -> TTSCache:
             settings.cache_dir,
             settings.cache_max_size_gb,
             settings.cache_ttl_days,
+            policy=settings.cache_eviction_policy,
+            high_watermark=settings.cache_high_watermark,
+            low_watermark=settings.cache_low_watermark,
+            io_workers=settings.cache_io_workers,
+            memory_mb=settings.cache_memory_mb,
         )
     return _cache
@@ -0,0 +1,143 @@
+"""
+eidosSpeech v2 — Cache Key Derivation
+Single source of truth for cache keys. Every key is the SHA256 of a canonical
+JSON payload stamped with CACHE_KEY_VERSION.
+
+TTS parameters are normalized before hashing so semantically identical requests
+share one cache entry:
+  - text: Unicode NFC, whitespace runs collapsed, trimmed
+  - rate/pitch: parsed numerically ("0%", "+0%", "-0%" → "+0%")
+  - style_degree: dropped when it is the default (1.0) or has no style
+
+CACHE_KEY_VERSION is hashed into every key. Bump it whenever canonicalization
+changes — old entries simply stop matching and age out via TTL/eviction.
+
+Keys live in namespaces (see NAMESPACES). The same hash may exist in several
+namespaces — e.g. a request's audio under "tts" and its word timings under
+"subtitle" — and each namespace gets its own directory tree on disk.
+"""
+
+import hashlib
+import json
+import re
+import unicodedata
+
+CACHE_KEY_VERSION = 2
+
+# Namespace → file suffix of its blobs
+NAMESPACES = {
+    "tts": ".mp3",          # single-request audio
+    "subtitle": ".json",    # word-boundary timings for a tts key
+    "script": ".mp3",       # assembled multi-voice scripts
+    "preview": ".mp3",      # voice preview samples
+}
+
+DEFAULT_STYLE_DEGREE = 1.0
+
+_PROSODY_RE = re.compile(r"^([+-]?)(\d+(?:\.\d+)?)\s*(%|hz)$", re.IGNORECASE)
+_PROSODY_UNITS = {"%": "%", "hz": "Hz"}
+
+
+def normalize_text(text: str) -> str:
+    """NFC-normalize and collapse all whitespace runs to a single space"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def normalize_prosody(value: str) -> str:
+    """
+    Canonical signed form of a rate/pitch/volume string: "+10%", "-5Hz", "+0%".
+    Unparseable values are returned trimmed, so they still hash deterministically.
+    """
+    value = (value or "").strip()
+    match = _PROSODY_RE.match(value)
+    if not match:
+        return value
+
+    sign, number, unit = match.groups()
+    amount = float(number)
+    if sign == "-":
+        amount = -amount
+    amount_str = str(int(amount)) if amount == int(amount) else str(amount)
+    if amount >= 0:
+        amount_str = f"+{amount_str.lstrip('-')}"
+    return f"{amount_str}{_PROSODY_UNITS[unit.lower()]}"
+
+
+def normalize_style(style: str | None, style_degree: float | None) -> tuple[str | None, float | None]:
+    """Drop empty styles, and degrees that are default-valued or meaningless without a style"""
+    style = (style or "").strip() or None
+    if style is None or style_degree is None:
+        return style, None
+    degree = round(float(style_degree), 2)
+    if degree == DEFAULT_STYLE_DEGREE:
+        return style, None
+    return style, degree
+
+
+def canonical_tts_params(
+    text: str,
+    voice: str,
+    rate: str = "+0%",
+    pitch: str = "+0Hz",
+    style: str | None = None,
+    style_degree: float | None = None,
+) -> dict:
+    """
+    Canonical parameter dict for hashing.
+    Note: volume is excluded because edge-tts ignores this parameter.
+    """
+    style, style_degree = normalize_style(style, style_degree)
+    data = {
+        "v": CACHE_KEY_VERSION,
+        "text": normalize_text(text),
+        "voice": voice.strip(),
+        "rate": normalize_prosody(rate),
+        "pitch": normalize_prosody(pitch),
+    }
+    if style:
+        data["style"] = style
+    if style_degree is not None:
+        data["style_degree"] = style_degree
+    return data
+
+
+def derive_key(payload: dict) -> str:
+    """SHA256 hex digest of the canonical JSON encoding of payload"""
+    content = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+def tts_cache_key(
+    text: str,
+    voice: str,
+    rate: str = "+0%",
+    pitch: str = "+0Hz",
+    style: str | None = None,
+    style_degree: float | None = None,
+) -> str:
+    """Cache key for one synthesis — shared by the tts and subtitle namespaces"""
+    return derive_key(canonical_tts_params(text, voice, rate, pitch, style, style_degree))
+
+
+def compute_cache_key(req) -> str:
+    """
+    Cache key for a TTSRequest-like object (text, voice, rate, pitch, style, style_degree).
+    Note: volume is excluded because edge-tts doesn't actually use it.
+    Including it would cause unnecessary cache misses.
+    """
+    return tts_cache_key(
+        text=req.text,
+        voice=req.voice,
+        rate=req.rate,
+        pitch=req.pitch,
+        style=getattr(req, "style", None),
+        style_degree=getattr(req, "style_degree", None),
+    )
+
+
+def script_cache_key(line_keys: list[str], pause_ms: int) -> str:
+    """
+    Cache key for an assembled multi-voice script ("script" namespace):
+    the ordered per-line tts keys plus the inter-line pause.
+    """
+    return derive_key({"v": CACHE_KEY_VERSION, "lines": line_keys, "pause_ms": pause_ms})
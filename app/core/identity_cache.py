@@ -0,0 +1,123 @@
+"""
+eidosSpeech v2 — Resolved Identity Cache
+Keeps the result of the ApiKey / User / email-blacklist lookups done by
+resolve_request_context(), so a repeat caller needs no DB reads to be
+identified.
+
+Two maps, both with a TTL (settings.auth_cache_ttl, 0 = disabled):
+  X-API-Key value → identity   (active key + active user)
+  user_id (JWT)   → identity   (active user + their active key, if any)
+
+Only positive results are cached. Anything that can revoke or change an
+identity invalidates it explicitly — admin ban / disable-key / delete-user,
+regen-key and verify-email — so the TTL is only a backstop for changes made
+outside the API. Blacklist verdicts are not cached here; they are checked on
+every request against the in-memory index (app/core/blacklist_index.py).
+
+Invalidation bumps `generation`; a resolver that started its DB reads under
+an older generation does not store its (possibly stale) result.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_ENTRIES = 50_000    # per map; expired entries are pruned beyond this
+
+
+@dataclass(frozen=True)
+class CachedIdentity:
+    """Identity fields of a RequestContext that come from the DB"""
+    user_id: int
+    email: str
+    is_verified: bool
+    api_key: str | None
+    api_key_id: int | None
+
+
+class IdentityCache:
+    """TTL + explicit-invalidation cache of resolved identities"""
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self.generation = 0
+        self._by_key: dict[str, tuple[CachedIdentity, float]] = {}
+        self._by_user: dict[int, tuple[CachedIdentity, float]] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def _get(self, table: dict, lookup) -> CachedIdentity | None:
+        if not self.ttl:
+            return None
+        item = table.get(lookup)
+        if item is not None:
+            identity, expires_at = item
+            if time.monotonic() < expires_at:
+                self._hits += 1
+                return identity
+            table.pop(lookup, None)
+        self._misses += 1
+        return None
+
+    def _put(self, table: dict, lookup, identity: CachedIdentity, generation: int):
+        if not self.ttl or generation != self.generation:
+            return
+        if len(table) >= MAX_ENTRIES:
+            now = time.monotonic()
+            for stale in [k for k, (_, expires_at) in table.items() if expires_at <= now]:
+                del table[stale]
+            if len(table) >= MAX_ENTRIES:
+                table.clear()
+        table[lookup] = (identity, time.monotonic() + self.ttl)
+
+    def get_by_key(self, api_key: str) -> CachedIdentity | None:
+        return self._get(self._by_key, api_key)
+
+    def get_by_user(self, user_id: int) -> CachedIdentity | None:
+        return self._get(self._by_user, user_id)
+
+    def put_key(self, api_key: str, identity: CachedIdentity, generation: int):
+        self._put(self._by_key, api_key, identity, generation)
+
+    def put_user(self, identity: CachedIdentity, generation: int):
+        self._put(self._by_user, identity.user_id, identity, generation)
+
+    def invalidate_user(self, user_id: int):
+        """Drop every cached identity of one user (JWT entry + all of their keys)"""
+        self.generation += 1
+        self._by_user.pop(user_id, None)
+        for api_key in [k for k, (identity, _) in self._by_key.items() if identity.user_id == user_id]:
+            del self._by_key[api_key]
+        logger.debug(f"IDENTITY_CACHE_INVALIDATE user_id={user_id}")
+
+    def clear(self):
+        """Drop everything"""
+        self.generation += 1
+        self._by_key.clear()
+        self._by_user.clear()
+        logger.debug("IDENTITY_CACHE_CLEAR")
+
+    def stats(self) -> dict:
+        total = self._hits + self._misses
+        return {
+            "enabled": bool(self.ttl),
+            "entries": len(self._by_key) + len(self._by_user),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / total, 3) if total else 0.0,
+        }
+
+
+# Singleton
+_identity_cache: IdentityCache = None
+
+
+def get_identity_cache() -> IdentityCache:
+    global _identity_cache
+    if _identity_cache is None:
+        _identity_cache = IdentityCache(settings.auth_cache_ttl)
+    return _identity_cache
@@ -2,6 +2,8 @@
 eidosSpeech v2 — JWT Handler
 HS256 JWT creation, decoding, JTI-based revocation.
 Contek eidosStack auth pattern: access (15m), refresh (7d), verify, reset token types.
+Revocation checks are served from memory (app/core/token_revocation.py);
+the DB tables are the source of truth that index is loaded from.
 """
 
 import uuid
@@ -11,10 +13,11 @@ from typing import Literal
 
 from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import update
 
 from app.config import settings
 from app.core.exceptions import AuthenticationError
+from app.core.token_revocation import get_revocation_index, to_micros
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +32,9 @@ def create_token(
 ) -> str:
     """
     Create a signed JWT token.
-    Includes: sub (email), user_id, type, jti (uuid4), iat, exp
+    Includes: sub (email), user_id, type, jti (uuid4), iat, iat_us, exp
+    (iat_us = issue time in integer microseconds, compared against the
+    user's tokens_valid_after watermark; iat alone only has whole seconds)
     """
     now = datetime.now(timezone.utc)
 
@@ -45,6 +50,7 @@ def create_token(
         "type": token_type,
         "jti": str(uuid.uuid4()),
         "iat": now,
+        "iat_us": to_micros(now),
         "exp": now + expires_delta,
     }
 
@@ -65,8 +71,9 @@ async def decode_token(
 ) -> dict:
     """
     Decode and validate a JWT token.
-    Checks: signature, expiry, token type match, JTI not revoked.
-    Raises AuthenticationError on any failure.
+    Checks: signature, expiry, token type match, JTI not revoked,
+    not issued before the user's tokens_valid_after watermark.
+    Raises AuthenticationError on any failure. No DB I/O (`db` is unused).
     """
     try:
         payload = jwt.decode(
@@ -82,47 +89,36 @@ async def decode_token(
     if payload.get("type") != expected_type:
         raise AuthenticationError(f"Invalid token type: expected {expected_type}")
 
-    # Check JTI revocation
-    jti = payload.get("jti")
-    if jti and await is_token_revoked(jti, db):
+    # Check JTI revocation + per-user watermark (in-memory)
+    if get_revocation_index().is_revoked(payload):
         raise AuthenticationError("Token has been revoked")
 
     return payload
 
 
-async def is_token_revoked(jti: str, db: AsyncSession) -> bool:
-    """Check if a JTI is in the revocation table"""
-    from app.db.models import TokenRevocation
-    result = await db.execute(
-        select(TokenRevocation).where(TokenRevocation.jti == jti)
-    )
-    return result.scalar_one_or_none() is not None
-
-
 async def revoke_token(jti: str, expires_at: datetime, db: AsyncSession):
     """Add a JTI to the revocation table"""
     from app.db.models import TokenRevocation
     revocation = TokenRevocation(jti=jti, expires_at=expires_at)
     db.add(revocation)
     await db.commit()
+    get_revocation_index().add(jti, expires_at)
     logger.debug(f"TOKEN_REVOKED jti={jti}")
 
 
 async def revoke_all_user_tokens(user_id: int, db: AsyncSession):
     """
-    Revoke all tokens for a user by inserting placeholder JTIs.
-    Used on password reset — invalidates all sessions.
-    In practice: we mark a revocation with a wildcard via user_id timestamp.
-    Simpler approach: update user's token_version (we use created_at as anchor).
-    
-    For eidosSpeech v2: store user_id-based revocation marker.
-    All tokens for this user issued before 'now' are invalid.
+    Invalidate every token issued to a user so far (all sessions).
+    Sets users.tokens_valid_after = now; decode_token rejects tokens issued
+    strictly before it, so a login right after a reset keeps working.
+    Used on password reset and admin ban.
+    Commits — call after the caller's own changes are committed.
     """
-    # Simple approach: trust token expiry + new login creates new JTI
-    # We already revoke the specific token in reset-password flow
-    # For belt-and-suspenders, insert a marker we check during decode
-    # Since we store JTI of issued tokens, this is handled by rotating tokens
+    from app.db.models import User
+    now = datetime.now(timezone.utc)
+    await db.execute(
+        update(User).where(User.id == user_id).values(tokens_valid_after=now)
+    )
+    await db.commit()
+    get_revocation_index().set_watermark(user_id, now)
     logger.info(f"REVOKE_ALL_USER_TOKENS user_id={user_id}")
-    # Note: In production, add a user.token_revoked_before column
-    # For v2 MVP: password reset flow already revokes the reset token JTI
-    # and user must re-login (getting new JTI), so old sessions will 401 on refresh
@@ -3,12 +3,22 @@ eidosSpeech v2 — Hybrid Rate Limiter
 Per-minute: in-memory sliding window (deque of timestamps)
 Per-day: SQLite daily_usage table
 Concurrent: asyncio.Semaphore(1) per identity — reject (not queue)
+
+Daily counters are write-behind when settings.usage_flush_interval > 0:
+each identity's counter lives in memory (seeded from daily_usage on first
+touch each day), requests are checked and counted without touching the DB,
+and the increments are written every usage_flush_interval seconds (and on
+shutdown) as one batched UPSERT per identity kind. A crash loses at most one
+interval of counts. Counters are per process — with several workers each
+enforces the daily limit on its own view, so set 0 there (synchronous
+per-request write) when the limit must be exact across workers.
 """
 
 import asyncio
 import logging
 import time
 from collections import deque
+from dataclasses import dataclass, field
 from datetime import date, datetime, timezone, timedelta
 from typing import Optional
 
@@ -16,11 +26,22 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, text
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
+from app.config import settings
 from app.core.auth import RequestContext
 from app.core.exceptions import RateLimitError
 
 logger = logging.getLogger(__name__)
 
+# Per-type breakdown columns of daily_usage, by request_type
+REQUEST_TYPE_COLUMNS = {
+    "webui_tts": "webui_tts_count",
+    "api_tts": "api_tts_count",
+    "webui_multivoice": "webui_multivoice_count",
+    "api_multivoice": "api_multivoice_count",
+}
+COUNTER_COLUMNS = ("request_count", "chars_used", *REQUEST_TYPE_COLUMNS.values())
+FLUSH_CHUNK_ROWS = 500      # rows per UPSERT statement (SQLite bound-parameter limit)
+
 
 def seconds_until_midnight_utc() -> int:
     """Seconds until next UTC midnight (daily rate limit reset)"""
@@ -29,6 +50,29 @@ def seconds_until_midnight_utc() -> int:
     return int((midnight - now).total_seconds())
 
 
+@dataclass
+class DailyCounter:
+    """In-memory daily usage of one identity (write-behind mode)"""
+    api_key_id: int | None
+    ip_address: str | None
+    date: date
+    request_count: int = 0      # DB value at seeding + everything consumed since
+    chars_used: int = 0
+    pending: dict = field(default_factory=dict)     # column → increment not yet flushed
+
+    def consume(self, cost: int, chars: int, request_type: str):
+        self.request_count += cost
+        self.chars_used += chars
+        increments = {"request_count": cost, "chars_used": chars}
+        if request_type in REQUEST_TYPE_COLUMNS:
+            increments[REQUEST_TYPE_COLUMNS[request_type]] = cost
+        self.add_pending(increments)
+
+    def add_pending(self, increments: dict):
+        for column, amount in increments.items():
+            self.pending[column] = self.pending.get(column, 0) + amount
+
+
 class RateLimiter:
     """
     Hybrid rate limiter:
@@ -50,6 +94,9 @@ class RateLimiter:
         self._global_heavy_semaphore = asyncio.Semaphore(max_heavy)
         # Lock for dict manipulation
         self._lock = asyncio.Lock()
+        # Per-day (write-behind mode): (identity, date) → counter
+        self._daily: dict[tuple[str, date], DailyCounter] = {}
+        self._flush_lock = asyncio.Lock()
         
         logger.info(f"RATE_LIMITER_INIT max_heavy_operations={max_heavy}")
 
@@ -65,13 +112,17 @@ class RateLimiter:
         db: AsyncSession,
         text_len: int,
         request_type: str = "webui_tts",  # webui_tts, api_tts, webui_multivoice, api_multivoice
+        cost: int = 1,
+        chars: Optional[int] = None,
     ) -> "DailyUsageRow":
         """
         Check all rate limits and consume quota.
         Raises RateLimitError if any limit exceeded.
         On success: increments counters and returns usage row.
+
+        Batch requests pass cost=N (N daily requests, one per-minute slot)
+        with text_len = longest item and chars = total characters.
         """
-        from app.db.models import DailyUsage
         identity = self._get_identity(ctx)
 
         # ── 1. Character limit ────────────────────────────────
@@ -106,60 +157,46 @@ class RateLimiter:
                 detail={"limit": ctx.req_per_min, "tier": ctx.tier, "window": "1min"}
             )
 
-        # ── 3. Per-day limit (SQLite) ─────────────────────────
+        # ── 3. Per-day limit (in-memory counter or SQLite) ────
         today = date.today()  # UTC date
-        usage = await self._get_or_create_usage(db, ctx, today)
-
-        if usage.request_count >= ctx.req_per_day:
-            retry_after = seconds_until_midnight_utc()
-            logger.warning(f"RATE_LIMIT_DAY tier={ctx.tier} identity={identity}")
-            raise RateLimitError(
-                f"Daily limit reached ({ctx.req_per_day} requests/day for {ctx.tier} tier). "
-                "Resets at UTC midnight.",
-                retry_after=retry_after,
-                detail={
-                    "limit": ctx.req_per_day,
-                    "used": usage.request_count,
-                    "tier": ctx.tier,
-                    "reset_at": "UTC midnight"
-                }
-            )
+        chars = text_len if chars is None else chars
+        if settings.usage_flush_interval > 0:
+            usage = await self._get_counter(db, ctx, identity, today)
+            if usage.request_count + cost > ctx.req_per_day:
+                self._raise_daily_limit(ctx, identity, usage.request_count, cost)
+            # No await between check and increment — exact within this process
+            usage.consume(cost, chars, request_type)
+        else:
+            # Check + increment in one statement — exact under concurrency
+            usage = await self._consume_usage(db, ctx, today, cost, chars, request_type)
+            if usage is None:
+                used, _ = await self._usage_today(db, ctx, today)
+                self._raise_daily_limit(ctx, identity, used, cost)
 
-        # All checks passed — consume quota
+        # All checks passed — count this request in the minute window
         window.append(now)
-        usage.request_count += 1
-        usage.chars_used += text_len
-        
-        # Track request type for detailed analytics
-        if request_type == "webui_tts":
-            usage.webui_tts_count += 1
-        elif request_type == "api_tts":
-            usage.api_tts_count += 1
-        elif request_type == "webui_multivoice":
-            usage.webui_multivoice_count += 1
-        elif request_type == "api_multivoice":
-            usage.api_multivoice_count += 1
-        
-        await db.commit()
-
         return usage
 
-    async def _get_or_create_usage(
-        self,
-        db: AsyncSession,
-        ctx: RequestContext,
-        today: date,
-    ):
-        """
-        Get or create daily usage row — SQLite-safe upsert pattern.
-
-        Problem with naive SELECT → INSERT:
-          Two concurrent requests (async tasks) could both see no row,
-          then both try INSERT → IntegrityError or duplicate row.
+    @staticmethod
+    def _raise_daily_limit(ctx: RequestContext, identity: str, used: int, cost: int):
+        retry_after = seconds_until_midnight_utc()
+        logger.warning(f"RATE_LIMIT_DAY tier={ctx.tier} identity={identity}")
+        raise RateLimitError(
+            f"Daily limit reached ({ctx.req_per_day} requests/day for {ctx.tier} tier). "
+            "Resets at UTC midnight.",
+            retry_after=retry_after,
+            detail={
+                "limit": ctx.req_per_day,
+                "used": used,
+                "requested": cost,
+                "tier": ctx.tier,
+                "reset_at": "UTC midnight"
+            }
+        )
 
-        Solution: INSERT OR IGNORE (SQLite dialect) + re-SELECT.
-        This is atomic at the SQLite level — no race possible.
-        """
+    @staticmethod
+    def _usage_filter(ctx: RequestContext, today: date) -> tuple[tuple, dict]:
+        """WHERE clause + INSERT values of the daily_usage row for this identity"""
         from app.db.models import DailyUsage
 
         if ctx.tier == "registered" and ctx.api_key_id:
@@ -187,26 +224,167 @@ class RateLimiter:
                 request_count=0,
                 chars_used=0,
             )
+        return where_clause, insert_values
 
-        # INSERT OR IGNORE: atomic, no duplicate rows, no race condition
-        stmt = sqlite_insert(DailyUsage).values(**insert_values).prefix_with("OR IGNORE")
-        await db.execute(stmt)
-        # No commit here — we're in the same transaction; flush ensures row exists
-        await db.flush()
+    @staticmethod
+    def _conflict_target(registered: bool) -> dict:
+        """ON CONFLICT target: the unique partial index for registered / anonymous rows"""
+        from app.db.models import DailyUsage
+
+        if registered:
+            return dict(index_elements=["api_key_id", "date"], index_where=DailyUsage.api_key_id != None)
+        return dict(index_elements=["ip_address", "date"], index_where=DailyUsage.api_key_id == None)
+
+    async def _usage_today(self, db: AsyncSession, ctx: RequestContext, today: date) -> tuple[int, int]:
+        """(request_count, chars_used) of this identity's daily_usage row (0, 0 if none)"""
+        from app.db.models import DailyUsage
 
-        # Now SELECT the definitive row (always exists after above)
-        # Use scalars().first() to handle potential duplicates gracefully
+        where_clause, _ = self._usage_filter(ctx, today)
         result = await db.execute(
-            select(DailyUsage).where(*where_clause)
+            select(
+                func.coalesce(func.sum(DailyUsage.request_count), 0),
+                func.coalesce(func.sum(DailyUsage.chars_used), 0),
+            ).where(*where_clause)
         )
-        usage = result.scalars().first()
-        
-        if not usage:
-            # Fallback: create if somehow missing
-            usage = DailyUsage(**insert_values)
-            db.add(usage)
-            await db.flush()
-        
+        return tuple(result.one())
+
+    async def _get_counter(
+        self,
+        db: AsyncSession,
+        ctx: RequestContext,
+        identity: str,
+        today: date,
+    ) -> DailyCounter:
+        """In-memory counter for (identity, today), seeded from daily_usage on first touch"""
+
+        counter = self._daily.get((identity, today))
+        if counter is not None:
+            return counter
+
+        _, insert_values = self._usage_filter(ctx, today)
+        request_count, chars_used = await self._usage_today(db, ctx, today)
+        # A concurrent first touch may have seeded it meanwhile — keep that one
+        return self._daily.setdefault((identity, today), DailyCounter(
+            api_key_id=insert_values["api_key_id"],
+            ip_address=insert_values["ip_address"],
+            date=today,
+            request_count=request_count,
+            chars_used=chars_used,
+        ))
+
+    async def flush_usage(self):
+        """
+        Write pending daily increments to daily_usage (write-behind mode).
+        One multi-row UPSERT per identity kind; on failure the increments are
+        kept and retried on the next flush.
+        """
+        from app.db.database import AsyncSessionLocal
+
+        async with self._flush_lock:
+            batch = [(c, c.pending) for c in self._daily.values() if c.pending]
+            if not batch:
+                return
+            for counter, _ in batch:
+                counter.pending = {}
+
+            rows = [
+                {
+                    "api_key_id": counter.api_key_id,
+                    "ip_address": counter.ip_address,
+                    "date": counter.date,
+                    **{column: pending.get(column, 0) for column in COUNTER_COLUMNS},
+                }
+                for counter, pending in batch
+            ]
+            try:
+                async with AsyncSessionLocal() as db:
+                    for stmt in self._upsert_statements(rows):
+                        await db.execute(stmt)
+                    await db.commit()
+            except Exception as e:
+                for counter, pending in batch:
+                    counter.add_pending(pending)
+                logger.error(f"USAGE_FLUSH_ERROR rows={len(rows)} error={e}")
+                return
+
+            # Past days are final once flushed
+            today = date.today()
+            for key in [k for k, c in self._daily.items() if c.date < today and not c.pending]:
+                del self._daily[key]
+            logger.debug(f"USAGE_FLUSH rows={len(rows)}")
+
+    @staticmethod
+    def _upsert_statements(rows: list[dict]) -> list:
+        """INSERT ... ON CONFLICT DO UPDATE adding the increments, per unique partial index"""
+        from app.db.models import DailyUsage
+
+        statements = []
+        for registered in (True, False):
+            kind_rows = [r for r in rows if (r["api_key_id"] is not None) == registered]
+            for start in range(0, len(kind_rows), FLUSH_CHUNK_ROWS):
+                stmt = sqlite_insert(DailyUsage).values(kind_rows[start:start + FLUSH_CHUNK_ROWS])
+                statements.append(stmt.on_conflict_do_update(
+                    **RateLimiter._conflict_target(registered),
+                    set_={c: getattr(DailyUsage, c) + stmt.excluded[c] for c in COUNTER_COLUMNS},
+                ))
+        return statements
+
+    def discard_usage(self, api_key_ids: list[int]):
+        """Forget counters of deleted API keys (their rows are gone; a flush would violate the FK)"""
+        ids = set(api_key_ids)
+        for key in [k for k, c in self._daily.items() if c.api_key_id in ids]:
+            del self._daily[key]
+
+    def usage_stats(self) -> dict:
+        return {
+            "write_behind": settings.usage_flush_interval > 0,
+            "counters": len(self._daily),
+            "pending": sum(1 for c in self._daily.values() if c.pending),
+        }
+
+    async def _consume_usage(
+        self,
+        db: AsyncSession,
+        ctx: RequestContext,
+        today: date,
+        cost: int,
+        chars: int,
+        request_type: str,
+    ):
+        """
+        Check and consume daily quota in ONE statement (synchronous mode):
+
+          INSERT INTO daily_usage (...) VALUES (..., :cost, ...)
+          ON CONFLICT (<identity>, date) WHERE <partial index predicate>
+          DO UPDATE SET request_count = request_count + excluded.request_count, ...
+          WHERE daily_usage.request_count + :cost <= :limit
+          RETURNING request_count, chars_used
+
+        SQLite applies it under its write lock, so two concurrent requests can
+        never both pass on the last remaining slot. Returns the updated row
+        (request_count, chars_used), or None if the limit would be exceeded.
+        """
+        from app.db.models import DailyUsage
+
+        if cost > ctx.req_per_day:
+            return None     # a fresh row would be inserted over the limit
+
+        _, insert_values = self._usage_filter(ctx, today)
+        increments = {column: 0 for column in COUNTER_COLUMNS}
+        increments.update(request_count=cost, chars_used=chars)
+        if request_type in REQUEST_TYPE_COLUMNS:
+            increments[REQUEST_TYPE_COLUMNS[request_type]] = cost
+
+        stmt = sqlite_insert(DailyUsage).values(**{**insert_values, **increments})
+        stmt = stmt.on_conflict_do_update(
+            **self._conflict_target(insert_values["api_key_id"] is not None),
+            set_={c: getattr(DailyUsage, c) + stmt.excluded[c] for c in COUNTER_COLUMNS},
+            where=DailyUsage.request_count + cost <= ctx.req_per_day,
+        ).returning(DailyUsage.request_count, DailyUsage.chars_used)
+
+        result = await db.execute(stmt)
+        usage = result.one_or_none()
+        await db.commit()
         return usage
 
     def get_headers(self, ctx: RequestContext, usage) -> dict:
@@ -279,6 +457,27 @@ class _ConcurrentGuard:
             self._sem.release()
 
 
+class HeldSlots:
+    """
+    Guards (acquire_concurrent / acquire_heavy_operation) entered by hand for a
+    streamed response, which holds them beyond the endpoint's return.
+    release() is idempotent: call it from the body generator's finally AND pass
+    it as the StreamingResponse background task, so the slots are freed even if
+    the body is never iterated (client gone before the first chunk).
+    """
+
+    def __init__(self):
+        self._guards = []
+
+    async def enter(self, guard):
+        await guard.__aenter__()
+        self._guards.append(guard)
+
+    async def release(self):
+        while self._guards:
+            await self._guards.pop().__aexit__(None, None, None)
+
+
 # Singleton instance
 _rate_limiter: RateLimiter = None
 
@@ -0,0 +1,104 @@
+"""
+eidosSpeech v2 — In-flight Request Coalescing (single-flight)
+Identical concurrent TTS requests share one upstream synthesis.
+
+The first caller for a cache key becomes the leader and runs the work;
+callers arriving while it is in flight become followers and await the
+leader's result instead of opening their own edge-tts websocket.
+Quota is charged per request before this layer, so followers pay as usual.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into a single execution.
+
+    The work runs in its own task and callers await it through asyncio.shield,
+    so a leader whose client disconnects does not cancel the followers.
+    """
+
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._leaders = 0
+        self._coalesced = 0
+
+    def join(self, key: str) -> asyncio.Future | None:
+        """
+        Follower-only entry point: return the task already in flight for this key,
+        or None if nothing is running (caller does the work itself).
+        Await it through asyncio.shield so a disconnecting follower cannot cancel it.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            return None
+        self._coalesced += 1
+        logger.debug(f"SINGLEFLIGHT_JOIN key={key[:8]}...")
+        return task
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """
+        Run fn() once per key at a time.
+        Returns (result, shared) — shared is True for followers.
+        Exceptions from the leader propagate to every waiter.
+        """
+        pending = self.join(key)
+        if pending is not None:
+            return await asyncio.shield(pending), True
+
+        self._leaders += 1
+        task = asyncio.ensure_future(fn())
+        self._inflight[key] = task
+        task.add_done_callback(lambda t, k=key: self._on_done(k, t))
+
+        return await asyncio.shield(task), False
+
+    def lead(self, key: str) -> asyncio.Future | None:
+        """
+        Leader entry point for work the caller runs itself (a stream teeing its
+        audio): register a future under the key so later callers join it.
+        Returns None if the key is already in flight. The caller MUST resolve
+        the future (set_result / set_exception) on every path.
+        """
+        if key in self._inflight:
+            return None
+        self._leaders += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        future.add_done_callback(lambda f, k=key: self._on_done(k, f))
+        return future
+
+    def _on_done(self, key: str, task: asyncio.Future):
+        """Forget the finished task; retrieve its exception so it is never 'unretrieved'"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        """Return coalescing counters for health endpoint"""
+        total = self._leaders + self._coalesced
+        return {
+            "in_flight": len(self._inflight),
+            "leaders": self._leaders,
+            "coalesced": self._coalesced,
+            "coalesced_pct": round((self._coalesced / total) * 100, 1) if total else 0.0,
+        }
+
+
+# Singleton
+_tts_flight: SingleFlight = None
+
+
+def get_tts_flight() -> SingleFlight:
+    global _tts_flight
+    if _tts_flight is None:
+        _tts_flight = SingleFlight()
+    return _tts_flight
@@ -0,0 +1,173 @@
+"""
+eidosSpeech v2 — In-memory JWT Revocation Index
+Lets decode_token() reject revoked tokens without a DB query.
+
+Two kinds of revocation, both mirrored from the DB:
+  JTIs       — token_revocations rows (logout, refresh rotation), held in a
+               dict jti → expiry behind a Bloom filter. Almost every token is
+               valid, and for those the Bloom filter answers "not revoked" after
+               a few bit tests; only (rare) positives consult the dict.
+  watermarks — users.tokens_valid_after (revoke_all_user_tokens): every token
+               of that user issued before the watermark is invalid. Compared
+               in microseconds (the iat_us claim), so tokens minted in the
+               same second but after the revocation stay valid.
+
+revoke_token / revoke_all_user_tokens update the index right after their DB
+commit, so this process sees its own revocations immediately. The index is
+loaded at startup and re-synced every settings.token_revocation_sync_interval
+seconds (revocations made by other workers); periodic_cleanup drops expired JTIs.
+A Bloom filter cannot delete, so it is rebuilt on every sync / expiry pass.
+"""
+
+import hashlib
+import logging
+import math
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+BLOOM_ERROR_RATE = 0.01         # false-positive rate at capacity
+BLOOM_MIN_CAPACITY = 1024
+
+
+def to_epoch(value: datetime) -> float:
+    """DB datetimes are naive UTC (SQLite) — treat them as such"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def to_micros(value: datetime) -> int:
+    """Epoch microseconds — exact, unlike a float epoch at this magnitude"""
+    return round(to_epoch(value) * 1_000_000)
+
+
+def issued_micros(payload: dict) -> int:
+    """Token issue time: iat_us, or whole-second iat for tokens minted without it"""
+    if "iat_us" in payload:
+        return payload["iat_us"]
+    return payload.get("iat", 0) * 1_000_000
+
+
+class BloomFilter:
+    """Fixed-capacity Bloom filter over strings (double hashing on blake2b)"""
+
+    def __init__(self, capacity: int, error_rate: float = BLOOM_ERROR_RATE):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class RevocationIndex:
+    """Revoked JTIs (Bloom filter + dict) and per-user token watermarks"""
+
+    def __init__(self):
+        self._revoked: dict[str, float] = {}           # jti → expires_at (epoch)
+        self._valid_after: dict[int, int] = {}         # user_id → watermark (epoch µs)
+        self._bloom = BloomFilter(BLOOM_MIN_CAPACITY)
+        self._bloom_checks = 0
+        self._bloom_positives = 0
+        self.loaded = False
+
+    def _rebuild_bloom(self):
+        bloom = BloomFilter(max(BLOOM_MIN_CAPACITY, 2 * len(self._revoked)))
+        for jti in self._revoked:
+            bloom.add(jti)
+        self._bloom = bloom
+
+    async def load(self, db: AsyncSession):
+        """(Re)load every unexpired revocation and every watermark from the DB"""
+        from app.db.models import TokenRevocation, User
+
+        now = datetime.now(timezone.utc)
+        result = await db.execute(
+            select(TokenRevocation.jti, TokenRevocation.expires_at)
+            .where(TokenRevocation.expires_at >= now)
+        )
+        revoked = {jti: to_epoch(expires_at) for jti, expires_at in result.all()}
+        result = await db.execute(
+            select(User.id, User.tokens_valid_after).where(User.tokens_valid_after != None)
+        )
+        valid_after = {user_id: to_micros(ts) for user_id, ts in result.all()}
+
+        # Keep local additions that raced the query (committed after it started)
+        for jti, expires_at in self._revoked.items():
+            revoked.setdefault(jti, expires_at)
+        for user_id, ts in self._valid_after.items():
+            valid_after[user_id] = max(ts, valid_after.get(user_id, 0))
+
+        self._revoked = revoked
+        self._valid_after = valid_after
+        self._rebuild_bloom()
+        self.loaded = True
+        logger.debug(f"TOKEN_REVOCATION_SYNC jtis={len(revoked)} watermarks={len(valid_after)}")
+
+    def add(self, jti: str, expires_at: datetime):
+        self._revoked[jti] = to_epoch(expires_at)
+        if len(self._revoked) > self._bloom.capacity:
+            self._rebuild_bloom()
+        else:
+            self._bloom.add(jti)
+
+    def set_watermark(self, user_id: int, valid_after: datetime):
+        self._valid_after[user_id] = to_micros(valid_after)
+
+    def expire(self):
+        """Drop JTIs whose token has expired anyway (jose rejects those on exp)"""
+        now = time.time()
+        before = len(self._revoked)
+        self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp >= now}
+        if len(self._revoked) != before:
+            self._rebuild_bloom()
+
+    def is_revoked(self, payload: dict) -> bool:
+        """True if the token's JTI is revoked or it predates its user's watermark"""
+        jti = payload.get("jti")
+        if jti:
+            self._bloom_checks += 1
+            if jti in self._bloom:
+                self._bloom_positives += 1
+                if jti in self._revoked:
+                    return True
+
+        watermark = self._valid_after.get(payload.get("user_id"))
+        return watermark is not None and issued_micros(payload) < watermark
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "revoked_jtis": len(self._revoked),
+            "user_watermarks": len(self._valid_after),
+            "bloom_bits": self._bloom.size,
+            "bloom_checks": self._bloom_checks,
+            "bloom_positives": self._bloom_positives,
+        }
+
+
+# Singleton — loaded from the DB in main.py
+_revocation_index: RevocationIndex = None
+
+
+def get_revocation_index() -> RevocationIndex:
+    global _revocation_index
+    if _revocation_index is None:
+        _revocation_index = RevocationIndex()
+    return _revocation_index
@@ -1,12 +1,13 @@
 """
 eidosSpeech v2 — SQLAlchemy ORM Models
-8 tables: users, api_keys, daily_usage, token_revocations, registration_attempts, blacklist, login_attempts, audit_logs
+10 tables: users, api_keys, daily_usage, token_revocations, registration_attempts, blacklist,
+login_attempts, audit_logs, page_views, jobs
 """
 
 import uuid
 from sqlalchemy import (
-    Column, Integer, String, Boolean, DateTime, Date,
-    ForeignKey, func, UniqueConstraint, Index
+    Column, Integer, String, Text, Boolean, DateTime, Date,
+    ForeignKey, func, text, UniqueConstraint, Index
 )
 from sqlalchemy.orm import DeclarativeBase, relationship
 
@@ -34,6 +35,7 @@ class User(Base):
     reset_token_expires  = Column(DateTime)                                  # created_at + 1h
 
     last_login_at        = Column(DateTime)
+    tokens_valid_after   = Column(DateTime)                                  # JWTs issued before this are revoked
     created_at           = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at           = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -88,6 +90,11 @@ class DailyUsage(Base):
         Index("idx_daily_usage_key_date", "api_key_id", "date"),
         Index("idx_daily_usage_ip_date", "ip_address", "date"),
         Index("idx_daily_usage_date", "date"),  # Standalone date index for admin queries
+        # One row per identity per day — conflict targets of the usage UPSERTs
+        Index("uq_daily_usage_key_date", "api_key_id", "date", unique=True,
+              sqlite_where=text("api_key_id IS NOT NULL")),
+        Index("uq_daily_usage_ip_date", "ip_address", "date", unique=True,
+              sqlite_where=text("api_key_id IS NULL")),
     )
 
 
@@ -182,3 +189,27 @@ class PageView(Base):
         Index("idx_page_views_ip_date", "ip_address", "date"),
         Index("idx_page_views_country_date", "country", "date"),
     )
+
+
+class Job(Base):
+    """Background synthesis jobs (scripts, long texts) — result is stored in the audio cache"""
+    __tablename__ = "jobs"
+
+    id             = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    type           = Column(String(10), nullable=False)                  # 'script' or 'tts'
+    status         = Column(String(10), nullable=False, default="queued")  # queued | running | done | failed
+    user_id        = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    params         = Column(Text, nullable=False)                         # JSON request body
+    cache_key      = Column(String(64), nullable=False)                   # result location in TTSCache
+    namespace      = Column(String(16), nullable=False)                   # cache namespace ('script' / 'tts')
+    progress_done  = Column(Integer, default=0, nullable=False)           # lines / chunks finished
+    progress_total = Column(Integer, default=0, nullable=False)
+    error          = Column(String(500))
+    created_at     = Column(DateTime, server_default=func.now(), nullable=False)
+    started_at     = Column(DateTime)
+    finished_at    = Column(DateTime)
+
+    __table_args__ = (
+        Index("idx_jobs_status_created", "status", "created_at"),
+        Index("idx_jobs_user_status", "user_id", "status"),
+    )
@@ -86,19 +86,34 @@ async def periodic_cleanup():
                 r5 = await db.execute(
                     delete(AuditLog).where(AuditLog.timestamp < cutoff_90d)
                 )
+                # 6. Finished background jobs past retention
+                from app.db.models import Job
+                cutoff_jobs = now - timedelta(days=settings.job_retention_days)
+                r6 = await db.execute(
+                    delete(Job).where(
+                        Job.status.in_(("done", "failed")),
+                        Job.finished_at < cutoff_jobs,
+                    )
+                )
 
                 await db.commit()
 
-                deleted = r1.rowcount + r2.rowcount + r3.rowcount + r4.rowcount + r5.rowcount
+                deleted = (
+                    r1.rowcount + r2.rowcount + r3.rowcount
+                    + r4.rowcount + r5.rowcount + r6.rowcount
+                )
                 if deleted > 0:
                     logger.info(
                         f"CLEANUP_COMPLETE revocations={r1.rowcount} "
                         f"reg_attempts={r2.rowcount} unverified_users={r3.rowcount} "
-                        f"login_attempts={r4.rowcount} audit_logs={r5.rowcount}"
+                        f"login_attempts={r4.rowcount} audit_logs={r5.rowcount} "
+                        f"jobs={r6.rowcount}"
                     )
 
             # Non-DB cleanup (no lock needed)
             get_proxy_manager().reset_all()
+            from app.core.token_revocation import get_revocation_index
+            get_revocation_index().expire()
             from app.core.rate_limiter import get_rate_limiter
             get_rate_limiter().cleanup_stale_entries()
 
@@ -108,6 +123,101 @@ async def periodic_cleanup():
         await asyncio.sleep(3600)  # Run every hour
 
 
+# ── Cache Eviction Worker ──────────────────────────────────────────────────────
+async def periodic_cache_eviction():
+    """Run every cache_eviction_interval seconds — TTL expiry + size-based eviction.
+
+    Keeps filesystem deletes out of the request path. Each run deletes at most
+    cache_eviction_budget files, so a large backlog is worked off incrementally.
+    The pass itself is blocking (sqlite3 + unlink) and runs on the cache I/O pool.
+    """
+    from app.core.cache import get_cache
+    cache = get_cache()
+    while True:
+        await asyncio.sleep(settings.cache_eviction_interval)
+        try:
+            result = await cache.arun_maintenance(settings.cache_eviction_budget)
+            if any(result.values()):
+                logger.info(
+                    f"CACHE_MAINTENANCE expired={result['expired']} evicted={result['evicted']} "
+                    f"purged={result['purged']}"
+                )
+        except Exception as e:
+            logger.error(f"CACHE_MAINTENANCE_ERROR error={e}")
+
+
+# ── Proxy Health Prober ────────────────────────────────────────────────────────
+async def periodic_proxy_probe():
+    """Run every proxy_probe_interval seconds — tiny synthesis through every route.
+
+    Dead proxies are disabled before user requests pay retry sleeps on them,
+    and disabled ones are re-admitted as soon as a probe passes.
+    """
+    from app.services.tts_engine import get_tts_engine
+    while True:
+        await asyncio.sleep(settings.proxy_probe_interval)
+        try:
+            engine = get_tts_engine()
+            routes = engine.proxy_manager.routes()
+            results = await asyncio.gather(*(engine.probe(route) for route in routes))
+            if not all(results):
+                logger.info(f"PROXY_PROBE routes={len(routes)} failed={results.count(False)}")
+        except Exception as e:
+            logger.error(f"PROXY_PROBE_ERROR error={e}")
+
+
+# ── Usage Counter Flush ────────────────────────────────────────────────────────
+async def periodic_usage_flush():
+    """Run every usage_flush_interval seconds — write buffered daily usage increments.
+
+    The interval is the durability window: a crash loses at most this much
+    counting. One batched UPSERT per run instead of a write per request.
+    """
+    from app.core.rate_limiter import get_rate_limiter
+    while True:
+        await asyncio.sleep(settings.usage_flush_interval)
+        try:
+            await get_rate_limiter().flush_usage()
+        except Exception as e:
+            logger.error(f"USAGE_FLUSH_ERROR error={e}")
+
+
+# ── Blacklist Refresh ──────────────────────────────────────────────────────────
+async def periodic_blacklist_refresh():
+    """Run every blacklist_refresh_interval seconds — reload the in-memory blacklist.
+
+    POST /admin/blacklist reloads immediately; this picks up rows written
+    elsewhere (other workers, manual DB edits).
+    """
+    from app.core.blacklist_index import get_blacklist_index
+    from app.db.database import AsyncSessionLocal
+    while True:
+        await asyncio.sleep(settings.blacklist_refresh_interval)
+        try:
+            async with AsyncSessionLocal() as db:
+                await get_blacklist_index().load(db)
+        except Exception as e:
+            logger.error(f"BLACKLIST_REFRESH_ERROR error={e}")
+
+
+# ── JWT Revocation Sync ────────────────────────────────────────────────────────
+async def periodic_revocation_sync():
+    """Run every token_revocation_sync_interval seconds — reload revoked JTIs + watermarks.
+
+    Revocations made in this process are applied immediately; this picks up
+    the ones written by other workers.
+    """
+    from app.core.token_revocation import get_revocation_index
+    from app.db.database import AsyncSessionLocal
+    while True:
+        await asyncio.sleep(settings.token_revocation_sync_interval)
+        try:
+            async with AsyncSessionLocal() as db:
+                await get_revocation_index().load(db)
+        except Exception as e:
+            logger.error(f"TOKEN_REVOCATION_SYNC_ERROR error={e}")
+
+
 # ── Lifespan ───────────────────────────────────────────────────────────────────
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -130,6 +240,24 @@ async def lifespan(app: FastAPI):
     await init_db()
     logger.info("STARTUP database initialized")
 
+    # Load blacklist into memory (checked on every request)
+    from app.core.blacklist_index import get_blacklist_index
+    from app.db.database import AsyncSessionLocal
+    async with AsyncSessionLocal() as db:
+        await get_blacklist_index().load(db)
+    blacklist_stats = get_blacklist_index().stats()
+    logger.info(f"STARTUP blacklist loaded ips={blacklist_stats['ips']} emails={blacklist_stats['emails']}")
+
+    # Load JWT revocations into memory (checked on every Bearer request)
+    from app.core.token_revocation import get_revocation_index
+    async with AsyncSessionLocal() as db:
+        await get_revocation_index().load(db)
+    revocation_stats = get_revocation_index().stats()
+    logger.info(
+        f"STARTUP token revocations loaded jtis={revocation_stats['revoked_jtis']} "
+        f"watermarks={revocation_stats['user_watermarks']}"
+    )
+
     # Initialize proxy manager
     proxy_mgr = init_proxy_manager(settings.proxy_list)
 
@@ -137,6 +265,10 @@ async def lifespan(app: FastAPI):
     init_tts_engine(proxy_mgr)
     logger.info("STARTUP TTS engine ready")
 
+    # Warm edge-tts connections for direct + every proxy route (background)
+    from app.services.tts_pool import get_tts_pool
+    get_tts_pool().start(settings.proxy_list)
+
     # Pre-load voice list
     try:
         from app.services.voice_service import get_all_voices
@@ -145,20 +277,55 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"STARTUP voice preload failed (will retry on demand): {e}")
 
+    # Open cache index (rebuilds from disk if missing/corrupt)
+    from app.core.cache import get_cache
+    cache_stats = await asyncio.to_thread(lambda: get_cache().stats())
+    logger.info(
+        f"STARTUP cache ready files={cache_stats['files']} "
+        f"size_mb={cache_stats['size_mb']} policy={cache_stats['eviction_policy']}"
+    )
+
     # Start periodic cleanup task
     cleanup_task = asyncio.create_task(periodic_cleanup())
     logger.info("STARTUP periodic cleanup task started")
 
+    # Start background cache eviction worker
+    eviction_task = asyncio.create_task(periodic_cache_eviction())
+    logger.info("STARTUP cache eviction worker started")
+
+    # Start active proxy/direct health probing — with no proxies every request
+    # goes direct anyway, so probing would only burn a synthesis per interval
+    background_tasks = [cleanup_task, eviction_task]
+    if settings.proxy_probe_interval > 0 and settings.proxy_list:
+        background_tasks.append(asyncio.create_task(periodic_proxy_probe()))
+        logger.info(f"STARTUP proxy prober started interval={settings.proxy_probe_interval}s")
+    if settings.blacklist_refresh_interval > 0:
+        background_tasks.append(asyncio.create_task(periodic_blacklist_refresh()))
+    if settings.token_revocation_sync_interval > 0:
+        background_tasks.append(asyncio.create_task(periodic_revocation_sync()))
+    if settings.usage_flush_interval > 0:
+        background_tasks.append(asyncio.create_task(periodic_usage_flush()))
+
+    # Start background job workers (re-enqueues unfinished jobs)
+    from app.services.job_service import get_job_queue
+    await get_job_queue().start()
+
     logger.info(f"STARTUP eidosSpeech {__version__} ready!")
 
     yield  # App is running
 
     # Shutdown
-    cleanup_task.cancel()
-    try:
-        await cleanup_task
-    except asyncio.CancelledError:
-        pass
+    await get_job_queue().stop()
+    for task in background_tasks:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    await get_tts_pool().close()
+    # Persist buffered daily usage (write-behind counters)
+    from app.core.rate_limiter import get_rate_limiter
+    await get_rate_limiter().flush_usage()
     logger.info("SHUTDOWN eidosSpeech stopped")
 
 
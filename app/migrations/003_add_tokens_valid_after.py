@@ -0,0 +1,60 @@
+"""
+Migration 003: Add per-user token watermark to users
+JWTs issued before users.tokens_valid_after are rejected
+(set by revoke_all_user_tokens on password reset and admin ban).
+"""
+
+import asyncio
+import logging
+from sqlalchemy import text
+from app.db.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+async def upgrade():
+    """Add tokens_valid_after column"""
+    async with AsyncSessionLocal() as session:
+        try:
+            # Check if column already exists
+            result = await session.execute(
+                text("PRAGMA table_info(users)")
+            )
+            columns = [row[1] for row in result.fetchall()]
+
+            if 'tokens_valid_after' in columns:
+                logger.info("Migration 003: tokens_valid_after already exists, skipping")
+                return
+
+            # NULL = no watermark (every unexpired, unrevoked token is valid)
+            await session.execute(text("""
+                ALTER TABLE users
+                ADD COLUMN tokens_valid_after DATETIME
+            """))
+
+            await session.commit()
+            logger.info("Migration 003: tokens_valid_after column added successfully")
+
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Migration 003 failed: {e}")
+            raise
+
+
+async def downgrade():
+    """Remove tokens_valid_after column"""
+    async with AsyncSessionLocal() as session:
+        try:
+            # SQLite doesn't support DROP COLUMN directly
+            # Would need to recreate table, so just log warning
+            logger.warning("Migration 003 downgrade: SQLite doesn't support DROP COLUMN")
+            logger.warning("Manual intervention required to remove tokens_valid_after")
+
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Migration 003 downgrade failed: {e}")
+            raise
+
+
+if __name__ == "__main__":
+    asyncio.run(upgrade())
@@ -0,0 +1,97 @@
+"""
+Migration 004: One daily_usage row per identity per day
+Without a unique constraint the rate limiter's INSERT OR IGNORE inserted a
+fresh (empty) row on every request. This merges existing duplicates into the
+oldest row and adds the unique partial indexes the usage UPSERTs target:
+  (api_key_id, date) WHERE api_key_id IS NOT NULL   — registered
+  (ip_address, date) WHERE api_key_id IS NULL       — anonymous
+"""
+
+import asyncio
+import logging
+from sqlalchemy import text
+from app.db.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+COUNTER_COLUMNS = (
+    "request_count", "chars_used",
+    "webui_tts_count", "api_tts_count", "webui_multivoice_count", "api_multivoice_count",
+)
+
+# identity columns + partial index predicate per identity kind
+IDENTITIES = (
+    ("uq_daily_usage_key_date", "api_key_id", "api_key_id IS NOT NULL"),
+    ("uq_daily_usage_ip_date", "ip_address", "api_key_id IS NULL"),
+)
+
+
+async def upgrade():
+    """Merge duplicate daily_usage rows, then add unique partial indexes"""
+    async with AsyncSessionLocal() as session:
+        try:
+            # Fresh install: create_all builds the table with these indexes
+            result = await session.execute(
+                text("SELECT name FROM sqlite_master WHERE type='table' AND name='daily_usage'")
+            )
+            if not result.fetchone():
+                logger.info("Migration 004: daily_usage table does not exist yet, skipping")
+                return
+
+            result = await session.execute(
+                text("SELECT name FROM sqlite_master WHERE type='index' AND name='uq_daily_usage_key_date'")
+            )
+            if result.fetchone():
+                logger.info("Migration 004: unique daily_usage indexes already exist, skipping")
+                return
+
+            merged = 0
+            for index_name, column, predicate in IDENTITIES:
+                # Fold every duplicate's counters into the oldest row of its group
+                sums = ", ".join(
+                    f"{c} = (SELECT SUM(d.{c}) FROM daily_usage d "
+                    f"WHERE d.{column} IS daily_usage.{column} AND d.date = daily_usage.date "
+                    f"AND d.{predicate})"
+                    for c in COUNTER_COLUMNS
+                )
+                keep = (
+                    f"SELECT MIN(id) FROM daily_usage WHERE {predicate} "
+                    f"GROUP BY {column}, date"
+                )
+                await session.execute(text(
+                    f"UPDATE daily_usage SET {sums} WHERE {predicate} AND id IN ({keep} HAVING COUNT(*) > 1)"
+                ))
+                result = await session.execute(text(
+                    f"DELETE FROM daily_usage WHERE {predicate} AND id NOT IN ({keep})"
+                ))
+                merged += result.rowcount
+
+                await session.execute(text(
+                    f"CREATE UNIQUE INDEX {index_name} ON daily_usage({column}, date) WHERE {predicate}"
+                ))
+
+            await session.commit()
+            logger.info(f"Migration 004: unique daily_usage indexes created, {merged} duplicate rows merged")
+
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Migration 004 failed: {e}")
+            raise
+
+
+async def downgrade():
+    """Remove unique daily_usage indexes (merged rows are not split back)"""
+    async with AsyncSessionLocal() as session:
+        try:
+            for index_name, _, _ in IDENTITIES:
+                await session.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+            await session.commit()
+            logger.info("Migration 004: unique daily_usage indexes dropped")
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Migration 004 downgrade failed: {e}")
+            raise
+
+
+if __name__ == "__main__":
+    asyncio.run(upgrade())
@@ -5,7 +5,7 @@ Request/response models for all API endpoints.
 
 from datetime import datetime
 from typing import Optional, Literal
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
 
 
 # ── TTS Schemas ───────────────────────────────────────────────────────────────
@@ -79,6 +79,28 @@ class ScriptRequest(BaseModel):
         return v
 
 
+class JobRequest(BaseModel):
+    """POST /jobs — exactly one payload matching `type`"""
+    type: Literal["script", "tts"] = Field(..., description="script = multi-voice, tts = long text")
+    script: Optional[ScriptRequest] = None
+    tts: Optional[TTSRequest] = None
+
+    @model_validator(mode="after")
+    def payload_matches_type(self):
+        if getattr(self, self.type) is None:
+            raise ValueError(f"'{self.type}' payload is required for type={self.type}")
+        return self
+
+
+class BatchTTSRequest(BaseModel):
+    """POST /batch/tts — N independent TTS items, one auth + quota check"""
+    items: list[TTSRequest] = Field(..., min_length=1, max_length=500)
+    format: Literal["ndjson", "zip"] = Field(
+        default="ndjson",
+        description="ndjson = manifest of cache keys (streamed), zip = all MP3s in one archive"
+    )
+
+
 class TTSResponse(BaseModel):
     """Used for tracking/logging (actual response is FileResponse)"""
     voice: str
@@ -288,9 +310,21 @@ class AdminVoiceUsage(BaseModel):
 
 class AdminBlacklistRequest(BaseModel):
     type: Literal["ip", "email"]
-    value: str
+    value: str                          # email, IP address or CIDR range (e.g. 203.0.113.0/24)
     reason: Optional[str] = None
 
+    @model_validator(mode="after")
+    def normalize_value(self):
+        if self.type == "ip":
+            from app.core.blacklist_index import normalize_ip_entry
+            try:
+                self.value = normalize_ip_entry(self.value)
+            except ValueError:
+                raise ValueError("value must be an IP address or CIDR range (e.g. 203.0.113.0/24)")
+        else:
+            self.value = self.value.strip().lower()
+        return self
+
 
 # ── Generic Response ──────────────────────────────────────────────────────────
 
@@ -0,0 +1,94 @@
+"""
+eidosSpeech v2 — Batch TTS Fan-out
+Synthesizes the unique items of a POST /api/v1/batch/tts request.
+
+Items arrive already deduplicated by cache key. Cache hits are yielded
+first, without touching edge-tts; misses are synthesized concurrently
+(bounded by settings.batch_concurrency) and yielded as they complete.
+Each miss goes through the same single-flight + cache path as POST /tts,
+so a batch and a concurrent single request for the same text share one
+synthesis, and every result is a cache hit for later /tts calls.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict
+
+from app.config import settings
+from app.core.cache import get_cache
+from app.core.singleflight import get_tts_flight
+from app.models.schemas import TTSRequest
+from app.services.chunked_tts import synthesize_chunked
+from app.services.tts_engine import get_tts_engine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one unique batch item"""
+    cache_key: str
+    audio: bytes | None
+    cache_hit: bool = False
+    error: str | None = None
+
+
+async def _synthesize(cache_key: str, item: TTSRequest) -> bytes:
+    """Synthesize one item and cache it (long texts chunked, as in POST /tts)"""
+    text = item.text.strip()
+    chunked = 0 < settings.tts_chunk_threshold < len(text)
+    synthesize = synthesize_chunked if chunked else get_tts_engine().synthesize
+
+    async def synthesize_and_cache() -> bytes:
+        audio_bytes = await synthesize(
+            text=text,
+            voice=item.voice,
+            rate=item.rate,
+            pitch=item.pitch,
+            volume=item.volume,
+            style=item.style,
+            style_degree=item.style_degree,
+        )
+        await get_cache().aput(cache_key, audio_bytes)
+        return audio_bytes
+
+    audio_bytes, _ = await get_tts_flight().do(cache_key, synthesize_and_cache)
+    return audio_bytes
+
+
+async def iter_batch_audio(items: Dict[str, TTSRequest]) -> AsyncIterator[BatchResult]:
+    """
+    Yield one BatchResult per cache key: hits first, then misses in completion order.
+    A failed item is reported through BatchResult.error; it never aborts the batch.
+    """
+    cache = get_cache()
+    semaphore = asyncio.Semaphore(max(1, settings.batch_concurrency))
+
+    # ── 1. Cache hits — served immediately ────────────────────
+    misses = {}
+    for cache_key, item in items.items():
+        audio = await cache.aget_bytes(cache_key)
+        if audio:
+            yield BatchResult(cache_key, audio, cache_hit=True)
+        else:
+            misses[cache_key] = item
+
+    # ── 2. Misses — bounded fan-out ───────────────────────────
+    async def run(cache_key: str, item: TTSRequest) -> BatchResult:
+        async with semaphore:
+            try:
+                return BatchResult(cache_key, await _synthesize(cache_key, item))
+            except RuntimeError as e:
+                logger.error(f"BATCH_ITEM_ERROR key={cache_key[:8]}... voice={item.voice} error={e}")
+                return BatchResult(cache_key, None, error=str(e)[:200])
+
+    tasks = [asyncio.create_task(run(key, item)) for key, item in misses.items()]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Client gone or generator closed early: stop outstanding syntheses
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
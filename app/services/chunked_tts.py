@@ -0,0 +1,156 @@
+"""
+eidosSpeech v2 — Chunked Long-Text Synthesis
+Long texts are split at sentence boundaries and the chunks are synthesized
+concurrently (bounded by settings.tts_chunk_concurrency). Each chunk goes
+through TTSEngine.synthesize(), so ProxyManager's latency-aware route
+selection spreads them across proxies.
+
+Every chunk is cached under its own key, and chunks never span paragraphs —
+editing one paragraph only re-synthesizes that paragraph's chunks.
+
+edge-tts emits bare MPEG frames (no ID3 / Xing header), so chunk outputs
+are joined in order without re-encoding.
+"""
+
+import asyncio
+import logging
+import re
+from typing import Callable, List
+
+from app.config import settings
+from app.core.cache import get_cache
+from app.core.cache_keys import tts_cache_key
+from app.core.singleflight import get_tts_flight
+from app.services.tts_engine import get_tts_engine
+
+logger = logging.getLogger(__name__)
+
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+# Split after terminal punctuation; CJK terminators need no trailing space
+_SENTENCE_RE = re.compile(r"(?<=[.!?…])\s+|(?<=[。！？])\s*")
+_CJK_TERMINATORS = "。！？"
+_CLAUSE_RE = re.compile(r"(?<=[,;:，；：])\s*")
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    """Break an over-long sentence at clause punctuation, then at whitespace"""
+    parts = []
+    for clause in _CLAUSE_RE.split(sentence):
+        while len(clause) > max_chars:
+            cut = clause.rfind(" ", 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            parts.append(clause[:cut].strip())
+            clause = clause[cut:].strip()
+        if clause:
+            parts.append(clause)
+    return parts
+
+
+def split_text(text: str, max_chars: int) -> List[str]:
+    """
+    Split text into chunks of at most max_chars, at sentence boundaries.
+    Sentences are packed greedily within a paragraph; packing never crosses
+    a paragraph break, so chunk boundaries are stable under edits elsewhere.
+    """
+    chunks = []
+    for paragraph in _PARAGRAPH_RE.split(text):
+        pieces = []
+        for sentence in _SENTENCE_RE.split(paragraph.strip()):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            if len(sentence) > max_chars:
+                pieces.extend(_split_long(sentence, max_chars))
+            else:
+                pieces.append(sentence)
+
+        current = ""
+        for piece in pieces:
+            if current and len(current) + 1 + len(piece) > max_chars:
+                chunks.append(current)
+                current = piece
+            elif current:
+                separator = "" if current[-1] in _CJK_TERMINATORS else " "
+                current = f"{current}{separator}{piece}"
+            else:
+                current = piece
+        if current:
+            chunks.append(current)
+    return chunks
+
+
+async def synthesize_chunked(
+    text: str,
+    voice: str,
+    rate: str = "+0%",
+    pitch: str = "+0Hz",
+    volume: str = "+0%",
+    style: str | None = None,
+    style_degree: float | None = None,
+    progress: Callable[[int, int], None] | None = None,
+) -> bytes:
+    """
+    Synthesize a long text chunk by chunk and return the joined MP3.
+    progress(done, total) is called as each chunk finishes (any order).
+    Raises RuntimeError if any chunk fails after the engine's retries; the
+    remaining chunks are cancelled as soon as one fails.
+    """
+    chunks = split_text(text, settings.tts_chunk_max_chars)
+    cache = get_cache()
+    flight = get_tts_flight()
+    tts_engine = get_tts_engine()
+    semaphore = asyncio.Semaphore(max(1, settings.tts_chunk_concurrency))
+    cached = 0
+    done = 0
+
+    async def synthesize_one(chunk: str) -> bytes:
+        nonlocal done
+        audio = await fetch_one(chunk)
+        done += 1
+        if progress:
+            progress(done, len(chunks))
+        return audio
+
+    async def fetch_one(chunk: str) -> bytes:
+        nonlocal cached
+        key = tts_cache_key(chunk, voice, rate, pitch, style, style_degree)
+        audio = await cache.aget_bytes(key)
+        if audio:
+            cached += 1
+            return audio
+
+        async def synthesize_and_cache() -> bytes:
+            audio_bytes = await tts_engine.synthesize(
+                text=chunk,
+                voice=voice,
+                rate=rate,
+                pitch=pitch,
+                volume=volume,
+                style=style,
+                style_degree=style_degree,
+            )
+            await cache.aput(key, audio_bytes)
+            return audio_bytes
+
+        async with semaphore:
+            audio, _ = await flight.do(key, synthesize_and_cache)
+        return audio
+
+    tasks = [asyncio.create_task(synthesize_one(chunk)) for chunk in chunks]
+    try:
+        finished, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in finished:
+            if task.exception() is not None:
+                raise task.exception()
+        parts = [task.result() for task in tasks]
+    finally:
+        # A chunk failed or we were cancelled: stop the outstanding chunks
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    logger.info(
+        f"TTS_CHUNKED voice={voice} chars={len(text)} chunks={len(chunks)} cached={cached}"
+    )
+    return b"".join(parts)
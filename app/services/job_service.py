@@ -0,0 +1,179 @@
+"""
+eidosSpeech v2 — Background Job Queue
+Scripts and long texts submitted via POST /api/v1/jobs are persisted in the
+`jobs` table and processed by a small in-process worker pool, so traffic
+spikes become queue depth instead of 429s and held-open connections.
+
+Lifecycle: queued → running → done | failed.
+The result audio is written to the TTS cache (job.namespace / job.cache_key),
+where GET /jobs/{id}/audio serves it from. On startup, queued jobs — and jobs
+left running by a previous process — are re-enqueued.
+
+Live progress (lines / chunks done) is kept in memory for running jobs and
+written to the row when the job finishes, so polling costs no DB writes.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import select, update
+
+from app.config import settings
+from app.core.cache import get_cache
+from app.db.database import AsyncSessionLocal
+from app.db.models import Job
+from app.models.schemas import ScriptRequest, TTSRequest
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+class JobQueue:
+    """FIFO of job ids drained by `workers` asyncio tasks"""
+
+    def __init__(self, workers: int):
+        self.workers = max(1, workers)
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+        self._progress: dict[str, tuple[int, int]] = {}  # job_id → (done, total) while running
+
+    async def start(self):
+        """Re-enqueue unfinished jobs, then start the workers"""
+        async with AsyncSessionLocal() as db:
+            # Jobs running when the previous process died start over
+            await db.execute(
+                update(Job).where(Job.status == JOB_RUNNING)
+                .values(status=JOB_QUEUED, started_at=None, progress_done=0)
+            )
+            await db.commit()
+            result = await db.execute(
+                select(Job.id).where(Job.status == JOB_QUEUED).order_by(Job.created_at)
+            )
+            pending = [row[0] for row in result.fetchall()]
+
+        for job_id in pending:
+            self.submit(job_id)
+        self._tasks = [asyncio.create_task(self._worker(n)) for n in range(self.workers)]
+        logger.info(f"JOB_QUEUE_STARTED workers={self.workers} recovered={len(pending)}")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, job_id: str):
+        self._queue.put_nowait(job_id)
+
+    def progress(self, job_id: str) -> tuple[int, int] | None:
+        """Live (done, total) for a running job, None if not running here"""
+        return self._progress.get(job_id)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize(),
+            "running": len(self._progress),
+        }
+
+    async def _worker(self, n: int):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                logger.error(f"JOB_WORKER_ERROR worker={n} job={job_id} error={e}")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str):
+        # ── 1. Claim the job ──────────────────────────────────
+        async with AsyncSessionLocal() as db:
+            job = await db.get(Job, job_id)
+            if job is None or job.status != JOB_QUEUED:
+                return
+            job.status = JOB_RUNNING
+            job.started_at = datetime.now(timezone.utc)
+            await db.commit()
+
+        self._progress[job_id] = (0, job.progress_total)
+
+        def report(done: int, total: int):
+            # Sibling chunks of a failed job may still finish after it is recorded
+            if job_id in self._progress:
+                self._progress[job_id] = (done, total)
+
+        # ── 2. Synthesize ─────────────────────────────────────
+        error = None
+        try:
+            params = json.loads(job.params)
+            if job.type == "script":
+                audio_bytes = await self._run_script(ScriptRequest.model_validate(params), report)
+            else:
+                audio_bytes = await self._run_tts(TTSRequest.model_validate(params), report)
+            await get_cache().aput(job.cache_key, audio_bytes, namespace=job.namespace)
+        except Exception as e:
+            error = str(e)[:500]
+
+        # ── 3. Record the outcome ─────────────────────────────
+        done, total = self._progress.pop(job_id, (0, job.progress_total))
+        async with AsyncSessionLocal() as db:
+            job = await db.get(Job, job_id)
+            job.status = JOB_FAILED if error else JOB_DONE
+            job.error = error
+            job.progress_done = done
+            job.progress_total = total
+            job.finished_at = datetime.now(timezone.utc)
+            await db.commit()
+
+        if error:
+            logger.warning(f"JOB_FAILED id={job_id} type={job.type} error={error}")
+        else:
+            logger.info(f"JOB_DONE id={job_id} type={job.type} progress={done}/{total}")
+
+    @staticmethod
+    async def _run_script(req: ScriptRequest, report) -> bytes:
+        from app.services.script_service import parse_script, generate_script_audio
+
+        lines = parse_script(req.script)
+        return await generate_script_audio(
+            lines=lines,
+            voice_map=req.voice_map,
+            pause_ms=req.pause_ms,
+            rate=req.rate,
+            pitch=req.pitch,
+            volume=req.volume,
+            progress=report,
+        )
+
+    @staticmethod
+    async def _run_tts(req: TTSRequest, report) -> bytes:
+        from app.services.chunked_tts import synthesize_chunked
+
+        return await synthesize_chunked(
+            text=req.text,
+            voice=req.voice,
+            rate=req.rate,
+            pitch=req.pitch,
+            volume=req.volume,
+            style=req.style,
+            style_degree=req.style_degree,
+            progress=report,
+        )
+
+
+# Singleton
+_job_queue: JobQueue = None
+
+
+def get_job_queue() -> JobQueue:
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue(settings.job_workers)
+    return _job_queue
@@ -0,0 +1,239 @@
+"""
+eidosSpeech v2 — Frame-level MP3 Concatenation
+Splice MPEG audio Layer III streams without decoding or re-encoding.
+
+edge-tts always returns the same CBR profile
+(audio-24khz-48kbitrate-mono-mp3: MPEG-2 Layer III, 144-byte frames,
+576 samples = 24 ms each), so script assembly is just:
+  1. strip ID3 tags and Xing/Info/VBRI header frames from every part
+  2. insert pre-built silent frames for the pauses
+  3. prepend one fresh "Info" header frame with the final frame/byte counts
+
+FrameSplicer does the same incrementally, for streaming output (step 3 is
+then left out — for CBR, players derive duration from the bitrate anyway).
+
+Silent frames reuse the stream's own header with all-zero side info
+(part2_3_length = 0), which every decoder renders as digital silence.
+Parsing is strict about the header but resyncs past garbage bytes.
+"""
+
+import struct
+from dataclasses import dataclass
+from typing import Iterator, List
+
+# Bitrate tables (kbps) for Layer III, indexed by the 4-bit bitrate index
+_BITRATES_V1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_BITRATES_V2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+
+# Sample rates (Hz), indexed by the 2-bit version id then the sample-rate index
+_SAMPLE_RATES = {
+    0b11: (44100, 48000, 32000),    # MPEG-1
+    0b10: (22050, 24000, 16000),    # MPEG-2
+    0b00: (11025, 12000, 8000),     # MPEG-2.5
+}
+
+_XING_TAGS = (b"Xing", b"Info")
+_VBRI_OFFSET = 36   # VBRI header sits at a fixed offset after the 4-byte frame header
+
+XING_FLAG_FRAMES = 0x1
+XING_FLAG_BYTES = 0x2
+
+
+@dataclass(frozen=True)
+class FrameHeader:
+    """Decoded 4-byte MPEG audio Layer III frame header"""
+    raw: int
+    version: int            # 0b11 MPEG-1, 0b10 MPEG-2, 0b00 MPEG-2.5
+    bitrate: int            # bits per second
+    sample_rate: int        # Hz
+    padding: int            # 0 or 1 byte
+    mono: bool
+
+    @property
+    def samples(self) -> int:
+        return 1152 if self.version == 0b11 else 576
+
+    @property
+    def length(self) -> int:
+        """Frame length in bytes, header included"""
+        return self.samples // 8 * self.bitrate // self.sample_rate + self.padding
+
+    @property
+    def duration_ms(self) -> float:
+        return self.samples * 1000 / self.sample_rate
+
+    @property
+    def side_info_size(self) -> int:
+        if self.version == 0b11:
+            return 17 if self.mono else 32
+        return 9 if self.mono else 17
+
+    def profile(self) -> tuple:
+        """Fields that must match for two streams to be spliced"""
+        return (self.version, self.sample_rate, self.mono)
+
+
+def parse_header(data: bytes, offset: int) -> FrameHeader | None:
+    """Decode the Layer III frame header at offset, or None if it isn't one"""
+    if offset + 4 > len(data):
+        return None
+    raw = struct.unpack_from(">I", data, offset)[0]
+    if raw >> 21 != 0x7FF:                      # 11-bit frame sync
+        return None
+
+    version = (raw >> 19) & 0b11
+    layer = (raw >> 17) & 0b11
+    bitrate_index = (raw >> 12) & 0xF
+    rate_index = (raw >> 10) & 0b11
+    if version == 0b01 or layer != 0b01 or bitrate_index in (0, 0xF) or rate_index == 0b11:
+        return None
+
+    table = _BITRATES_V1 if version == 0b11 else _BITRATES_V2
+    return FrameHeader(
+        raw=raw,
+        version=version,
+        bitrate=table[bitrate_index] * 1000,
+        sample_rate=_SAMPLE_RATES[version][rate_index],
+        padding=(raw >> 9) & 1,
+        mono=((raw >> 6) & 0b11) == 0b11,
+    )
+
+
+def _skip_id3(data: bytes) -> int:
+    """Offset of the first byte after a leading ID3v2 tag (0 if none)"""
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = 0
+    for byte in data[6:10]:                     # syncsafe integer
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _is_header_frame(frame: bytes, header: FrameHeader) -> bool:
+    """True for Xing/Info/VBRI metadata frames, which carry no audio"""
+    offset = 4 + header.side_info_size
+    return (
+        frame[offset:offset + 4] in _XING_TAGS
+        or frame[_VBRI_OFFSET:_VBRI_OFFSET + 4] == b"VBRI"
+    )
+
+
+def iter_frames(data: bytes) -> Iterator[tuple[FrameHeader, bytes]]:
+    """
+    Yield (header, frame_bytes) for every audio frame in an MP3 blob.
+    Leading ID3v2, trailing ID3v1/APE data and Xing/Info/VBRI frames are skipped.
+    """
+    offset = _skip_id3(data)
+    end = len(data)
+    while offset < end:
+        header = parse_header(data, offset)
+        if header is None or offset + header.length > end:
+            offset += 1                         # resync
+            continue
+        frame = data[offset:offset + header.length]
+        offset += header.length
+        if not _is_header_frame(frame, header):
+            yield header, frame
+
+
+def mp3_duration_ms(data: bytes) -> int:
+    """Playback duration from the audio frames (header frames excluded)"""
+    return round(sum(header.duration_ms for header, _ in iter_frames(data)))
+
+
+def _template_header(header: FrameHeader) -> int:
+    """Header bits for synthesized frames: no CRC, no padding"""
+    raw = header.raw | (1 << 16)                # protection bit set = no CRC
+    return raw & ~(1 << 9)                      # clear padding bit
+
+
+def silent_frame(header: FrameHeader) -> bytes:
+    """One frame of digital silence in the given stream's profile"""
+    template = parse_header(struct.pack(">I", _template_header(header)), 0)
+    return struct.pack(">I", template.raw) + bytes(template.length - 4)
+
+
+def silence(header: FrameHeader, duration_ms: int) -> List[bytes]:
+    """Silent frames covering duration_ms (rounded to whole frames)"""
+    count = round(duration_ms / header.duration_ms)
+    return [silent_frame(header)] * count
+
+
+def info_frame(header: FrameHeader, frame_count: int, byte_count: int) -> bytes:
+    """
+    CBR "Info" header frame (Xing layout) with frame and byte totals,
+    so players report duration and seek accurately. Counts include this frame.
+    """
+    frame = bytearray(silent_frame(header))
+    offset = 4 + header.side_info_size
+    frame[offset:offset + 16] = b"Info" + struct.pack(
+        ">III", XING_FLAG_FRAMES | XING_FLAG_BYTES, frame_count + 1, byte_count + len(frame)
+    )
+    return bytes(frame)
+
+
+class FrameSplicer:
+    """
+    Incremental concat_mp3(): feed parts in order, get their spliced frames back
+    (preceded by the pause for every part after the first). Used to stream a
+    script while it is being assembled; info_frame() gives the header for the
+    complete output once all parts are in.
+    """
+
+    def __init__(self, pause_ms: int = 0):
+        self.pause_ms = pause_ms
+        self.reference: FrameHeader | None = None
+        self.frames = 0
+        self.bytes = 0
+        self._parts = 0
+        self._gap: List[bytes] = []
+
+    def add(self, part: bytes) -> bytes:
+        """Splice one part; raises ValueError if it is empty or has another profile"""
+        self._parts += 1
+        part_frames = []
+        for header, frame in iter_frames(part):
+            if self.reference is None:
+                self.reference = header
+                self._gap = silence(header, self.pause_ms)
+            elif header.profile() != self.reference.profile():
+                raise ValueError(
+                    f"Part {self._parts} is {header.sample_rate}Hz "
+                    f"{'mono' if header.mono else 'stereo'}, expected "
+                    f"{self.reference.sample_rate}Hz "
+                    f"{'mono' if self.reference.mono else 'stereo'}"
+                )
+            part_frames.append(frame)
+
+        if not part_frames:
+            raise ValueError(f"Part {self._parts} contains no MP3 audio frames")
+        if self.frames:
+            part_frames = self._gap + part_frames
+
+        out = b"".join(part_frames)
+        self.frames += len(part_frames)
+        self.bytes += len(out)
+        return out
+
+    def info_frame(self) -> bytes:
+        """Info header frame for everything spliced so far"""
+        if self.reference is None:
+            raise ValueError("No MP3 parts to concatenate")
+        return info_frame(self.reference, self.frames, self.bytes)
+
+
+def concat_mp3(parts: List[bytes], pause_ms: int = 0) -> bytes:
+    """
+    Concatenate MP3 blobs frame by frame, with pause_ms of silence between parts.
+    All parts must share one profile (MPEG version, sample rate, channel mode).
+    Raises ValueError on empty input or mismatched streams.
+    """
+    splicer = FrameSplicer(pause_ms)
+    body = b"".join(splicer.add(part) for part in parts)
+    return splicer.info_frame() + body
+
+
+def with_info_frame(data: bytes) -> bytes:
+    """Prepend an Info header frame to an already spliced stream (e.g. a finished stream)"""
+    return concat_mp3([data])
@@ -1,34 +1,118 @@
 """
-eidosSpeech v2 — Round-Robin Proxy Manager
+eidosSpeech v2 — Latency-Aware Proxy Manager
 Optional proxy support — empty EIDOS_PROXIES = direct connection.
 
-Fallback chain:
-  1. Round-robin through healthy proxies
-  2. If a proxy fails MAX_FAILURES times → disabled for COOLDOWN_SECONDS (10 min)
-  3. If ALL proxies disabled → return None (direct connection via VPS IP)
-  4. After cooldown expires → proxy is re-tried automatically
+Selection (power of two choices):
+  1. Draw two healthy proxies at random, weighted by their drain weight
+  2. Pick between them inversely proportional to their score
+     (score = EWMA latency × (1 + error-rate penalty)) — the faster one wins
+     most of the time, but the slower one keeps getting enough samples
+  Proxies without latency samples score 0, so new/recovered ones get probed first.
+
+Latency is time-to-first-audio-chunk, reported by TTSEngine per attempt, so
+it reflects the route rather than the length of the text.
+
+Health:
+  - Proxy fails MAX_FAILURES times consecutively → disabled for COOLDOWN_SECONDS (10 min)
+  - Proxy whose p95 latency exceeds DRAIN_RATIO × the fleet median p95 is drained
+    gradually: its selection weight halves per slow sample (down to MIN_WEIGHT)
+    and doubles back per healthy sample — slow proxies fade out instead of flapping
+  - All proxies disabled → return None (direct connection via VPS IP)
+  - After cooldown → proxy is re-tried automatically
+  - Active probes (TTSEngine.probe, every EIDOS_PROXY_PROBE_INTERVAL) count like
+    requests, so dead proxies are disabled before user traffic hits them, and a
+    passing probe re-admits a disabled proxy without waiting out the cooldown
 
 This means: proxy mati sementara = otomatis coba lagi nanti.
             proxy semua mati = langsung pake direct connection, tetap jalan.
+
+The direct route is tracked with the same stats (route None / "direct").
 """
 
 import asyncio
-import itertools
 import logging
+import random
+import statistics
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+
+from yarl import URL
 
 logger = logging.getLogger(__name__)
 
 COOLDOWN_SECONDS = 600  # 10 minutes before retrying a failed proxy
 
+EWMA_ALPHA = 0.2            # weight of the newest sample
+ERROR_PENALTY = 4.0         # score multiplier per unit of EWMA error rate
+LATENCY_WINDOW = 50         # recent samples kept per route for p95
+MIN_SAMPLES = 10            # samples needed before a route can be drained
+DRAIN_RATIO = 2.0           # p95 above this × fleet median p95 → drain
+MIN_WEIGHT = 0.05
+
+
+def route_label(proxy: str | None) -> str:
+    """Route name for logs/stats — never exposes proxy credentials"""
+    if not proxy:
+        return "direct"
+    url = URL(proxy)
+    return f"{url.host}:{url.port}"
+
+
+@dataclass
+class RouteStats:
+    """Rolling latency / error statistics for one route"""
+    latency: float | None = None        # EWMA seconds to first audio chunk
+    error_rate: float = 0.0             # EWMA of failures (0..1)
+    weight: float = 1.0                 # drain weight for selection (MIN_WEIGHT..1)
+    requests: int = 0
+    failures: int = 0
+    samples: deque = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+
+    def record(self, ok: bool, latency: float | None):
+        self.requests += 1
+        if not ok:
+            self.failures += 1
+        self.error_rate += EWMA_ALPHA * ((0.0 if ok else 1.0) - self.error_rate)
+        if latency is not None:
+            self.observe(latency)
+
+    def observe(self, latency: float):
+        self.samples.append(latency)
+        self.latency = latency if self.latency is None else (
+            self.latency + EWMA_ALPHA * (latency - self.latency)
+        )
+
+    @property
+    def p95(self) -> float | None:
+        if len(self.samples) < MIN_SAMPLES:
+            return None
+        return statistics.quantiles(self.samples, n=20)[-1]
+
+    @property
+    def score(self) -> float:
+        return (self.latency or 0.0) * (1 + ERROR_PENALTY * self.error_rate)
+
+    def to_dict(self) -> dict:
+        p95 = self.p95
+        return {
+            "latency_ms": round(self.latency * 1000) if self.latency is not None else None,
+            "p95_ms": round(p95 * 1000) if p95 is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "weight": round(self.weight, 3),
+            "requests": self.requests,
+            "failures": self.failures,
+        }
+
 
 class ProxyManager:
     """
-    Round-robin proxy manager with failure tracking and auto-recovery.
+    Latency-aware proxy manager with failure tracking and auto-recovery.
 
     - Empty proxy list → always return None (direct connection)
+    - Healthy proxies are chosen by weighted power-of-two-choices on EWMA latency
     - Proxy fails MAX_FAILURES times consecutively → disabled for 10 minutes
+    - Slow proxies (p95 vs fleet) are drained gradually via their weight
     - All proxies disabled → return None (direct connection via VPS IP)
     - After cooldown → proxy is automatically re-enabled
     """
@@ -37,9 +121,10 @@ class ProxyManager:
 
     def __init__(self, proxy_list: list[str]):
         self._proxies = proxy_list
-        self._cycle = itertools.cycle(proxy_list) if proxy_list else None
         self._failures: dict[str, int] = defaultdict(int)
         self._disabled_until: dict[str, float] = {}  # proxy → unix timestamp
+        self._stats: dict[str | None, RouteStats] = {p: RouteStats() for p in proxy_list}
+        self._stats[None] = RouteStats()             # direct
         self._lock = asyncio.Lock()
 
         if proxy_list:
@@ -53,55 +138,130 @@ class ProxyManager:
         if time.monotonic() >= disabled_until:
             # Cooldown expired — reset and re-enable
             if disabled_until > 0:
-                logger.info(f"PROXY_RECOVERED proxy={proxy} — re-enabling after cooldown")
+                logger.info(f"PROXY_RECOVERED proxy={route_label(proxy)} — re-enabling after cooldown")
                 self._failures[proxy] = 0
                 self._disabled_until[proxy] = 0
             return True
         return False
 
-    async def get_next(self) -> str | None:
+    def _pick_two(self, healthy: list[str]) -> tuple[str, str]:
+        """Two distinct proxies drawn at random, proportionally to their drain weight"""
+        weights = [self._stats[p].weight for p in healthy]
+        first = random.choices(range(len(healthy)), weights=weights)[0]
+        rest = [i for i in range(len(healthy)) if i != first]
+        second = random.choices(rest, weights=[weights[i] for i in rest])[0]
+        return healthy[first], healthy[second]
+
+    async def get_next(self, exclude: str | None = None) -> str | None:
         """
-        Return next healthy proxy URL, or None for direct connection.
+        Return the next healthy proxy URL, or None for direct connection.
+        `exclude` skips one proxy (the slow primary when hedging).
 
         Returns None when:
         - No proxies configured (empty EIDOS_PROXIES)
         - All proxies are in cooldown (all failed recently)
         → In both cases, TTS will proceed via direct connection (VPS IP)
         """
-        if not self._proxies or not self._cycle:
+        if not self._proxies:
             return None
 
         async with self._lock:
-            tried = 0
-            total = len(self._proxies)
-            while tried < total:
-                proxy = next(self._cycle)
-                if self._is_healthy(proxy):
-                    return proxy
-                tried += 1
+            healthy = [p for p in self._proxies if p != exclude and self._is_healthy(p)]
+            if len(healthy) == 1:
+                return healthy[0]
+            if healthy:
+                a, b = self._pick_two(healthy)
+                score_a, score_b = self._stats[a].score, self._stats[b].score
+                if not score_a or not score_b:
+                    return a if score_a <= score_b else b
+                return a if random.random() < score_b / (score_a + score_b) else b
 
         # All proxies are in cooldown — use direct connection
-        logger.warning("PROXY_ALL_FAILED falling_back_to_direct — TTS continues via VPS IP")
+        if exclude is None:
+            logger.warning("PROXY_ALL_FAILED falling_back_to_direct — TTS continues via VPS IP")
         return None
 
-    async def mark_success(self, proxy: str):
-        """Reset failure count on successful use"""
+    def _update_weight(self, proxy: str):
+        """Drain (halve) or restore (double) a proxy's weight from its p95 vs the fleet"""
+        stats = self._stats[proxy]
+        p95 = stats.p95
+        fleet = [s.p95 for p, s in self._stats.items() if p is not None and p != proxy]
+        fleet = [v for v in fleet if v is not None]
+        if p95 is None or not fleet:
+            return
+
+        degraded = p95 > DRAIN_RATIO * statistics.median(fleet)
+        old = stats.weight
+        if degraded:
+            stats.weight = max(MIN_WEIGHT, old / 2)
+        else:
+            stats.weight = min(1.0, old * 2)
+
+        if degraded and old == 1.0:
+            logger.warning(
+                f"PROXY_DRAINING proxy={route_label(proxy)} p95_ms={round(p95 * 1000)} "
+                f"fleet_median_p95_ms={round(statistics.median(fleet) * 1000)}"
+            )
+        elif not degraded and old < 1.0 and stats.weight == 1.0:
+            logger.info(f"PROXY_RESTORED proxy={route_label(proxy)} p95_ms={round(p95 * 1000)}")
+
+    async def mark_success(self, proxy: str | None, latency: float | None = None):
+        """
+        Record a successful attempt (latency = seconds to first audio chunk).
+        Resets the proxy's failure count. proxy=None records the direct route.
+        """
         async with self._lock:
+            self._stats[proxy].record(True, latency)
+            if proxy is None:
+                return
             self._failures[proxy] = 0
             self._disabled_until[proxy] = 0
+            self._update_weight(proxy)
 
-    async def mark_failure(self, proxy: str):
+    async def mark_failure(self, proxy: str | None):
         """Increment failure count — disable proxy for COOLDOWN_SECONDS at MAX_FAILURES"""
         async with self._lock:
+            self._stats[proxy].record(False, None)
+            if proxy is None:
+                return
             self._failures[proxy] += 1
             failures = self._failures[proxy]
             if failures >= self.MAX_FAILURES:
                 self._disabled_until[proxy] = time.monotonic() + COOLDOWN_SECONDS
                 logger.warning(
-                    f"PROXY_DISABLED proxy={proxy} failures={failures} — "
+                    f"PROXY_DISABLED proxy={route_label(proxy)} failures={failures} — "
                     f"cooldown {COOLDOWN_SECONDS}s, using direct fallback"
                 )
 
+    async def mark_slow(self, proxy: str | None, elapsed: float):
+        """
+        Attempt abandoned by hedging after `elapsed` seconds without audio.
+        Recorded as a latency sample (a lower bound) — not a failure — so a
+        consistently slow proxy drains instead of being disabled.
+        """
+        async with self._lock:
+            self._stats[proxy].observe(elapsed)
+            if proxy is not None:
+                self._update_weight(proxy)
+
+    async def record_probe(self, proxy: str | None, ok: bool, latency: float | None = None):
+        """Result of an active health probe — a pass re-admits a disabled proxy at once"""
+        if not ok:
+            await self.mark_failure(proxy)
+            return
+        was_disabled = proxy is not None and time.monotonic() < self._disabled_until.get(proxy, 0)
+        await self.mark_success(proxy, latency)
+        if was_disabled:
+            logger.info(f"PROXY_READMITTED proxy={route_label(proxy)} — probe passed")
+
+    def routes(self) -> list[str | None]:
+        """Every route: direct (None) + each configured proxy"""
+        return [None, *self._proxies]
+
+    def latency_p95(self, proxy: str | None) -> float | None:
+        """p95 seconds to first audio chunk for a route (None until enough samples)"""
+        return self._stats[proxy].p95
+
     def reset_all(self):
         """Reset all failure counts and cooldowns (called by periodic cleanup)"""
         self._failures.clear()
@@ -109,19 +269,26 @@ class ProxyManager:
         logger.info("PROXY_RESET all proxy failure counts cleared")
 
     def get_status(self) -> dict:
-        """Return proxy status for health endpoint"""
+        """Return proxy status (with per-route latency / error stats) for health endpoint"""
+        routes = {route_label(p): s.to_dict() for p, s in self._stats.items()}
         if not self._proxies:
-            return {"enabled": False, "mode": "direct", "count": 0, "healthy": 0, "failed": 0}
+            return {
+                "enabled": False, "mode": "direct", "count": 0, "healthy": 0, "failed": 0,
+                "routes": routes,
+            }
 
         now = time.monotonic()
         healthy = sum(1 for p in self._proxies if now >= self._disabled_until.get(p, 0))
         failed = len(self._proxies) - healthy
+        for p in self._proxies:
+            routes[route_label(p)]["healthy"] = now >= self._disabled_until.get(p, 0)
         return {
             "enabled": True,
             "mode": "proxy+direct_fallback",
             "count": len(self._proxies),
             "healthy": healthy,
             "failed": failed,
+            "routes": routes,
         }
 
 
@@ -3,14 +3,19 @@ eidosSpeech v2.1 — Multi-Voice Script Service
 Parse and generate multi-voice dialog/podcast audio.
 """
 
-import io
+import asyncio
 import re
 import logging
-from typing import List
+from collections import Counter
+from contextlib import aclosing
+from typing import AsyncIterator, Callable, List
 from dataclasses import dataclass
 
-from pydub import AudioSegment
-
+from app.config import settings
+from app.core.cache import get_cache
+from app.core.cache_keys import tts_cache_key
+from app.core.singleflight import get_tts_flight
+from app.services.mp3 import FrameSplicer, mp3_duration_ms
 from app.services.tts_engine import get_tts_engine
 
 logger = logging.getLogger(__name__)
@@ -78,64 +83,90 @@ def parse_script(raw_script: str) -> List[ScriptLine]:
     return lines
 
 
-async def generate_script_audio(
+def resolve_voice(line: ScriptLine, voice_map: dict[str, str]) -> str:
+    """Voice for a line's speaker; falls back to the speaker name as voice ID"""
+    return voice_map.get(line.speaker) or line.speaker
+
+
+def line_cache_keys(
+    lines: List[ScriptLine],
+    voice_map: dict[str, str],
+    rate: str = "+0%",
+    pitch: str = "+0Hz",
+) -> List[str]:
+    """Per-line audio cache keys — the same keys /tts uses for (text, voice, prosody)"""
+    return [
+        tts_cache_key(line.text, resolve_voice(line, voice_map), rate, pitch)
+        for line in lines
+    ]
+
+
+async def iter_line_audio(
     lines: List[ScriptLine],
     voice_map: dict[str, str],
-    pause_ms: int = 500,
     rate: str = "+0%",
     pitch: str = "+0Hz",
     volume: str = "+0%",
-) -> bytes:
+) -> AsyncIterator[bytes]:
     """
-    Generate multi-voice audio from parsed script lines.
+    Yield each line's MP3 bytes in line order.
     
-    Args:
-        lines: List of ScriptLine objects
-        voice_map: Dict mapping speaker names to voice IDs
-                   e.g. {"Gadis": "id-ID-GadisNeural", "Ardi": "id-ID-ArdiNeural"}
-        pause_ms: Milliseconds of silence between lines (0-3000)
-        rate: Speech rate for all voices
-        pitch: Pitch for all voices
-        volume: Volume for all voices
-    
-    Returns:
-        MP3 audio bytes
+    Lines render concurrently (at most script_line_concurrency synthesizing)
+    within a lookahead window of twice that many lines, so memory stays bounded
+    however long the script is. Each line is looked up in / stored to the audio
+    cache, and a line repeated inside the window shares one render.
+    A failed line raises RuntimeError and cancels everything in flight.
     """
     tts_engine = get_tts_engine()
-    segments = []
+    cache = get_cache()
+    flight = get_tts_flight()
+    fanout = max(1, settings.script_line_concurrency)
+    semaphore = asyncio.Semaphore(fanout)
+    window = fanout * 2
     
-    logger.info(f"SCRIPT_GENERATE lines={len(lines)} pause={pause_ms}ms")
+    keys = line_cache_keys(lines, voice_map, rate, pitch)
+    stats = {"cached": 0, "synthesized": 0}
     
-    for i, line in enumerate(lines, 1):
-        # Get voice for this speaker
-        voice = voice_map.get(line.speaker)
-        if not voice:
-            # Fallback: use speaker name as voice ID if not in map
-            voice = line.speaker
+    for speaker in dict.fromkeys(line.speaker for line in lines):
+        if not voice_map.get(speaker):
             logger.warning(
-                f"SCRIPT_LINE {i}: Speaker '{line.speaker}' not in voice_map, "
-                f"using as voice ID directly"
+                f"SCRIPT_SPEAKER '{speaker}' not in voice_map, using as voice ID directly"
             )
+    
+    logger.info(
+        f"SCRIPT_GENERATE lines={len(lines)} unique={len(set(keys))} fanout={fanout}"
+    )
+    
+    async def render_line(key: str, i: int, line: ScriptLine) -> bytes:
+        voice = resolve_voice(line, voice_map)
         
-        # Generate TTS for this line
+        # Generate TTS for this line (engine retries/fallback apply per line)
         try:
-            audio_bytes = await tts_engine.synthesize(
-                text=line.text,
-                voice=voice,
-                rate=rate,
-                pitch=pitch,
-                volume=volume,
-            )
-            
-            # Convert to AudioSegment
-            segment = AudioSegment.from_mp3(io.BytesIO(audio_bytes))
-            segments.append(segment)
+            audio_bytes = await cache.aget_bytes(key)
+            if audio_bytes:
+                stats["cached"] += 1
+            else:
+                async def synthesize_and_cache() -> bytes:
+                    result = await tts_engine.synthesize(
+                        text=line.text,
+                        voice=voice,
+                        rate=rate,
+                        pitch=pitch,
+                        volume=volume,
+                    )
+                    await cache.aput(key, result)
+                    return result
+                
+                async with semaphore:
+                    audio_bytes, _ = await flight.do(key, synthesize_and_cache)
+                stats["synthesized"] += 1
             
             logger.info(
                 f"SCRIPT_LINE {i}/{len(lines)}: "
                 f"speaker={line.speaker} voice={voice} "
-                f"chars={len(line.text)} duration={len(segment)}ms"
+                f"chars={len(line.text)} size={len(audio_bytes)} bytes"
             )
+            return audio_bytes
             
         except Exception as e:
             logger.error(
@@ -147,24 +178,107 @@ async def generate_script_audio(
                 f"(speaker: {line.speaker}): {e}"
             )
     
-    # Merge segments with pauses
-    if not segments:
-        raise RuntimeError("No audio segments generated")
+    # Sliding window of per-line tasks; duplicates in the window share a task
+    live: dict[str, asyncio.Task] = {}
+    refs: Counter = Counter()
+    scheduled = 0
+    
+    def schedule_until(limit: int):
+        nonlocal scheduled
+        while scheduled < min(limit, len(lines)):
+            key = keys[scheduled]
+            if key not in live:
+                live[key] = asyncio.ensure_future(render_line(key, scheduled + 1, lines[scheduled]))
+            refs[key] += 1
+            scheduled += 1
     
-    merged = segments[0]
-    silence = AudioSegment.silent(duration=pause_ms)
+    try:
+        for index, key in enumerate(keys):
+            schedule_until(index + window)
+            audio_bytes = await live[key]
+            refs[key] -= 1
+            if not refs[key]:
+                del live[key]
+            yield audio_bytes
+    finally:
+        # Failure or consumer gone (client disconnect) — stop outstanding lines
+        for task in live.values():
+            task.cancel()
+        await asyncio.gather(*live.values(), return_exceptions=True)
     
-    for segment in segments[1:]:
-        merged += silence + segment
+    logger.info(
+        f"SCRIPT_LINES_READY lines={len(lines)} "
+        f"cached={stats['cached']} synthesized={stats['synthesized']}"
+    )
+
+
+async def stream_script_audio(
+    lines: List[ScriptLine],
+    voice_map: dict[str, str],
+    pause_ms: int = 500,
+    rate: str = "+0%",
+    pitch: str = "+0Hz",
+    volume: str = "+0%",
+) -> AsyncIterator[bytes]:
+    """
+    Yield the assembled script incrementally: each line's frames (preceded by
+    pause frames) as soon as it and every line before it are ready.
+    The stream carries no Info header frame — totals are unknown up front.
+    """
+    splicer = FrameSplicer(pause_ms)
+    async with aclosing(iter_line_audio(lines, voice_map, rate, pitch, volume)) as line_audio:
+        async for audio_bytes in line_audio:
+            try:
+                yield splicer.add(audio_bytes)
+            except ValueError as e:
+                raise RuntimeError(f"Failed to assemble script audio: {e}")
+
+
+async def generate_script_audio(
+    lines: List[ScriptLine],
+    voice_map: dict[str, str],
+    pause_ms: int = 500,
+    rate: str = "+0%",
+    pitch: str = "+0Hz",
+    volume: str = "+0%",
+    progress: Callable[[int, int], None] | None = None,
+) -> bytes:
+    """
+    Generate multi-voice audio from parsed script lines.
+    
+    Lines are synthesized concurrently and spliced frame by frame with
+    silent-frame pauses (no decode / re-encode) — see iter_line_audio().
+    
+    Args:
+        lines: List of ScriptLine objects
+        voice_map: Dict mapping speaker names to voice IDs
+                   e.g. {"Gadis": "id-ID-GadisNeural", "Ardi": "id-ID-ArdiNeural"}
+        pause_ms: Milliseconds of silence between lines (0-3000)
+        rate: Speech rate for all voices
+        pitch: Pitch for all voices
+        volume: Volume for all voices
+        progress: Optional callback(lines_done, total), called in line order
+    
+    Returns:
+        MP3 audio bytes
+    """
+    splicer = FrameSplicer(pause_ms)
+    parts = []
+    try:
+        async with aclosing(iter_line_audio(lines, voice_map, rate, pitch, volume)) as line_audio:
+            async for audio_bytes in line_audio:
+                parts.append(splicer.add(audio_bytes))
+                if progress:
+                    progress(len(parts), len(lines))
+        header = splicer.info_frame()
+    except ValueError as e:
+        raise RuntimeError(f"Failed to assemble script audio: {e}")
     
-    # Export to MP3
-    output = io.BytesIO()
-    merged.export(output, format="mp3", bitrate="48k")
-    audio_bytes = output.getvalue()
+    audio_bytes = header + b"".join(parts)
     
     logger.info(
         f"SCRIPT_COMPLETE lines={len(lines)} "
-        f"duration={len(merged)}ms size={len(audio_bytes)} bytes"
+        f"duration={mp3_duration_ms(audio_bytes)}ms size={len(audio_bytes)} bytes"
     )
     
     return audio_bytes
@@ -0,0 +1,84 @@
+"""
+eidosSpeech v2 — Subtitle Service
+Word-level timings from edge-tts WordBoundary events, and SRT/VTT rendering.
+
+Timings are what gets cached (namespace "subtitle", same key as the audio),
+not the rendered SRT — so a hit can be re-rendered for any words_per_cue
+without contacting edge-tts.
+
+Cached format (compact JSON):
+    {"v": 1, "words": [[offset, duration, "text"], ...]}
+offset/duration are in edge-tts ticks (100 ns), exactly as received.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import List
+
+TIMINGS_FORMAT_VERSION = 1
+
+TICKS_PER_MS = 10_000
+
+
+@dataclass
+class WordTiming:
+    """Single WordBoundary event"""
+    offset: int     # ticks (100 ns) from start of audio
+    duration: int   # ticks
+    text: str
+
+
+def encode_timings(words: List[WordTiming]) -> bytes:
+    """Serialize word timings for the cache"""
+    payload = {
+        "v": TIMINGS_FORMAT_VERSION,
+        "words": [[w.offset, w.duration, w.text] for w in words],
+    }
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def decode_timings(data: bytes) -> List[WordTiming] | None:
+    """Parse cached timings; None if the blob is from an unknown format (treat as miss)"""
+    try:
+        payload = json.loads(data)
+    except ValueError:
+        return None
+    if not isinstance(payload, dict) or payload.get("v") != TIMINGS_FORMAT_VERSION:
+        return None
+    return [WordTiming(int(o), int(d), str(t)) for o, d, t in payload["words"]]
+
+
+def _cues(words: List[WordTiming], words_per_cue: int) -> List[tuple[int, int, str]]:
+    """Group words into (start_ticks, end_ticks, text) cues"""
+    cues = []
+    for i in range(0, len(words), words_per_cue):
+        group = words[i:i + words_per_cue]
+        start = group[0].offset
+        end = group[-1].offset + group[-1].duration
+        cues.append((start, end, " ".join(w.text for w in group)))
+    return cues
+
+
+def _timestamp(ticks: int, separator: str) -> str:
+    """HH:MM:SS<sep>mmm"""
+    ms = ticks // TICKS_PER_MS
+    hours, ms = divmod(ms, 3_600_000)
+    minutes, ms = divmod(ms, 60_000)
+    seconds, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{ms:03d}"
+
+
+def build_srt(words: List[WordTiming], words_per_cue: int = 10) -> str:
+    """Render SubRip subtitles"""
+    blocks = []
+    for index, (start, end, text) in enumerate(_cues(words, words_per_cue), start=1):
+        blocks.append(f"{index}\n{_timestamp(start, ',')} --> {_timestamp(end, ',')}\n{text}\n")
+    return "\n".join(blocks)
+
+
+def build_vtt(words: List[WordTiming], words_per_cue: int = 10) -> str:
+    """Render WebVTT subtitles"""
+    blocks = ["WEBVTT\n"]
+    for start, end, text in _cues(words, words_per_cue):
+        blocks.append(f"{_timestamp(start, '.')} --> {_timestamp(end, '.')}\n{text}\n")
+    return "\n".join(blocks)
@@ -3,24 +3,33 @@ eidosSpeech v2 — TTS Engine
 Wraps edge-tts with proxy support, retry logic, and fallback to direct connection.
 
 Fallback strategy:
-  1. Attempt with proxy (from ProxyManager round-robin)
+  1. Attempt with proxy (ProxyManager: latency-aware power-of-two-choices)
   2. If proxy fails 3 times → ProxyManager marks it dead, returns None
   3. Next attempt uses direct connection (VPS IP)
   4. If all proxies are dead → always direct connection
 
 This means: proxy mati = tetap jalan via direct connection VPS.
+
+Optional hedging (EIDOS_TTS_HEDGE_ENABLED): an attempt with no audio after the
+route's p95 first-chunk latency is raced against a second route; see _open_stream().
 """
 
 import asyncio
 import logging
+import time
+from typing import AsyncIterator
 
 import edge_tts
 
 from app.config import settings
-from app.services.proxy_manager import ProxyManager
+from app.services.proxy_manager import ProxyManager, route_label
+from app.services.subtitle_service import WordTiming
+from app.services.tts_pool import get_tts_pool
 
 logger = logging.getLogger(__name__)
 
+PROBE_TEXT = "Hi."  # health probe: shortest text that still yields audio
+
 
 class TTSEngine:
     """
@@ -29,7 +38,7 @@ class TTSEngine:
     - Retry logic (3 attempts, exponential backoff)
     - Automatic fallback to direct connection if all proxies fail
     - SSML support for voice styles and pronunciation
-    - Returns raw MP3 bytes
+    - Returns raw MP3 bytes, or streams MP3 chunks as they arrive
     """
 
     def __init__(self, proxy_manager: ProxyManager):
@@ -104,17 +113,11 @@ class TTSEngine:
                 tried_direct = True
 
             try:
-                audio = await self._generate(text, voice, rate, pitch, volume, proxy_url, style, style_degree)
-
-                if proxy_url:
-                    await self.proxy_manager.mark_success(proxy_url)
-
-                logger.info(
-                    f"TTS_SUCCESS voice={voice} chars={len(text)} "
-                    f"via={'proxy' if proxy_url else 'direct'} attempt={attempt}"
+                # First chunk (possibly hedged) — this attempt's outcome is recorded
+                # below, once the whole body has (or has not) arrived
+                route, first_chunk, latency, chunks = await self._open_stream(
+                    text, voice, rate, pitch, volume, proxy_url, style, style_degree
                 )
-                return audio
-
             except Exception as e:
                 last_error = e
                 via = proxy_url if proxy_url else "direct"
@@ -123,17 +126,112 @@ class TTSEngine:
                     f"voice={voice} via={via} error={e}"
                 )
 
-                if proxy_url:
-                    await self.proxy_manager.mark_failure(proxy_url)
-
                 if attempt < max_retries:
                     await asyncio.sleep(retry_delay * attempt)  # 1s, 2s, ...
+                continue
+
+            try:
+                audio_chunks = [first_chunk]
+                async for chunk in chunks:
+                    audio_chunks.append(chunk)
+            except Exception as e:
+                last_error = e
+                via = route if route else "direct"
+                logger.warning(
+                    f"TTS_FAIL attempt={attempt}/{max_retries} "
+                    f"voice={voice} via={via} error={e}"
+                )
+
+                await self.proxy_manager.mark_failure(route)
+
+                if attempt < max_retries:
+                    await asyncio.sleep(retry_delay * attempt)
+                continue
+            finally:
+                await chunks.aclose()
+
+            await self.proxy_manager.mark_success(route, latency)
+            logger.info(
+                f"TTS_SUCCESS voice={voice} chars={len(text)} "
+                f"via={'proxy' if route else 'direct'} attempt={attempt}"
+            )
+            return b"".join(audio_chunks)
 
         raise RuntimeError(
             f"TTS generation failed after {max_retries} attempts "
             f"(tried proxy + direct fallback): {last_error}"
         )
 
+    async def synthesize_stream(
+        self,
+        text: str,
+        voice: str,
+        rate: str = "+0%",
+        pitch: str = "+0Hz",
+        volume: str = "+0%",
+        style: str | None = None,
+        style_degree: float | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Generate TTS audio as a stream of MP3 chunks, yielded as edge-tts delivers them.
+
+        Same retry/fallback flow as synthesize(), but an attempt only counts as
+        successful once its first audio chunk has arrived. After that the stream
+        is committed to its route — a mid-stream failure is raised to the caller,
+        since bytes have already been sent and cannot be retried transparently.
+
+        Raises RuntimeError if no attempt produced a first chunk.
+        """
+        last_error = None
+        tried_direct = False
+
+        max_retries = settings.tts_max_retries
+        retry_delay = settings.tts_retry_delay
+
+        for attempt in range(1, max_retries + 1):
+            proxy_url = await self.proxy_manager.get_next()
+
+            if attempt == max_retries and proxy_url and not tried_direct:
+                logger.info("TTS_STREAM_DIRECT_FALLBACK forcing direct connection on final attempt")
+                proxy_url = None
+                tried_direct = True
+
+            try:
+                route, first_chunk, latency, chunks = await self._open_stream(
+                    text, voice, rate, pitch, volume, proxy_url, style, style_degree
+                )
+            except Exception as e:
+                last_error = e
+                via = proxy_url if proxy_url else "direct"
+                logger.warning(
+                    f"TTS_STREAM_FAIL attempt={attempt}/{max_retries} "
+                    f"voice={voice} via={via} error={e}"
+                )
+
+                if attempt < max_retries:
+                    await asyncio.sleep(retry_delay * attempt)
+                continue
+
+            # Committed to this route once audio flows
+            await self.proxy_manager.mark_success(route, latency)
+            logger.info(
+                f"TTS_STREAM_START voice={voice} chars={len(text)} "
+                f"via={'proxy' if route else 'direct'} attempt={attempt}"
+            )
+
+            try:
+                yield first_chunk
+                async for chunk in chunks:
+                    yield chunk
+            finally:
+                await chunks.aclose()
+            return
+
+        raise RuntimeError(
+            f"TTS stream failed after {max_retries} attempts "
+            f"(tried proxy + direct fallback): {last_error}"
+        )
+
     async def synthesize_with_subtitles(
         self,
         text: str,
@@ -141,13 +239,12 @@ class TTSEngine:
         rate: str = "+0%",
         pitch: str = "+0Hz",
         volume: str = "+0%",
-        words_per_cue: int = 10,
         style: str | None = None,
         style_degree: float | None = None,
-    ) -> tuple[bytes, str]:
+    ) -> tuple[bytes, list[WordTiming]]:
         """
-        Generate TTS audio + SRT subtitle. Returns (mp3_bytes, srt_string).
-        Uses edge-tts SubMaker for word-level timing.
+        Generate TTS audio + word-level timings. Returns (mp3_bytes, words).
+        Render them with app.services.subtitle_service (build_srt / build_vtt).
         """
         last_error = None
         tried_direct = False
@@ -164,18 +261,17 @@ class TTSEngine:
                 tried_direct = True
 
             try:
-                audio, srt = await self._generate_with_subs(
-                    text, voice, rate, pitch, volume, proxy_url, words_per_cue, style, style_degree
+                audio, words, first_chunk_latency = await self._generate_with_subs(
+                    text, voice, rate, pitch, volume, proxy_url, style, style_degree
                 )
 
-                if proxy_url:
-                    await self.proxy_manager.mark_success(proxy_url)
+                await self.proxy_manager.mark_success(proxy_url, first_chunk_latency)
 
                 logger.info(
                     f"TTS_SRT_SUCCESS voice={voice} chars={len(text)} "
                     f"via={'proxy' if proxy_url else 'direct'} attempt={attempt}"
                 )
-                return audio, srt
+                return audio, words
 
             except Exception as e:
                 last_error = e
@@ -185,8 +281,7 @@ class TTSEngine:
                     f"voice={voice} via={via} error={e}"
                 )
 
-                if proxy_url:
-                    await self.proxy_manager.mark_failure(proxy_url)
+                await self.proxy_manager.mark_failure(proxy_url)
 
                 if attempt < max_retries:
                     await asyncio.sleep(retry_delay * attempt)
@@ -195,6 +290,116 @@ class TTSEngine:
             f"TTS+SRT generation failed after {max_retries} attempts: {last_error}"
         )
 
+    def _hedge_delay(self, proxy: str | None) -> float | None:
+        """Seconds to wait for a first chunk before hedging (None = no hedging)"""
+        if not settings.tts_hedge_enabled or len(self.proxy_manager.routes()) < 2:
+            return None
+        p95 = self.proxy_manager.latency_p95(proxy)
+        if p95 is None:
+            return settings.tts_hedge_delay
+        return max(settings.tts_hedge_min_delay, p95)
+
+    async def _open_stream(
+        self,
+        text: str,
+        voice: str,
+        rate: str,
+        pitch: str,
+        volume: str,
+        proxy: str | None,
+        style: str | None = None,
+        style_degree: float | None = None,
+    ) -> tuple[str | None, bytes, float, AsyncIterator[bytes]]:
+        """
+        Start an attempt on `proxy` and wait for its first audio chunk.
+
+        Hedging (EIDOS_TTS_HEDGE_ENABLED): if no audio has arrived within the
+        route's p95 first-chunk latency, a second attempt is started on another
+        route (another proxy, or direct). Whichever produces audio first wins;
+        the other is cancelled and its elapsed time recorded as a slow sample.
+
+        Returns (route, first_chunk, first_chunk_latency, remaining_chunks) — the
+        caller must aclose() remaining_chunks and report the winning attempt's
+        outcome to ProxyManager. Attempts that fail here are reported as failures.
+        Raises the last error if no attempt produced audio.
+        """
+        attempts: dict[asyncio.Future, tuple[str | None, AsyncIterator[bytes], float]] = {}
+
+        def launch(route: str | None):
+            chunks = self._stream(text, voice, rate, pitch, volume, route, style, style_degree)
+            attempts[asyncio.ensure_future(chunks.__anext__())] = (route, chunks, time.monotonic())
+
+        launch(proxy)
+        hedge_delay = self._hedge_delay(proxy)
+        hedge_at = time.monotonic() + hedge_delay if hedge_delay is not None else None
+        last_error = None
+        won = False
+
+        try:
+            while attempts:
+                timeout = max(0.0, hedge_at - time.monotonic()) if hedge_at is not None else None
+                done, _ = await asyncio.wait(
+                    attempts, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    # ── Primary is slow: race a second route (once) ───
+                    hedge_at = None
+                    hedge_route = await self.proxy_manager.get_next(exclude=proxy)
+                    if hedge_route != proxy:
+                        logger.info(
+                            f"TTS_HEDGE voice={voice} after={hedge_delay:.2f}s "
+                            f"primary={route_label(proxy)} hedge={route_label(hedge_route)}"
+                        )
+                        launch(hedge_route)
+                    continue
+
+                for task in done:
+                    route, chunks, launched_at = attempts.pop(task)
+                    try:
+                        first_chunk = task.result()
+                    except Exception as e:
+                        last_error = e
+                        await chunks.aclose()
+                        await self.proxy_manager.mark_failure(route)
+                        if attempts:
+                            logger.warning(
+                                f"TTS_HEDGE_ATTEMPT_FAIL route={route_label(route)} error={e}"
+                            )
+                        continue
+
+                    won = True
+                    return route, first_chunk, time.monotonic() - launched_at, chunks
+
+            raise last_error
+        finally:
+            # Stop whatever is still running. Only a hedge loser's wait says the
+            # route was slow — attempts dropped because we were cancelled do not.
+            for task, (route, chunks, launched_at) in attempts.items():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                await chunks.aclose()
+                if won:
+                    await self.proxy_manager.mark_slow(route, time.monotonic() - launched_at)
+
+    async def probe(self, proxy: str | None) -> bool:
+        """
+        Active health check: one tiny synthesis through a single route, no retries.
+        The result (and its first-chunk latency) is reported to ProxyManager.
+        """
+        try:
+            _, first_chunk_latency = await asyncio.wait_for(
+                self._generate(PROBE_TEXT, settings.default_voice, "+0%", "+0Hz", "+0%", proxy),
+                timeout=settings.proxy_probe_timeout,
+            )
+        except Exception as e:
+            logger.warning(f"PROXY_PROBE_FAIL route={route_label(proxy)} error={e!r}")
+            await self.proxy_manager.record_probe(proxy, False)
+            return False
+
+        await self.proxy_manager.record_probe(proxy, True, first_chunk_latency)
+        return True
+
     async def _generate(
         self,
         text: str,
@@ -205,8 +410,34 @@ class TTSEngine:
         proxy: str | None,
         style: str | None = None,
         style_degree: float | None = None,
-    ) -> bytes:
-        """Single TTS generation attempt via edge-tts"""
+    ) -> tuple[bytes, float]:
+        """
+        Single TTS generation attempt via edge-tts.
+        Returns (mp3_bytes, seconds to first audio chunk) — the latter feeds
+        ProxyManager's per-route latency stats.
+        """
+        started = time.monotonic()
+        first_chunk_latency = None
+        audio_chunks = []
+        async for chunk in self._stream(text, voice, rate, pitch, volume, proxy, style, style_degree):
+            if first_chunk_latency is None:
+                first_chunk_latency = time.monotonic() - started
+            audio_chunks.append(chunk)
+
+        return b"".join(audio_chunks), first_chunk_latency
+
+    async def _stream(
+        self,
+        text: str,
+        voice: str,
+        rate: str,
+        pitch: str,
+        volume: str,
+        proxy: str | None,
+        style: str | None = None,
+        style_degree: float | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Single TTS attempt via edge-tts — yields MP3 chunks as they arrive"""
         # If style is provided, wrap text in SSML
         if style:
             text = self._build_style_ssml(text, voice, style, style_degree)
@@ -222,18 +453,26 @@ class TTSEngine:
         if proxy:
             kwargs["proxy"] = proxy
 
-        communicate = edge_tts.Communicate(**kwargs)
+        # Shared per-route connector: reuses warm TCP/TLS connections (None = pooling off)
+        pool = get_tts_pool()
+        kwargs["connector"] = pool.connector(proxy)
 
-        audio_chunks = []
-        async for chunk in communicate.stream():
-            if chunk["type"] == "audio":
-                audio_chunks.append(chunk["data"])
+        communicate = edge_tts.Communicate(**kwargs)
 
-        if not audio_chunks:
+        received = False
+        try:
+            async for chunk in communicate.stream():
+                if chunk["type"] == "audio":
+                    received = True
+                    yield chunk["data"]
+        except Exception:
+            pool.mark_failure(proxy)
+            raise
+        pool.mark_success(proxy)
+
+        if not received:
             raise RuntimeError("No audio data received from TTS engine")
 
-        return b"".join(audio_chunks)
-
     async def _generate_with_subs(
         self,
         text: str,
@@ -242,11 +481,13 @@ class TTSEngine:
         pitch: str,
         volume: str,
         proxy: str | None,
-        words_per_cue: int,
         style: str | None = None,
         style_degree: float | None = None,
-    ) -> tuple[bytes, str]:
-        """Single TTS+SRT generation attempt via edge-tts with SubMaker"""
+    ) -> tuple[bytes, list[WordTiming], float | None]:
+        """
+        Single TTS+timings generation attempt via edge-tts (WordBoundary events).
+        Returns (mp3_bytes, words, seconds to first audio chunk).
+        """
         # If style is provided, wrap text in SSML
         if style:
             text = self._build_style_ssml(text, voice, style, style_degree)
@@ -257,31 +498,39 @@ class TTSEngine:
             "rate": rate,
             "pitch": pitch,
             "volume": volume,
+            # edge-tts 7 defaults to SentenceBoundary events
+            "boundary": "WordBoundary",
         }
 
         if proxy:
             kwargs["proxy"] = proxy
 
+        pool = get_tts_pool()
+        kwargs["connector"] = pool.connector(proxy)
+
         communicate = edge_tts.Communicate(**kwargs)
-        submaker = edge_tts.SubMaker()
         audio_chunks = []
-
-        async for chunk in communicate.stream():
-            if chunk["type"] == "audio":
-                audio_chunks.append(chunk["data"])
-            elif chunk["type"] == "WordBoundary":
-                submaker.create_sub(
-                    (chunk["offset"], chunk["duration"]),
-                    chunk["text"]
-                )
+        words = []
+        started = time.monotonic()
+        first_chunk_latency = None
+
+        try:
+            async for chunk in communicate.stream():
+                if chunk["type"] == "audio":
+                    if first_chunk_latency is None:
+                        first_chunk_latency = time.monotonic() - started
+                    audio_chunks.append(chunk["data"])
+                elif chunk["type"] == "WordBoundary":
+                    words.append(WordTiming(chunk["offset"], chunk["duration"], chunk["text"]))
+        except Exception:
+            pool.mark_failure(proxy)
+            raise
+        pool.mark_success(proxy)
 
         if not audio_chunks:
             raise RuntimeError("No audio data received from TTS engine")
 
-        audio_bytes = b"".join(audio_chunks)
-        srt_content = submaker.generate_subs(words_per_cue)
-
-        return audio_bytes, srt_content
+        return b"".join(audio_chunks), words, first_chunk_latency
 
 
 # ── Singleton ─────────────────────────────────────────────────────────────────
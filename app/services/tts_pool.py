@@ -0,0 +1,251 @@
+"""
+eidosSpeech v2 — edge-tts Connection Pool
+One shared aiohttp connector per route (direct + each proxy), handed to every
+edge_tts.Communicate, plus a few pre-opened idle connections per route.
+
+Why this shape: edge-tts opens one websocket per request and closes it at
+turn.end, and every upgrade needs a fresh ConnectionId / Sec-MS-GEC token, so
+a websocket session itself cannot be reused across requests. What *can* be
+reused is the TCP + TLS connection underneath: aiohttp's ws_connect takes an
+idle keep-alive connection from its connector's pool when one exists for the
+same (host, ssl, proxy) key. The pool keeps `tts_pool_warm` such connections
+per route (opened with a HEAD on the same host) and tops them up after each
+use, so a short utterance only pays the HTTP upgrade round-trip.
+
+Recycling: a route's connector is replaced after `tts_pool_max_age` seconds or
+RECYCLE_AFTER_FAILURES consecutive failures; the old one is closed once its
+in-flight websockets have finished. aiohttp itself discards idle connections
+that were closed by the server or exceeded the keep-alive timeout.
+
+Version coupling: this relies on edge_tts.Communicate(connector=...) and on
+aiohttp's TCPConnector._create_connection hook, so requirements.txt pins
+edge-tts and aiohttp to the versions it was tested with. The pool's metrics
+come from its own counters; only `idle` peeks at aiohttp's pool, guarded.
+"""
+
+import asyncio
+import logging
+import time
+
+import aiohttp
+import edge_tts
+from edge_tts import constants as edge_constants
+from app.config import settings
+from app.services.proxy_manager import route_label
+
+logger = logging.getLogger(__name__)
+
+RECYCLE_AFTER_FAILURES = 3
+RETIRE_TIMEOUT_SECONDS = 120    # force-close a retired connector after this long
+
+# Pooled connections are keyed by SSL context too — use the one edge-tts passes to ws_connect
+_EDGE_SSL = getattr(edge_tts.communicate, "_SSL_CTX", True)
+
+
+class PooledConnector(aiohttp.TCPConnector):
+    """
+    TCPConnector shared by many edge-tts calls.
+    edge-tts builds a ClientSession per call that owns (and closes) its connector,
+    so close() is a no-op here; the pool calls shutdown() instead.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.created_at = time.monotonic()
+        self.acquired = 0       # connections handed out (new + reused)
+        self.opened = 0         # connections that needed a TCP + TLS handshake
+        self.busy = 0           # connections handed out and not yet released / closed
+        self.failures = 0       # consecutive failed requests on this route
+
+    async def close(self, *, abort_ssl: bool = False) -> None:
+        return None
+
+    async def shutdown(self):
+        await super().close()
+
+    async def connect(self, req, traces, timeout):
+        connection = await super().connect(req, traces, timeout)
+        self.acquired += 1
+        self.busy += 1
+        connection.add_callback(self._released)
+        return connection
+
+    def _released(self):
+        self.busy -= 1
+
+    async def _create_connection(self, req, traces, timeout):
+        proto = await super()._create_connection(req, traces, timeout)
+        self.opened += 1
+        return proto
+
+    @property
+    def idle(self) -> int | None:
+        """Keep-alive connections parked in aiohttp's pool (None if it cannot be read)"""
+        conns = getattr(self, "_conns", None)
+        if not isinstance(conns, dict):
+            return None
+        return sum(len(pooled) for pooled in conns.values())
+
+
+class TTSConnectionPool:
+    """Per-route PooledConnectors with warm-up, recycling and metrics"""
+
+    def __init__(self, enabled: bool, warm: int, max_age: int, keepalive: float):
+        self.enabled = enabled
+        self.warm_target = max(0, warm)
+        self.max_age = max_age
+        self.keepalive = keepalive
+        self._connectors: dict[str | None, PooledConnector] = {}
+        self._warming: set[str | None] = set()
+        self._background: set[asyncio.Task] = set()
+        self._retired: set[PooledConnector] = set()
+        self._recycled = 0
+
+    def connector(self, proxy: str | None) -> PooledConnector | None:
+        """Connector for a route (None when pooling is disabled)"""
+        if not self.enabled:
+            return None
+        connector = self._connectors.get(proxy)
+        if connector is not None and time.monotonic() - connector.created_at > self.max_age:
+            self._recycle(proxy, "age")
+            connector = None
+        if connector is None:
+            connector = PooledConnector(
+                limit=0,                            # concurrency is bounded upstream
+                keepalive_timeout=self.keepalive,
+                ttl_dns_cache=300,
+            )
+            self._connectors[proxy] = connector
+        return connector
+
+    def mark_success(self, proxy: str | None):
+        connector = self._connectors.get(proxy)
+        if connector is None:
+            return
+        connector.failures = 0
+        self._spawn(self.warm(proxy))
+
+    def mark_failure(self, proxy: str | None):
+        connector = self._connectors.get(proxy)
+        if connector is None:
+            return
+        connector.failures += 1
+        if connector.failures >= RECYCLE_AFTER_FAILURES:
+            self._recycle(proxy, "failures")
+
+    async def warm(self, proxy: str | None):
+        """Top the route up to warm_target idle connections (best effort)"""
+        if not self.enabled or not self.warm_target or proxy in self._warming:
+            return
+        self._warming.add(proxy)
+        try:
+            connector = self.connector(proxy)
+            missing = self.warm_target - (connector.idle or 0)
+            if missing <= 0:
+                return
+            async with aiohttp.ClientSession(
+                connector=connector,
+                connector_owner=False,
+                trust_env=True,                     # same proxy resolution as edge-tts
+                timeout=aiohttp.ClientTimeout(total=10),
+            ) as session:
+                results = await asyncio.gather(
+                    *(self._open_one(session, proxy) for _ in range(missing)),
+                    return_exceptions=True,
+                )
+            errors = [r for r in results if isinstance(r, Exception)]
+            if errors:
+                logger.debug(
+                    f"TTS_POOL_WARM_FAIL route={route_label(proxy)} "
+                    f"failed={len(errors)}/{missing} error={errors[0]}"
+                )
+        finally:
+            self._warming.discard(proxy)
+
+    @staticmethod
+    async def _open_one(session: aiohttp.ClientSession, proxy: str | None):
+        # Same host, port, SSL context and proxy as edge-tts' ws_connect → same pool key
+        async with session.head(edge_constants.VOICE_LIST, proxy=proxy, ssl=_EDGE_SSL) as resp:
+            await resp.read()
+
+    def start(self, proxies: list[str]):
+        """Warm every route in the background (called at startup)"""
+        if not self.enabled:
+            return
+        for proxy in [None, *proxies]:
+            self._spawn(self.warm(proxy))
+        logger.info(
+            f"TTS_POOL_STARTED routes={len(proxies) + 1} warm={self.warm_target} "
+            f"max_age={self.max_age}s"
+        )
+
+    async def close(self):
+        for task in list(self._background):
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+        connectors = [*self._connectors.values(), *self._retired]
+        self._connectors.clear()
+        self._retired.clear()
+        await asyncio.gather(*(c.shutdown() for c in connectors), return_exceptions=True)
+
+    def stats(self) -> dict:
+        if not self.enabled:
+            return {"enabled": False}
+        now = time.monotonic()
+        routes = {}
+        for proxy, c in self._connectors.items():
+            routes[route_label(proxy)] = {
+                "idle": c.idle,
+                "busy": c.busy,
+                "acquired": c.acquired,
+                "opened": c.opened,
+                "reused": max(0, c.acquired - c.opened),
+                "age_seconds": round(now - c.created_at),
+            }
+        return {
+            "enabled": True,
+            "warm_target": self.warm_target,
+            "recycled": self._recycled,
+            "routes": routes,
+        }
+
+    def _recycle(self, proxy: str | None, reason: str):
+        old = self._connectors.pop(proxy, None)
+        if old is None:
+            return
+        self._recycled += 1
+        logger.info(
+            f"TTS_POOL_RECYCLE route={route_label(proxy)} reason={reason} "
+            f"acquired={old.acquired} opened={old.opened}"
+        )
+        self._retired.add(old)
+        self._spawn(self._retire(old))
+
+    async def _retire(self, connector: PooledConnector):
+        """Close a replaced connector once its in-flight websockets are done"""
+        deadline = time.monotonic() + RETIRE_TIMEOUT_SECONDS
+        while connector.busy and time.monotonic() < deadline:
+            await asyncio.sleep(1)
+        self._retired.discard(connector)
+        await connector.shutdown()
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+
+# Singleton
+_tts_pool: TTSConnectionPool = None
+
+
+def get_tts_pool() -> TTSConnectionPool:
+    global _tts_pool
+    if _tts_pool is None:
+        _tts_pool = TTSConnectionPool(
+            enabled=settings.tts_pool_enabled,
+            warm=settings.tts_pool_warm,
+            max_age=settings.tts_pool_max_age,
+            keepalive=settings.tts_pool_keepalive,
+        )
+    return _tts_pool
@@ -0,0 +1,31 @@
+"""
+Shared test setup.
+Settings are read once, when app.config is first imported, so the environment
+is prepared here — before any test module imports the app — with a scratch
+SQLite database and cache directory per test session.
+"""
+
+import os
+import tempfile
+
+_scratch = tempfile.mkdtemp(prefix="eidos-tests-")
+os.environ.setdefault("EIDOS_SECRET_KEY", "t" * 64)
+os.environ.setdefault("EIDOS_ADMIN_KEY", "a" * 32)
+os.environ.setdefault("EIDOS_SMTP_HOST", "localhost")
+os.environ["EIDOS_DATABASE_URL"] = f"sqlite+aiosqlite:///{_scratch}/test.db"
+os.environ["EIDOS_CACHE_DIR"] = f"{_scratch}/cache"
+
+import pytest_asyncio  # noqa: E402
+
+
+@pytest_asyncio.fixture
+async def db():
+    """Session on the scratch database (tables created on first use)"""
+    from app.db.database import AsyncSessionLocal, engine
+    from app.db.seed import init_db
+
+    await init_db()
+    async with AsyncSessionLocal() as session:
+        yield session
+    # Each test runs on its own event loop — drop pooled connections bound to this one
+    await engine.dispose()
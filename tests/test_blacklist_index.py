@@ -0,0 +1,107 @@
+"""
+In-memory blacklist (app/core/blacklist_index.py): CIDR prefix tries,
+client IP parsing and loading from the blacklist table.
+"""
+
+import ipaddress
+
+import pytest
+
+from app.core.blacklist_index import BlacklistIndex, _PrefixTrie, normalize_ip_entry, parse_ip
+from app.db.models import Blacklist
+
+
+def trie(*networks: str) -> _PrefixTrie:
+    family = ipaddress.ip_network(networks[0], strict=False).version
+    result = _PrefixTrie(32 if family == 4 else 128)
+    for network in networks:
+        result.add(ipaddress.ip_network(network, strict=False))
+    return result
+
+
+def contains(prefixes: _PrefixTrie, ip: str) -> bool:
+    return prefixes.contains(ipaddress.ip_address(ip))
+
+
+def test_single_address_matches_only_itself():
+    prefixes = trie("203.0.113.7/32")
+    assert contains(prefixes, "203.0.113.7")
+    assert not contains(prefixes, "203.0.113.6")
+    assert not contains(prefixes, "203.0.113.8")
+
+
+def test_cidr_range_boundaries():
+    prefixes = trie("198.51.100.0/24")
+    assert contains(prefixes, "198.51.100.0")
+    assert contains(prefixes, "198.51.100.255")
+    assert not contains(prefixes, "198.51.99.255")
+    assert not contains(prefixes, "198.51.101.0")
+
+
+def test_slash_zero_matches_everything():
+    prefixes = trie("0.0.0.0/0")
+    assert contains(prefixes, "0.0.0.0")
+    assert contains(prefixes, "255.255.255.255")
+    assert contains(prefixes, "192.0.2.1")
+
+
+@pytest.mark.parametrize("order", ["longer-first", "shorter-first"])
+def test_overlapping_prefixes_in_either_order(order):
+    networks = ["10.1.2.3/32", "10.0.0.0/8"]
+    prefixes = trie(*(networks if order == "longer-first" else reversed(networks)))
+    assert contains(prefixes, "10.1.2.3")
+    assert contains(prefixes, "10.200.0.1")
+    assert not contains(prefixes, "11.0.0.0")
+
+
+def test_ipv6_ranges():
+    prefixes = trie("2001:db8::/32", "2001:db9::1/128")
+    assert contains(prefixes, "2001:db8::1")
+    assert contains(prefixes, "2001:db8:ffff:ffff:ffff:ffff:ffff:ffff")
+    assert contains(prefixes, "2001:db9::1")
+    assert not contains(prefixes, "2001:db9::2")
+    assert not contains(prefixes, "2001:db7:ffff::1")
+
+
+def test_parse_ip_unwraps_ipv4_mapped_ipv6():
+    assert parse_ip("::ffff:203.0.113.7") == ipaddress.ip_address("203.0.113.7")
+    assert parse_ip(" 2001:db8::1 ") == ipaddress.ip_address("2001:db8::1")
+
+
+@pytest.mark.parametrize("value", ["", "unknown", "203.0.113", "203.0.113.256", "10.0.0.0/8"])
+def test_parse_ip_rejects_unparseable_client_ips(value):
+    assert parse_ip(value) is None
+
+
+def test_normalize_ip_entry():
+    assert normalize_ip_entry(" 203.0.113.7 ") == "203.0.113.7"
+    assert normalize_ip_entry("203.0.113.7/32") == "203.0.113.7"
+    assert normalize_ip_entry("203.0.113.77/24") == "203.0.113.0/24"
+    assert normalize_ip_entry("2001:DB8::1/32") == "2001:db8::/32"
+    with pytest.raises(ValueError):
+        normalize_ip_entry("not-an-ip")
+
+
+@pytest.mark.asyncio
+async def test_load_builds_index_and_skips_invalid_rows(db):
+    db.add_all([
+        Blacklist(type="ip", value="192.0.2.0/24"),
+        Blacklist(type="ip", value="2001:db8:1::/48"),
+        Blacklist(type="ip", value="not-an-ip"),
+        Blacklist(type="ip", value="300.1.1.1"),
+        Blacklist(type="email", value=" Spammer@Example.COM "),
+    ])
+    await db.commit()
+
+    index = BlacklistIndex()
+    await index.load(db)
+
+    assert index.stats() == {"loaded": True, "ips": 2, "emails": 1}
+    assert index.is_ip_blacklisted("192.0.2.200")
+    assert index.is_ip_blacklisted("::ffff:192.0.2.1")
+    assert index.is_ip_blacklisted("2001:db8:1:ffff::1")
+    assert not index.is_ip_blacklisted("2001:db8:2::1")
+    assert not index.is_ip_blacklisted("198.51.100.1")
+    assert not index.is_ip_blacklisted("garbage")
+    assert index.is_email_blacklisted("spammer@example.com")
+    assert not index.is_email_blacklisted("someone@example.com")
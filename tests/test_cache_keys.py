@@ -0,0 +1,80 @@
+"""
+Cache key canonicalization (app/core/cache_keys.py).
+Each group of requests below is semantically identical and must share one key.
+"""
+
+import unicodedata
+
+import pytest
+
+from app.core.cache_keys import normalize_prosody, tts_cache_key
+
+VOICE = "en-US-AriaNeural"
+
+
+def one_key(*requests: dict) -> bool:
+    return len({tts_cache_key(**{"voice": VOICE, **request}) for request in requests}) == 1
+
+
+@pytest.mark.parametrize("param", ["rate", "pitch"])
+def test_zero_prosody_spellings_share_a_key(param):
+    unit = "%" if param == "rate" else "Hz"
+    assert one_key(*({"text": "Hello", param: f"{sign}0{unit}"} for sign in ("", "+", "-")))
+
+
+def test_prosody_forms_are_canonical():
+    assert normalize_prosody("0%") == "+0%"
+    assert normalize_prosody("-0%") == "+0%"
+    assert normalize_prosody("10%") == "+10%"
+    assert normalize_prosody(" +10.0 % ") == "+10%"
+    assert normalize_prosody("-5hz") == "-5Hz"
+    assert normalize_prosody("+1.5Hz") == "+1.5Hz"
+
+
+def test_nfc_and_nfd_text_share_a_key():
+    nfc = "Caf\u00e9 cr\u00e8me"
+    nfd = unicodedata.normalize("NFD", nfc)
+    assert nfc != nfd
+    assert one_key({"text": nfc}, {"text": nfd})
+
+
+def test_whitespace_runs_share_a_key():
+    assert one_key(
+        {"text": "Hello world. Bye."},
+        {"text": "  Hello world. Bye."},
+        {"text": "Hello world. Bye.\n\n"},
+        {"text": "Hello \t world.\n  Bye."},
+    )
+
+
+def test_default_style_degree_shares_a_key():
+    assert one_key(
+        {"text": "Hi", "style": "cheerful", "style_degree": 1.0},
+        {"text": "Hi", "style": "cheerful", "style_degree": 1.001},
+        {"text": "Hi", "style": "cheerful", "style_degree": None},
+    )
+
+
+def test_degree_without_style_is_ignored():
+    assert one_key(
+        {"text": "Hi"},
+        {"text": "Hi", "style_degree": 1.5},
+        {"text": "Hi", "style": "  ", "style_degree": 1.5},
+    )
+
+
+def test_meaningful_differences_change_the_key():
+    base = {"text": "Hi", "style": "cheerful"}
+    assert not one_key(base, {**base, "style_degree": 1.5})
+    assert not one_key(base, {**base, "style": "sad"})
+    assert not one_key({"text": "Hi", "rate": "+0%"}, {"text": "Hi", "rate": "+10%"})
+    assert not one_key({"text": "Hi"}, {"text": "hi"})
+
+
+def test_unparseable_prosody_hashes_deterministically():
+    assert normalize_prosody(" fast ") == "fast"
+    assert normalize_prosody("") == ""
+    assert normalize_prosody(None) == ""
+    key = tts_cache_key("Hi", VOICE, rate="fast", pitch="x-high")
+    assert key == tts_cache_key("Hi", VOICE, rate=" fast", pitch="x-high ")
+    assert key != tts_cache_key("Hi", VOICE, rate="slow", pitch="x-high")
@@ -0,0 +1,108 @@
+"""
+Frame-level MP3 splicing (app/services/mp3.py).
+Streams are built from synthetic frames in edge-tts' profile:
+MPEG-2 Layer III, 48 kbps, 24 kHz mono → 144-byte frames of 24 ms.
+"""
+
+import struct
+
+import pytest
+
+from app.services.mp3 import (
+    concat_mp3,
+    iter_frames,
+    mp3_duration_ms,
+    parse_header,
+    silent_frame,
+    with_info_frame,
+)
+
+# sync | MPEG-2 | Layer III | no CRC | 48 kbps | 24 kHz | mono
+EDGE_HEADER = (
+    (0x7FF << 21) | (0b10 << 19) | (0b01 << 17) | (1 << 16)
+    | (6 << 12) | (1 << 10) | (0b11 << 6)
+)
+FRAME_BYTES = 144
+
+
+def make_frames(count: int, fill: int = 0x55) -> bytes:
+    """`count` audio frames with a non-silent body"""
+    frame = struct.pack(">I", EDGE_HEADER) + bytes([fill]) * (FRAME_BYTES - 4)
+    return frame * count
+
+
+def id3_tag(payload: bytes) -> bytes:
+    """ID3v2.4 tag wrapping payload (syncsafe size)"""
+    size = len(payload)
+    syncsafe = bytes((size >> shift) & 0x7F for shift in (21, 14, 7, 0))
+    return b"ID3\x04\x00\x00" + syncsafe + payload
+
+
+def test_parse_header_edge_tts_profile():
+    header = parse_header(struct.pack(">I", EDGE_HEADER), 0)
+
+    assert header is not None
+    assert header.version == 0b10
+    assert header.bitrate == 48_000
+    assert header.sample_rate == 24_000
+    assert header.mono
+    assert header.padding == 0
+    assert header.samples == 576
+    assert header.length == FRAME_BYTES
+    assert header.duration_ms == 24.0
+    assert header.side_info_size == 9
+
+
+def test_parse_header_rejects_non_headers():
+    assert parse_header(b"\x00\x00\x00\x00", 0) is None
+    assert parse_header(struct.pack(">I", EDGE_HEADER)[:3], 0) is None
+    # bitrate index 0xF is reserved
+    assert parse_header(struct.pack(">I", EDGE_HEADER | (0xF << 12)), 0) is None
+
+
+def test_silent_frame_length():
+    header = parse_header(struct.pack(">I", EDGE_HEADER), 0)
+    frame = silent_frame(header)
+
+    assert len(frame) == FRAME_BYTES
+    assert parse_header(frame, 0).profile() == header.profile()
+    assert frame[4:] == bytes(FRAME_BYTES - 4)
+
+
+def test_concat_frame_count_and_duration_with_pause():
+    # 10 + 5 audio frames, 100 ms pause → round(100 / 24) = 4 silent frames
+    out = concat_mp3([make_frames(10), make_frames(5, fill=0x66)], pause_ms=100)
+
+    frames = list(iter_frames(out))
+    assert len(frames) == 19
+    assert mp3_duration_ms(out) == 456
+    # Info header frame + 19 frames, all 144 bytes
+    assert len(out) == 20 * FRAME_BYTES
+
+
+def test_concat_rejects_empty_part():
+    with pytest.raises(ValueError, match="no MP3 audio frames"):
+        concat_mp3([make_frames(3), b"not audio"])
+
+
+def test_iter_frames_skips_id3_tag():
+    # The tag payload holds a frame sync pattern that must not be read as audio
+    tag = id3_tag(make_frames(2))
+    data = tag + make_frames(3)
+
+    frames = list(iter_frames(data))
+    assert len(frames) == 3
+    assert all(frame == make_frames(1) for _, frame in frames)
+
+
+def test_with_info_frame_keeps_duration():
+    data = concat_mp3([make_frames(7), make_frames(4)], pause_ms=48)
+    wrapped = with_info_frame(data)
+
+    assert mp3_duration_ms(wrapped) == mp3_duration_ms(data)
+    # the old Info frame is replaced, not stacked
+    assert len(wrapped) == len(data)
+    info = wrapped[:FRAME_BYTES]
+    assert info[13:17] == b"Info"
+    frame_count = struct.unpack(">I", info[21:25])[0]
+    assert frame_count == len(wrapped) // FRAME_BYTES
@@ -0,0 +1,151 @@
+"""
+Daily quota (app/core/rate_limiter.py + migration 004).
+Concurrent requests at the edge of the daily limit must never over-admit,
+both with the single-statement UPSERT (usage_flush_interval = 0) and with the
+write-behind DailyCounter (usage_flush_interval > 0).
+"""
+
+import asyncio
+import importlib
+import secrets
+import uuid
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import select, text
+
+from app.config import settings
+from app.core.auth import RequestContext
+from app.core.exceptions import RateLimitError
+from app.core.rate_limiter import RateLimiter
+from app.db.database import AsyncSessionLocal
+from app.db.models import ApiKey, DailyUsage, User
+
+DAILY_LIMIT = 3
+CONCURRENT_REQUESTS = 6
+
+
+async def make_api_key(db) -> int:
+    user = User(
+        email=f"{uuid.uuid4().hex}@example.com",
+        password_hash="x",
+        tos_accepted_at=datetime.now(timezone.utc),
+    )
+    db.add(user)
+    await db.flush()
+    key = ApiKey(key=f"esk_{secrets.token_urlsafe(24)}", user_id=user.id)
+    db.add(key)
+    await db.commit()
+    return key.id
+
+
+def make_ctx(api_key_id: int | None = None) -> RequestContext:
+    registered = api_key_id is not None
+    return RequestContext(
+        tier="registered" if registered else "anonymous",
+        api_key=None,
+        api_key_id=api_key_id,
+        user_id=None,
+        user_email=None,
+        is_verified=registered,
+        ip_address=f"10.{secrets.randbelow(256)}.{secrets.randbelow(256)}.{secrets.randbelow(256)}",
+        char_limit=1000,
+        req_per_day=DAILY_LIMIT,
+        req_per_min=100,
+        is_web_ui=False,
+    )
+
+
+async def race(limiter: RateLimiter, ctx: RequestContext) -> int:
+    """Fire CONCURRENT_REQUESTS requests at once (one session each); return how many passed"""
+    async def one() -> bool:
+        async with AsyncSessionLocal() as session:
+            try:
+                await limiter.check_and_consume(ctx, session, 10, request_type="api_tts")
+            except RateLimitError:
+                return False
+            return True
+
+    results = await asyncio.gather(*(one() for _ in range(CONCURRENT_REQUESTS)))
+    return sum(results)
+
+
+async def stored_rows(db, ctx: RequestContext) -> list[tuple[int, int]]:
+    if ctx.api_key_id is not None:
+        where = (DailyUsage.api_key_id == ctx.api_key_id,)
+    else:
+        where = (DailyUsage.ip_address == ctx.ip_address, DailyUsage.api_key_id == None)
+    result = await db.execute(
+        select(DailyUsage.request_count, DailyUsage.api_tts_count).where(*where)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("flush_interval", [0, 5.0], ids=["sync-upsert", "write-behind"])
+@pytest.mark.parametrize("registered", [True, False], ids=["registered", "anonymous"])
+async def test_concurrent_requests_never_exceed_daily_limit(db, monkeypatch, flush_interval, registered):
+    monkeypatch.setattr(settings, "usage_flush_interval", flush_interval)
+    limiter = RateLimiter()
+    ctx = make_ctx(await make_api_key(db) if registered else None)
+
+    assert await race(limiter, ctx) == DAILY_LIMIT
+    # Still closed afterwards
+    with pytest.raises(RateLimitError):
+        await limiter.check_and_consume(ctx, db, 10)
+
+    await limiter.flush_usage()
+    assert await stored_rows(db, ctx) == [(DAILY_LIMIT, DAILY_LIMIT)]
+
+
+@pytest.mark.asyncio
+async def test_write_behind_seeds_from_stored_usage(db, monkeypatch):
+    """A fresh process (new limiter) continues from the flushed count"""
+    monkeypatch.setattr(settings, "usage_flush_interval", 5.0)
+    ctx = make_ctx(await make_api_key(db))
+
+    first = RateLimiter()
+    await first.check_and_consume(ctx, db, 10)
+    await first.check_and_consume(ctx, db, 10)
+    await first.flush_usage()
+
+    assert await race(RateLimiter(), ctx) == DAILY_LIMIT - 2
+
+
+@pytest.mark.asyncio
+async def test_cost_above_limit_is_rejected_without_a_row(db, monkeypatch):
+    monkeypatch.setattr(settings, "usage_flush_interval", 0)
+    ctx = make_ctx()
+
+    with pytest.raises(RateLimitError):
+        await RateLimiter().check_and_consume(ctx, db, 10, cost=DAILY_LIMIT + 1)
+    assert await stored_rows(db, ctx) == []
+
+
+@pytest.mark.asyncio
+async def test_migration_004_merges_duplicate_rows(db):
+    migration = importlib.import_module("app.migrations.004_unique_daily_usage")
+    api_key_id = await make_api_key(db)
+    today = date.today()
+
+    await migration.downgrade()
+    for _ in range(3):
+        db.add(DailyUsage(api_key_id=api_key_id, date=today, request_count=2, chars_used=5))
+        db.add(DailyUsage(ip_address="192.0.2.9", date=today, request_count=1, chars_used=1))
+    await db.commit()
+
+    await migration.upgrade()
+
+    result = await db.execute(
+        select(DailyUsage.api_key_id, DailyUsage.ip_address, DailyUsage.request_count, DailyUsage.chars_used)
+        .where((DailyUsage.api_key_id == api_key_id) | (DailyUsage.ip_address == "192.0.2.9"))
+    )
+    # One row per identity, holding the sum of its duplicates
+    assert sorted(result.all(), key=lambda row: row.api_key_id is None) == [
+        (api_key_id, None, 6, 15),
+        (None, "192.0.2.9", 3, 3),
+    ]
+    indexes = await db.execute(
+        text("SELECT name FROM sqlite_master WHERE type='index' AND name LIKE 'uq_daily_usage_%'")
+    )
+    assert {row[0] for row in indexes} == {"uq_daily_usage_key_date", "uq_daily_usage_ip_date"}
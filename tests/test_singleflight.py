@@ -0,0 +1,153 @@
+"""
+Request coalescing (app/core/singleflight.py).
+do() runs the work once per key; join() / lead() are the follower and
+leader halves used by the streaming endpoint.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+class Work:
+    """fn for SingleFlight.do(): counts calls, blocks until released"""
+
+    def __init__(self, result=b"audio", error: Exception | None = None):
+        self.calls = 0
+        self.result = result
+        self.error = error
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def settle():
+    """Let every started task reach its first await"""
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_coalesce():
+    flight = SingleFlight()
+    work = Work()
+    tasks = [asyncio.create_task(flight.do("k", work)) for _ in range(5)]
+    await settle()
+    work.release.set()
+
+    results = await asyncio.gather(*tasks)
+    assert work.calls == 1
+    assert [result for result, _ in results] == [b"audio"] * 5
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert flight.stats()["leaders"] == 1
+    assert flight.stats()["coalesced"] == 4
+    assert flight.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_different_keys_do_not_coalesce():
+    flight = SingleFlight()
+    work = Work()
+    work.release.set()
+    await asyncio.gather(flight.do("a", work), flight.do("b", work))
+    assert work.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_key_is_released_after_completion():
+    flight = SingleFlight()
+    work = Work()
+    work.release.set()
+    await flight.do("k", work)
+    await flight.do("k", work)
+    assert work.calls == 2
+    assert flight.join("k") is None
+
+
+@pytest.mark.asyncio
+async def test_leader_exception_reaches_every_follower():
+    flight = SingleFlight()
+    work = Work(error=RuntimeError("upstream down"))
+    tasks = [asyncio.create_task(flight.do("k", work)) for _ in range(3)]
+    await settle()
+    work.release.set()
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert work.calls == 1
+    assert all(isinstance(r, RuntimeError) and str(r) == "upstream down" for r in results)
+    assert flight.stats()["in_flight"] == 0
+
+    # The failure is not cached: the next call runs the work again
+    retry = Work()
+    retry.release.set()
+    assert await flight.do("k", retry) == (b"audio", False)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_followers():
+    flight = SingleFlight()
+    work = Work()
+    leader = asyncio.create_task(flight.do("k", work))
+    await settle()
+    followers = [asyncio.create_task(flight.do("k", work)) for _ in range(2)]
+    await settle()
+
+    leader.cancel()
+    await asyncio.gather(leader, return_exceptions=True)
+    assert leader.cancelled()
+
+    work.release.set()
+    assert await asyncio.gather(*followers) == [(b"audio", True), (b"audio", True)]
+    assert work.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_lead_registers_a_future_followers_join():
+    flight = SingleFlight()
+    future = flight.lead("k")
+    assert future is not None
+    assert flight.lead("k") is None                 # one leader per key
+    assert flight.join("k") is future
+
+    work = Work()
+    follower = asyncio.create_task(flight.do("k", work))
+    await settle()
+    future.set_result(b"streamed")
+
+    assert await follower == (b"streamed", True)
+    assert work.calls == 0
+    assert flight.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_lead_fans_out_and_frees_the_key():
+    flight = SingleFlight()
+    future = flight.lead("k")
+    followers = [asyncio.create_task(flight.do("k", Work())) for _ in range(2)]
+    await settle()
+
+    future.set_exception(RuntimeError("stream did not complete"))
+    results = await asyncio.gather(*followers, return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert flight.join("k") is None
+    assert flight.lead("k") is not None
+
+
+@pytest.mark.asyncio
+async def test_cancelled_lead_frees_the_key():
+    flight = SingleFlight()
+    future = flight.lead("k")
+    follower = asyncio.create_task(flight.do("k", Work()))
+    await settle()
+
+    future.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await follower
+    assert flight.join("k") is None
@@ -0,0 +1,106 @@
+"""
+JWT revocation (app/core/token_revocation.py, app/core/jwt_handler.py).
+Watermarks are compared in microseconds: a token minted in the same second as
+revoke_all_user_tokens(), but after it, must stay valid.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core import jwt_handler
+from app.core.exceptions import AuthenticationError
+from app.core.jwt_handler import create_token, decode_token, revoke_all_user_tokens
+from app.core.token_revocation import BloomFilter, RevocationIndex, to_micros
+from app.db.models import User
+
+
+class FrozenDatetime(datetime):
+    """datetime whose now() returns `current` (patched into jwt_handler)"""
+    current: datetime = None
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    monkeypatch.setattr(jwt_handler, "datetime", FrozenDatetime)
+    return FrozenDatetime
+
+
+async def make_user(db) -> User:
+    user = User(
+        email=f"{uuid.uuid4().hex}@example.com",
+        password_hash="x",
+        tos_accepted_at=datetime.now(timezone.utc),
+    )
+    db.add(user)
+    await db.commit()
+    return user
+
+
+@pytest.mark.asyncio
+async def test_token_minted_after_revocation_in_same_second_is_accepted(db, clock):
+    user = await make_user(db)
+    second = datetime.now(timezone.utc).replace(microsecond=0)
+
+    clock.current = second + timedelta(microseconds=300_000)
+    before = create_token(user.id, user.email, "access")
+    clock.current = second + timedelta(microseconds=400_000)
+    await revoke_all_user_tokens(user.id, db)
+    clock.current = second + timedelta(microseconds=500_000)
+    after = create_token(user.id, user.email, "access")
+
+    payload = await decode_token(after, "access", db)
+    assert payload["user_id"] == user.id
+    with pytest.raises(AuthenticationError):
+        await decode_token(before, "access", db)
+
+
+@pytest.mark.asyncio
+async def test_watermark_survives_reload_at_microsecond_precision(db, clock):
+    user = await make_user(db)
+    clock.current = datetime.now(timezone.utc).replace(microsecond=400_000)
+    await revoke_all_user_tokens(user.id, db)
+
+    index = RevocationIndex()
+    await index.load(db)
+    watermark = to_micros(clock.current)
+    assert not index.is_revoked({"user_id": user.id, "iat_us": watermark + 1})
+    assert index.is_revoked({"user_id": user.id, "iat_us": watermark - 1})
+
+
+def test_token_without_iat_us_from_revocation_second_is_rejected():
+    index = RevocationIndex()
+    revoked_at = datetime(2026, 1, 1, 12, 0, 0, 400_000, tzinfo=timezone.utc)
+    index.set_watermark(7, revoked_at)
+    second = int(revoked_at.replace(microsecond=0).timestamp())
+
+    assert index.is_revoked({"user_id": 7, "iat": second})
+    assert index.is_revoked({"user_id": 7, "iat": second - 1})
+    assert not index.is_revoked({"user_id": 7, "iat": second + 1})
+    # other users are unaffected
+    assert not index.is_revoked({"user_id": 8, "iat": second})
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1024)
+    items = [uuid.uuid4().hex for _ in range(1024)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+
+
+def test_revoked_jtis_survive_bloom_rebuilds():
+    index = RevocationIndex()
+    expires = datetime.now(timezone.utc) + timedelta(hours=1)
+    jtis = [str(uuid.uuid4()) for _ in range(3000)]     # past capacity: rebuilt on add
+    for jti in jtis:
+        index.add(jti, expires)
+
+    assert all(index.is_revoked({"jti": jti}) for jti in jtis)
+    index.expire()
+    assert all(index.is_revoked({"jti": jti}) for jti in jtis)